@@ -0,0 +1,71 @@
+"""
+Tatvapada Flask application.
+
+``create_app()`` builds the app: configuration, database, blueprints. Every
+import it needs happens inside the factory, so importing a model or a
+utility from ``app`` (CLI scripts, extractors, migrations) does not pull in
+the routes, their services or the payment SDK.
+"""
+import os
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def create_app():
+    from dotenv import load_dotenv
+    from flask import Flask, send_from_directory
+
+    from app.config.database import init_db
+    from app.utils.logger import setup_logger
+
+    load_dotenv()
+    logger = setup_logger("main", "main.log")
+
+    template_path = os.path.join(APP_ROOT, "app", "templates")
+    static_path = os.path.join(APP_ROOT, "app", "static")
+    logger.info(f"App root path: {APP_ROOT}")
+
+    app = Flask(__name__, static_folder=static_path, template_folder=template_path)
+    app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "super-secret-key")
+
+    init_db(app)
+    logger.info("Database initialized and SQLAlchemy bound to app.")
+
+    from app.routes.admin_routes import admin_bp
+    from app.routes.auth_routes import auth_bp
+    from app.routes.delete_tatvapada import delete_bp
+    from app.routes.document_routes import documents_bp
+    from app.routes.error_handling import errors_bp
+    from app.routes.home import home_bp
+    from app.routes.import_jobs import import_jobs_bp
+    from app.routes.payment_routes import payment_bp
+    from app.routes.right_section_api import right_section_impl_bp
+    from app.routes.right_section_ui import right_section_bp
+    from app.routes.shopping_books_routes import shopping_books_bp
+    from app.routes.shopping_user_routes import shopping_user_bp
+    from app.routes.tatvapada import tatvapada_bp
+    from app.routes.tatvapadakarara_vivara import tatvapadakarara_bp
+
+    app.register_blueprint(home_bp)
+    app.register_blueprint(tatvapada_bp)
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(admin_bp, url_prefix="/admin")
+    app.register_blueprint(delete_bp)
+    app.register_blueprint(documents_bp)
+    app.register_blueprint(errors_bp)
+    app.register_blueprint(right_section_bp)
+    app.register_blueprint(right_section_impl_bp)
+    app.register_blueprint(tatvapadakarara_bp)
+    app.register_blueprint(shopping_user_bp)
+    app.register_blueprint(payment_bp)
+    app.register_blueprint(shopping_books_bp)
+    app.register_blueprint(import_jobs_bp)
+
+    upload_folder = os.path.join(APP_ROOT, "uploads")
+
+    @app.route('/uploads/<path:filename>')
+    def uploaded_file(filename):
+        return send_from_directory(upload_folder, filename)
+
+    logger.info("Flask app instance created.")
+    return app
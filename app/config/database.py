@@ -20,5 +20,29 @@ def init_db(app):
         f"?charset=utf8mb4"
     )
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options()
 
     db_instance.init_app(app)
+
+
+def engine_options() -> dict:
+    """
+    Connection pool of one worker process. A request thread holds one
+    connection; a running import job holds two (its session's transaction
+    stays open while ``ImportJobService._report`` commits progress on a
+    second one). The pool therefore keeps WEB_THREADS + 2 * IMPORT_JOB_WORKERS
+    connections, and max_overflow is the headroom for the search-index
+    background builds, which also take a connection while they run; a worker
+    can open pool_size + max_overflow in all. The server-wide total is that
+    times the number of workers; keep it under the MySQL max_connections.
+    DB_POOL_SIZE / DB_MAX_OVERFLOW override it.
+    """
+    threads = int(os.getenv("WEB_THREADS", 4)) + 2 * int(os.getenv("IMPORT_JOB_WORKERS", 1))
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", threads)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 2)),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", 30)),
+        # Below MySQL's wait_timeout, so idle connections are replaced, not found dead
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 280)),
+        "pool_pre_ping": True,
+    }
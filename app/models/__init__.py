@@ -1,4 +1,5 @@
 from .documents import *
 from .tatvapada import *
 from .user_management import *
-from .tatvapada_author_info import *
\ No newline at end of file
+from .tatvapada_author_info import *
+from .import_jobs import *
\ No newline at end of file
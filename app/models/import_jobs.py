@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text
+from sqlalchemy.dialects.mysql import JSON
+
+from app.config.database import db_instance
+
+
+def utc_now():
+    return datetime.now(timezone.utc)
+
+
+class ImportJob(db_instance.Model):
+    """
+    State of a background CSV import (see ``app.services.import_jobs``).
+    Written by the worker thread running it and read by any worker serving
+    ``/api/jobs/<id>``.
+    """
+    __tablename__ = "import_jobs"
+    __table_args__ = {
+        'mysql_engine': 'InnoDB',
+        'mysql_charset': 'utf8mb4',
+        'mysql_collate': 'utf8mb4_unicode_ci'
+    }
+
+    id = Column(String(32), primary_key=True)
+    kind = Column(String(32), nullable=False)
+    filename = Column(String(255, collation='utf8mb4_unicode_ci'), nullable=True)
+    file_path = Column(String(512), nullable=True)
+    # queued -> running -> succeeded | failed | cancelled
+    status = Column(String(16), nullable=False, default="queued", index=True)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+
+    bytes_total = Column(Integer, nullable=False, default=0)
+    bytes_read = Column(Integer, nullable=False, default=0)
+    rows_processed = Column(Integer, nullable=False, default=0)
+    records = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=True)
+    message = Column(Text, nullable=True)
+
+    created_by = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=utc_now)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), default=utc_now)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<ImportJob(id='{self.id}', kind='{self.kind}', status='{self.status}')>"
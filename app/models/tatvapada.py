@@ -157,11 +157,13 @@ class Arthakosha(db_instance.Model):
     # Optional notes
     notes = Column(Text(collation='utf8mb4_unicode_ci'), nullable=True)
 
+    @staticmethod
+    def hash_meaning(meaning_text: str) -> str:
+        return hashlib.sha256(meaning_text.strip().encode("utf-8")).hexdigest()
+
     def set_meaning(self, meaning_text: str):
         self.meaning = meaning_text
-        self.meaning_hash = hashlib.sha256(
-            meaning_text.strip().encode("utf-8")
-        ).hexdigest()
+        self.meaning_hash = self.hash_meaning(meaning_text)
 
 
 class ShoppingTatvapada(db_instance.Model):
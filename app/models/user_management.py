@@ -24,10 +24,12 @@ class User(db_instance.Model):
     email = Column(String(120, collation='utf8mb4_unicode_ci'), unique=True, nullable=False)
     username = Column(String(50, collation='utf8mb4_unicode_ci'), unique=True, nullable=False)
     password_hash = Column(String(255, collation='utf8mb4_unicode_ci'), nullable=False)
+    # Carried in JWTs; incrementing it revokes every token issued before (see auth_cache)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
-    def set_password(self, raw_password, bcrypt):
-        self.password_hash = bcrypt.generate_password_hash(raw_password).decode('utf-8')
+    def set_password(self, raw_password, bcrypt, rounds=None):
+        self.password_hash = bcrypt.generate_password_hash(raw_password, rounds).decode('utf-8')
 
     def check_password(self, raw_password, bcrypt):
         return bcrypt.check_password_hash(self.password_hash, raw_password)
@@ -5,12 +5,13 @@ from app.config.database import db_instance
 from app.services.admin_dashboard import DashboardService
 from app.services.user_manage_service import UserService
 from app.utils.auth_decorator import login_required, admin_required
+from app.utils.lazy import LazyService
 from app.utils.logger import setup_logger
 
 admin_bp = Blueprint("admin", __name__)
 logger = setup_logger(name="admin_bp")
 
-user_service = UserService()
+user_service = LazyService(UserService)
 # ----------------------
 # Admin dashboard page
 # ----------------------
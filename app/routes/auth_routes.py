@@ -8,6 +8,8 @@ from flask import redirect, url_for
 
 from app.services.user_manage_service import UserService
 from app.utils.auth_decorator import admin_required
+from app.utils.http_cache import PUBLIC_CACHE_CONTROL
+from app.utils.lazy import LazyService
 from app.utils.logger import setup_logger
 
 load_dotenv()
@@ -19,7 +21,7 @@ if not SECRET_KEY:
 logger = setup_logger("auth", "auth.log")
 
 auth_bp = Blueprint("auth", __name__)
-user_service = UserService()
+user_service = LazyService(UserService)
 
 
 
@@ -27,7 +29,12 @@ user_service = UserService()
 # ------------------- Cache Control ------------------- #
 @auth_bp.after_app_request
 def add_cache_control(response):
-    """Prevent browser caching of protected pages."""
+    """
+    Prevent browser caching of protected pages. Versioned corpus reads (see
+    ``conditional_get``) and static files keep their own revalidation headers.
+    """
+    if response.headers.get("Cache-Control") == PUBLIC_CACHE_CONTROL or request.endpoint == "static":
+        return response
     response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
     response.headers["Pragma"] = "no-cache"
     response.headers["Expires"] = "0"
@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify
 from werkzeug.exceptions import BadRequest, NotFound
-from app.services.document_service import DocumentService
+from app.services.document_service import DOCUMENTS_TABLE, DocumentService
 from app.utils.auth_decorator import admin_required
+from app.utils.http_cache import conditional_get
 
 documents_bp = Blueprint("kannada_documents", __name__, url_prefix="/api/documents")
 
@@ -35,6 +36,7 @@ def create_doc():
 
 # ---------------- READ (All) ----------------
 @documents_bp.route("/", methods=["GET"])
+@conditional_get(DOCUMENTS_TABLE)
 def list_docs():
     result = DocumentService.get_all_documents()
     if not result.success:
@@ -45,6 +47,7 @@ def list_docs():
 
 # ---------------- READ (Single) ----------------
 @documents_bp.route("/<int:doc_id>", methods=["GET"])
+@conditional_get(DOCUMENTS_TABLE)
 def get_doc(doc_id):
     result = DocumentService.get_document_by_id(doc_id)
     if not result.success:
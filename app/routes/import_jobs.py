@@ -0,0 +1,55 @@
+from flask import Blueprint, g, jsonify, request, url_for
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.services.import_jobs import import_jobs
+from app.utils.auth_decorator import admin_required
+from app.utils.logger import setup_logger
+from app.utils.pagination import bool_arg
+
+import_jobs_bp = Blueprint("import_jobs", __name__, url_prefix="/api/jobs")
+logger = setup_logger("import_jobs_routes")
+
+
+def wants_background_import() -> bool:
+    """True when an upload request asks to run as a job (``async=true`` in the query or form)."""
+    return bool_arg(request.values.get("async"), default=False)
+
+
+def queue_import(kind: str, upload):
+    """Queue ``upload`` as a background import and answer 202 with the job."""
+    try:
+        job = import_jobs.submit(kind, upload, created_by=getattr(g.get("user"), "id", None))
+    except (OSError, SQLAlchemyError) as e:
+        logger.error(f"Failed to queue {kind} import: {e}", exc_info=True)
+        return jsonify({"success": False, "message": "Failed to queue import job"}), 500
+
+    status_url = url_for("import_jobs.get_job", job_id=job["id"])
+    response = jsonify({"success": True, "job_id": job["id"], "status_url": status_url, "job": job})
+    response.status_code = 202
+    response.headers["Location"] = status_url
+    return response
+
+
+@import_jobs_bp.route("/<job_id>", methods=["GET"])
+@admin_required
+def get_job(job_id):
+    """Progress of an import: rows processed, errors so far, ETA and final result."""
+    job = import_jobs.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": "Job not found"}), 404
+    return jsonify({"success": True, "job": job})
+
+
+@import_jobs_bp.route("/<job_id>", methods=["DELETE"])
+@import_jobs_bp.route("/<job_id>/cancel", methods=["POST"])
+@admin_required
+def cancel_job(job_id):
+    """
+    Request cancellation; the import stops after its current batch. Verse and
+    padavivarana imports roll back; Arthakosha imports commit per batch, so the
+    batches before the stop stay and the job reports how many records that is.
+    """
+    job = import_jobs.cancel(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": "Job not found"}), 404
+    return jsonify({"success": True, "job": job})
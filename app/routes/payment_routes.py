@@ -1,6 +1,7 @@
 from flask import Blueprint, render_template, request, jsonify
 from app.services.payment_service import CashfreePaymentService
 from app.services.shopping_user_service import MessageTemplate
+from app.utils.lazy import LazyService
 from app.utils.logger import setup_logger
 
 payment_bp = Blueprint(
@@ -13,7 +14,7 @@ payment_bp = Blueprint(
 API_PREFIX = "/api/v1"
 logger = setup_logger("payment_route")
 
-payment_service = CashfreePaymentService()
+payment_service = LazyService(CashfreePaymentService)
 
 
 # =====================================================
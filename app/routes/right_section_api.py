@@ -1,21 +1,31 @@
 from flask import Blueprint
-from flask import jsonify, request
+from flask import Response, jsonify, request
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.config.database import db_instance
+from app.routes.import_jobs import queue_import, wants_background_import
 from app.services.right_section import (
 
     ParibhashikaPadavivaranaService,
     ArthakoshaService,
     BulkUploadService, TatvapadaSuchiService,
 )
+from app.services.suggest_index import SUGGEST_KINDS, suggest_index
 from app.utils.auth_decorator import admin_required
+from app.utils.http_cache import conditional_get
+from app.utils.pagination import bool_arg
+from app.utils.verse_cache import verse_cache
 
 # Blueprint with url_prefix for API versioning
 right_section_impl_bp = Blueprint(
     "right_section_impl", __name__, url_prefix="/api/v1/right-section"
 )
 
+# Tables each public GET is built from, for its ETag (see conditional_get)
+_VERSE_TABLES = ("tatvapada", "tatvapada_author_info")
+_PADAVIVARANA_TABLES = ("paribhashika_padavivarana", "tatvapada_author_info")
+_ARTHAKOSHA_TABLES = ("arthakosha", "tatvapada_author_info")
+
 # Initialize services
 tatvapada_service = TatvapadaSuchiService()
 padavivarana_service = ParibhashikaPadavivaranaService()
@@ -25,16 +35,27 @@ bulk_service = BulkUploadService(db_instance.session)
 
 # ----------------- Tatvapada Routes -----------------
 @right_section_impl_bp.route("/tatvapadasuchi", methods=["GET"])
+@conditional_get(*_VERSE_TABLES)
 def list_tatvapadas():
+    """
+    Paginated verse list. Pass the returned ``next_cursor`` as ``cursor`` to get
+    the next page (``offset`` is then ignored); ``include_total=false`` skips the
+    COUNT and returns ``total`` as null.
+    """
     offset = int(request.args.get("offset", 0))
     limit = int(request.args.get("limit", 10))
     search = request.args.get("search", "").strip()
+    cursor = request.args.get("cursor") or None
+    include_total = bool_arg(request.args.get("include_total"))
     MAX_LIMIT = 100
     if limit > MAX_LIMIT:
         limit = MAX_LIMIT
 
-    data = tatvapada_service.get_tatvapada_suchi(offset, limit, search)
-    next_offset = offset + limit if (offset + limit) < data["total"] else None
+    try:
+        data = tatvapada_service.get_tatvapada_suchi(offset, limit, search, cursor, include_total)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    next_offset = offset + limit if data["next_cursor"] else None
     prev_offset = offset - limit if offset - limit >= 0 else None
 
     return jsonify({
@@ -44,11 +65,13 @@ def list_tatvapadas():
         "total": data["total"],
         "next_offset": next_offset,
         "prev_offset": prev_offset,
+        "next_cursor": data["next_cursor"],
         "data": data["results"]
     })
 
 
 @right_section_impl_bp.route("/tatvapada", methods=["GET"])
+@conditional_get(*_VERSE_TABLES)
 def get_tatvapada():
     samputa = request.args.get("samputa_sankhye")
     author_id = request.args.get("tatvapada_author_id")
@@ -58,17 +81,53 @@ def get_tatvapada():
         return jsonify({"error": "samputa_sankhye, tatvapada_author_id, and tatvapada_sankhye are required"}), 400
 
     try:
-        record = tatvapada_service.get_tatvapada_details(samputa, int(author_id), number)
+        samputa, author_id, number = samputa.strip(), int(author_id), number.strip()
+        body = verse_cache.get_json(
+            ("details", samputa, author_id, number),
+            lambda: tatvapada_service.get_tatvapada_details(samputa, author_id, number),
+        )
     except Exception as e:
         return jsonify({"error": "Server error", "details": str(e)}), 500
 
-    if not record:
+    if body is None:
         return jsonify({"error": "Tatvapada not found"}), 404
-    return jsonify(record)
+    return Response(body, mimetype="application/json")
+
+
+# ----------------- Suggest (typeahead) Route -----------------
+@right_section_impl_bp.route("/suggest", methods=["GET"])
+def suggest():
+    """
+    Prefix completions for the typeahead boxes, served from the in-memory index.
+
+    Query params: q (typed prefix), kind (comma-separated subset of
+    tatvapada, padavivarana, arthakosha; default all), limit (per kind, max 50).
+    """
+    query = request.args.get("q", "")
+    kinds = [k.strip() for k in request.args.get("kind", ",".join(SUGGEST_KINDS)).split(",") if k.strip()]
+    unknown = [k for k in kinds if k not in SUGGEST_KINDS]
+    if not kinds or unknown:
+        return jsonify({
+            "success": False,
+            "message": f"kind must be one or more of: {', '.join(SUGGEST_KINDS)}"
+        }), 400
+
+    try:
+        limit = min(max(int(request.args.get("limit", 10)), 1), 50)
+    except ValueError:
+        return jsonify({"success": False, "message": "limit must be an integer"}), 400
+
+    try:
+        data = suggest_index.suggest(query, kinds, limit)
+    except SQLAlchemyError:
+        return jsonify({"success": False, "message": "Database error occurred while loading suggestions"}), 500
+
+    return jsonify({"success": True, "query": query, "limit": limit, "data": data})
 
 
 # ----------------- Paribhashika Padavivarana Routes -----------------
 @right_section_impl_bp.route("/samputa-authors", methods=["GET"])
+@conditional_get(*_VERSE_TABLES)
 def get_samputa_authors():
     try:
         data = tatvapada_service.get_samputa_with_authors()
@@ -78,21 +137,29 @@ def get_samputa_authors():
 
 
 @right_section_impl_bp.route("/padavivarana", methods=["GET"])
+@conditional_get(*_PADAVIVARANA_TABLES)
 def get_all_padavivarana():
     offset = int(request.args.get("offset", 0))
     limit = int(request.args.get("limit", 10))
     search = request.args.get("search", "")
-    data = padavivarana_service.get_all(offset, limit, search)
+    cursor = request.args.get("cursor") or None
+    include_total = bool_arg(request.args.get("include_total"))
+    try:
+        data = padavivarana_service.get_all(offset, limit, search, cursor, include_total)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
     return jsonify(data)
 
 
 @right_section_impl_bp.route("/padavivarana/<samputa>/<author_id>", methods=["GET"])
+@conditional_get(*_PADAVIVARANA_TABLES)
 def get_padavivarana_id_by_samputa_author(samputa, author_id):
     entries = padavivarana_service.get_id_title(samputa, int(author_id))
     return jsonify({"success": True, "data": entries})
 
 
 @right_section_impl_bp.route("/padavivarana/<samputa>/<author_id>/<int:entry_id>", methods=["GET"])
+@conditional_get(*_PADAVIVARANA_TABLES)
 def get_padavivarana(samputa, author_id, entry_id):
     entry = padavivarana_service.get_entry(samputa, int(author_id), entry_id)
     if entry:
@@ -145,6 +212,9 @@ def bulk_upload_padavivarana():
         return jsonify({"success": False, "message": "No file selected"}), 400
 
     file = request.files["file"]
+    if wants_background_import():
+        return queue_import("padavivarana-upload", file)
+
     records_added, errors = bulk_service.upload_paribhashika_padavivarana(file.stream)
     db_instance.session.commit()
     return jsonify({
@@ -156,6 +226,7 @@ def bulk_upload_padavivarana():
 
 # ----------------- Arthakosha Routes -----------------
 @right_section_impl_bp.route("/arthakosha/<samputa>/<int:author_id>", methods=["GET"])
+@conditional_get(*_ARTHAKOSHA_TABLES)
 def get_arthakosha_by_samputa_author(samputa, author_id):
     entries = ArthakoshaService.get_by_samputa_author(
         samputa=samputa.strip(),
@@ -206,10 +277,15 @@ def list_arthakoshas():
             author_id=author_id,
             offset=offset,
             limit=limit,
-            search=search or None
+            search=search or None,
+            cursor=request.args.get("cursor") or None,
+            include_total=bool_arg(request.args.get("include_total")),
         )
         return jsonify({"success": True, **data})
 
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
     except Exception:
         return jsonify({"success": False, "message": "Failed to list Arthakosha entries"}), 500
 
@@ -287,6 +363,8 @@ def bulk_upload_arthakosha():
         }), 400
 
     file = request.files["file"]
+    if wants_background_import():
+        return queue_import("arthakosha-upload", file)
 
     records_added, errors = bulk_service.upload_arthakosha(file.stream)
 
@@ -2,6 +2,7 @@ import os
 from flask import Blueprint, request, jsonify, render_template, current_app
 from werkzeug.utils import secure_filename
 from app.services.shopping_books_service import ShoppingBooksService, allowed_file
+from app.utils.pagination import bool_arg
 
 UPLOAD_FOLDER = "uploads/covers"
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -27,12 +28,19 @@ def api_list_books():
         start = int(request.args.get("start", 0))
         length = int(request.args.get("length", 10))
         search_value = request.args.get("search_word", "").strip()
-
-        total_count, filtered_count, books = service.list_books(
-            search_word=search_value,
-            limit=length,
-            offset=start
-        )
+        cursor = request.args.get("cursor") or None
+        include_total = bool_arg(request.args.get("include_total"))
+
+        try:
+            total_count, filtered_count, books, next_cursor = service.list_books(
+                search_word=search_value,
+                limit=length,
+                offset=start,
+                cursor=cursor,
+                include_total=include_total
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
         data = [{
             "id": b.id,
@@ -59,6 +67,7 @@ def api_list_books():
             "draw": draw,
             "recordsTotal": total_count,
             "recordsFiltered": filtered_count,
+            "next_cursor": next_cursor,
             "data": data
         })
     except Exception as e:
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify, render_template
 from app.services.shopping_user_service import ShoppingUserService, ShoppingUserAddressService, ShoppingOrderService, \
     ShoppingTatvapadaService, MessageTemplate
 from app.utils.auth_decorator import admin_required
+from app.utils.pagination import bool_arg
 from app.utils.logger_config import get_logger
 
 shopping_user_bp = Blueprint("shopping_user",__name__,template_folder="templates/shopping",url_prefix="/shopping")
@@ -179,10 +180,15 @@ def product_catalog():
         offset = int(request.args.get("offset", 0))
         limit = int(request.args.get("limit", 10))
         search = request.args.get("search", None)  # Optional search parameter
+        cursor = request.args.get("cursor") or None  # next_cursor of the previous page
+        include_total = bool_arg(request.args.get("include_total"))
+
+        result = ShoppingTatvapadaService.get_catalog(
+            offset=offset, limit=limit, search=search, cursor=cursor, include_total=include_total
+        )
     except ValueError as e:
         return jsonify({"success": False, "message": str(e)}), 400
 
-    result = ShoppingTatvapadaService.get_catalog(offset=offset, limit=limit, search=search)
     return jsonify({"success": True, "message": "", "data": result})
 
 
@@ -6,15 +6,22 @@ This module organizes routes into 3 clear groups:
 2. Web Form routes (admin interaction templates)
 3. Bulk Upload routes (CSV import)
 """
-from flask import Blueprint, request, jsonify, render_template
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.inspection import inspect
+import json
+import os
+
+from flask import Blueprint, Response, request, jsonify, render_template
+from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
 
 from app.config.database import db_instance
-from app.services.tatvapada_service import TatvapadaService, BulkService
+from app.routes.import_jobs import queue_import, wants_background_import
+from app.services.tatvapada_service import TatvapadaService, BulkService, check_search_cursor
 from app.utils.auth_decorator import login_required, admin_required
+from app.utils.corpus_signals import row_snapshot
 from app.utils.helper import kannada_to_english_digits
+from app.utils.http_cache import conditional_get
+from app.utils.lazy import LazyService
 from app.utils.logger import setup_logger
+from app.utils.verse_cache import verse_cache
 
 # ==========================================================
 # Setup
@@ -22,9 +29,16 @@ from app.utils.logger import setup_logger
 tatvapada_bp = Blueprint("tatvapada", __name__)
 logger = setup_logger("tatvapada_routes")
 
-tatvapada_service = TatvapadaService()
+tatvapada_service = LazyService(TatvapadaService)
 bulk_service = BulkService(db_instance.session)
 
+# Records accepted by one /api/tatvapada/bulk request
+BULK_API_MAX_RECORDS = int(os.getenv("BULK_API_MAX_RECORDS", 5000))
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+# Tables the public GET responses are built from, for their ETags
+_VERSE_TABLES = ("tatvapada", "tatvapada_author_info")
+
 
 # ==========================================================
 # Helpers
@@ -50,6 +64,49 @@ def _serialize_tatvapada(t):
     }
 
 
+def _normalize_sankhyes(data: dict):
+    """Normalize samputa/tatvapada numbers in place: Kannada digits and "5.0" become "5"."""
+    for key in ["samputa_sankhye", "tatvapada_sankhye"]:
+        if key in data and isinstance(data[key], str):
+            normalized = kannada_to_english_digits(data[key]).strip()
+            try:
+                if float(normalized).is_integer():
+                    data[key] = str(int(float(normalized)))
+                else:
+                    data[key] = normalized
+            except ValueError:
+                data[key] = normalized
+        elif key not in data or data[key] is None:
+            data[key] = ""
+
+
+def _read_bulk_records() -> list:
+    """
+    Records of a bulk request: NDJSON (one object per line) when the body is
+    ``application/x-ndjson``, otherwise a JSON array. Raises ``ValueError``
+    for a malformed or oversized body.
+    """
+    if request.mimetype in NDJSON_MIMETYPES:
+        records = []
+        for line_no, line in enumerate(request.stream, 1):
+            if not line.strip():
+                continue
+            if len(records) >= BULK_API_MAX_RECORDS:
+                raise ValueError(f"At most {BULK_API_MAX_RECORDS} records per request")
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                raise ValueError(f"Line {line_no} is not valid JSON")
+        return records
+
+    records = request.get_json(silent=True)
+    if not isinstance(records, list):
+        raise ValueError("Expected a JSON array of records or an NDJSON body")
+    if len(records) > BULK_API_MAX_RECORDS:
+        raise ValueError(f"At most {BULK_API_MAX_RECORDS} records per request")
+    return records
+
+
 # ==========================================================
 # JSON API ROUTES (CRUD + Search + Utilities)
 # ==========================================================
@@ -69,19 +126,7 @@ def add_tatvapada():
         return jsonify({"error": "No input data provided"}), 400
 
     try:
-        # Normalize numeric fields
-        for key in ["samputa_sankhye", "tatvapada_sankhye"]:
-            if key in data and isinstance(data[key], str):
-                normalized = kannada_to_english_digits(data[key]).strip()
-                try:
-                    if float(normalized).is_integer():
-                        data[key] = str(int(float(normalized)))
-                    else:
-                        data[key] = normalized
-                except ValueError:
-                    data[key] = normalized
-            elif key not in data or data[key] is None:
-                data[key] = ""
+        _normalize_sankhyes(data)
 
         # Author validation
         if not data.get("tatvapadakarara_hesaru"):
@@ -103,6 +148,54 @@ def add_tatvapada():
         return jsonify({"error": "Unexpected error occurred."}), 500
 
 
+# ---------- BULK CREATE ----------
+@tatvapada_bp.route("/api/tatvapada/bulk", methods=["POST"])
+@admin_required
+def bulk_add_tatvapada():
+    """
+    Insert many Tatvapadas in one transaction.
+    Body: NDJSON (Content-Type: application/x-ndjson) or a JSON array of
+    records with the /api/tatvapada/add schema, at most BULK_API_MAX_RECORDS.
+    Responds with a status per record (index counts from 1):
+    200 all inserted, 207 some inserted, 400 none inserted; 503 when the
+    transaction lost a lock conflict and should be retried.
+    """
+    try:
+        records = _read_bulk_records()
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    if not records:
+        return jsonify({"error": "No input data provided"}), 400
+
+    for record in records:
+        if isinstance(record, dict):
+            _normalize_sankhyes(record)
+
+    try:
+        results = bulk_service.ingest_records(records)
+        db_instance.session.commit()
+    except OperationalError:
+        # Lock wait timeout or deadlock: nothing was kept, so the batch can be resent as is
+        db_instance.session.rollback()
+        logger.warning("Bulk insert rolled back on a lock conflict", exc_info=True)
+        response = jsonify({"error": "Database busy, retry the batch."})
+        response.headers["Retry-After"] = "1"
+        return response, 503
+    except Exception:
+        db_instance.session.rollback()
+        logger.error("Unexpected error in bulk_add_tatvapada", exc_info=True)
+        return jsonify({"error": "Unexpected error occurred during bulk insert."}), 500
+
+    inserted = sum(1 for result in results if result["status"] == "inserted")
+    logger.info(f"Bulk insert: {inserted} of {len(results)} records inserted")
+    response = {"inserted": inserted, "failed": len(results) - inserted, "results": results}
+    if inserted == len(results):
+        return jsonify(response), 200
+    if inserted > 0:
+        return jsonify(response), 207  # Multi-Status
+    return jsonify(response), 400
+
+
 # ---------- BULK UPDATE ----------
 @tatvapada_bp.route("/api/tatvapada/bulk-update", methods=["POST"])
 @admin_required
@@ -111,6 +204,7 @@ def bulk_update_tatvapada():
     Bulk update Tatvapada records from CSV upload.
     Expects multipart/form-data with file field: 'file'
     Matching: samputa_sankhye + tatvapada_sankhye + tatvapadakarara_hesaru
+    With async=true the update runs as a background job (202 + job id, see /api/jobs).
     """
     if "file" not in request.files:
         return jsonify({"error": "CSV file is required"}), 400
@@ -123,26 +217,34 @@ def bulk_update_tatvapada():
     if not file.filename.lower().endswith(".csv"):
         return jsonify({"error": "Only CSV files are supported"}), 400
 
+    if wants_background_import():
+        return queue_import("tatvapada-update", file)
+
     try:
-        records_updated, errors = tatvapada_service.bulk_service.update_csv_records(file)
+        records_updated, errors, counts = bulk_service.update_csv_records(file)
+        db_instance.session.commit()
 
         response = {
             "records_updated": records_updated,
+            "unchanged": counts["unchanged"],
+            "missing": counts["missing"],
             "errors": errors
         }
+        matched = records_updated + counts["unchanged"]
 
         # Partial success
-        if errors and records_updated > 0:
+        if errors and matched > 0:
             return jsonify(response), 207  # Multi-Status
 
-        # Full success
-        if records_updated > 0 and not errors:
+        # Full success (including a re-upload with nothing to change)
+        if matched > 0 and not errors:
             return jsonify(response), 200
 
-        # Full failure (no records updated)
+        # Full failure (no records matched)
         return jsonify(response), 400
 
     except Exception:
+        db_instance.session.rollback()
         logger.error("Unexpected error in bulk_update_tatvapada", exc_info=True)
         return jsonify({"error": "Unexpected error occurred during bulk update."}), 500
 
@@ -152,6 +254,16 @@ def bulk_update_tatvapada():
 def search_tatvapada():
     """
     Search Tatvapada entries by keyword with optional samputa/author filters and pagination.
+
+    ``mode`` selects the search:
+      - "exact" (default): whole-word match in the verse text, in samputa/sankhye order,
+        returning full entries.
+      - "ranked": any keyword word in the verse, title, bhavanuvada or tippani, best
+        matches first, returning a score and highlighted snippets per entry.
+
+    In exact mode, pass the returned ``pagination.next_cursor`` as ``cursor`` to get
+    the next page (``offset`` is then ignored); ``include_total: false`` lets the
+    server skip counting when that would take an extra query.
     """
     data = request.get_json() or {}
     tatvapada_service.logger.info(f"Received search payload: {data}")
@@ -159,29 +271,58 @@ def search_tatvapada():
     keyword = (data.get("keyword") or "").strip()
     samputa = (data.get("samputa") or "").strip() or None
     author_id = data.get("author_id", None)
+    mode = (data.get("mode") or "exact").strip().lower()
+    cursor = data.get("cursor") or None
+    include_total = data.get("include_total", True) is not False
 
     offset = max(int(data.get("offset", 0)), 0)
     limit = min(max(int(data.get("limit", 10)), 1), 100)
 
     if not keyword:
         return jsonify({"error": "Keyword is required"}), 400
+    if mode not in ("exact", "ranked"):
+        return jsonify({"error": "mode must be 'exact' or 'ranked'"}), 400
+    if cursor:
+        if mode == "ranked":
+            return jsonify({"error": "cursor is not supported with mode 'ranked'; use offset"}), 400
+        try:
+            check_search_cursor(cursor)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
     try:
-        results, total = tatvapada_service.search_by_keyword(
-            keyword=keyword,
-            offset=offset,
-            limit=limit,
-            samputa=samputa,
-            author_id=int(author_id) if author_id else None
-        )
+        if mode == "ranked":
+            results, total = tatvapada_service.search_ranked(
+                keyword=keyword,
+                offset=offset,
+                limit=limit,
+                samputa=samputa,
+                author_id=int(author_id) if author_id else None
+            )
+            next_cursor = None
+            has_more = (offset + limit) < total
+        else:
+            rows, total, next_cursor = tatvapada_service.search_by_keyword(
+                keyword=keyword,
+                offset=offset,
+                limit=limit,
+                samputa=samputa,
+                author_id=int(author_id) if author_id else None,
+                cursor=cursor,
+                include_total=include_total
+            )
+            results = [_serialize_tatvapada(t) for t in rows]
+            has_more = next_cursor is not None
 
         return jsonify({
-            "results": [_serialize_tatvapada(t) for t in results],
+            "results": results,
+            "mode": mode,
             "pagination": {
                 "total": total,
                 "offset": offset,
                 "limit": limit,
-                "has_more": (offset + limit) < total
+                "has_more": has_more,
+                "next_cursor": next_cursor
             }
         })
 
@@ -193,22 +334,42 @@ def search_tatvapada():
 
 
 @tatvapada_bp.route("/api/tatvapada/<samputa_sankhye>/<tatvapada_author_id>/<tatvapada_sankhye>", methods=["GET"])
+@conditional_get(*_VERSE_TABLES)
 def get_specific_tatvapada(samputa_sankhye, tatvapada_author_id, tatvapada_sankhye):
-    """Fetch a single Tatvapada by composite keys."""
+    """Fetch a single Tatvapada by composite keys (served from the verse cache)."""
+    try:
+        key = (samputa_sankhye.strip(), int(tatvapada_author_id), tatvapada_sankhye.strip())
+    except ValueError:
+        return jsonify({"error": "tatvapada_author_id must be an integer"}), 400
+
+    body = verse_cache.get_json(("specific",) + key, lambda: _load_specific_tatvapada(*key))
+    if body is None:
+        return jsonify({"error": "Tatvapada not found"}), 404
+    return Response(body, mimetype="application/json")
+
+
+def _load_specific_tatvapada(samputa_sankhye, tatvapada_author_id, tatvapada_sankhye):
     tatvapada = tatvapada_service.get_specific_tatvapada(
         samputa_sankhye, tatvapada_author_id, tatvapada_sankhye
     )
     if tatvapada is None:
-        return jsonify({"error": "Tatvapada not found"}), 404
+        return None
 
-    data = {col.key: getattr(tatvapada, col.key) for col in inspect(tatvapada).mapper.column_attrs}
+    data = row_snapshot(tatvapada)
     if tatvapada.tatvapadakarara_hesaru:
         data["tatvapadakarara_hesaru"] = tatvapada.tatvapadakarara_hesaru.tatvapadakarara_hesaru
+    return data
 
-    return jsonify(data)
+
+@tatvapada_bp.route("/api/tatvapada/cache-stats", methods=["GET"])
+@admin_required
+def verse_cache_stats():
+    """Hit/miss counters and size of this worker's verse cache."""
+    return jsonify(verse_cache.stats())
 
 
 @tatvapada_bp.route("/api/tatvapada/sankhyes-by-samputa", methods=["GET"])
+@conditional_get(*_VERSE_TABLES)
 def get_tatvapada_sankhye_by_samputa():
     """List tatvapada_sankhyes for a given samputa_sankhye."""
     try:
@@ -223,12 +384,14 @@ def get_tatvapada_sankhye_by_samputa():
 
 
 @tatvapada_bp.route("/api/tatvapada/samputas", methods=["GET"])
+@conditional_get(*_VERSE_TABLES)
 def get_all_samputas():
     """Return distinct list of all samputa_sankhyes."""
     return jsonify(tatvapada_service.get_all_samputa_sankhye())
 
 
 @tatvapada_bp.route("/api/tatvapada/author-sankhyes-by-samputa/<samputa_sankhye>", methods=["GET"])
+@conditional_get(*_VERSE_TABLES)
 def get_authors_and_sankhyes_by_samputa(samputa_sankhye):
     """Return authors and their tatvapada_sankhyes for a samputa."""
     results = tatvapada_service.get_sankhyes_with_author_by_samputa(samputa_sankhye)
@@ -299,6 +462,7 @@ def delete_specific_tatvapada(samputa_sankhye, tatvapada_sankhye, tatvapada_auth
 
 
 @tatvapada_bp.route("/api/tatvapada/delete-keys", methods=["GET"])
+@conditional_get(*_VERSE_TABLES)
 def get_delete_keys():
     """Fetch all composite keys for deletion."""
     try:
@@ -334,7 +498,10 @@ def tatvapada_update_form():
 @tatvapada_bp.route("/bulk-upload", methods=["POST"])
 @admin_required
 def bulk_upload():
-    """Handle CSV bulk upload of Tatvapada + authors."""
+    """
+    Handle CSV bulk upload of Tatvapada + authors.
+    With async=true the import runs as a background job (202 + job id, see /api/jobs).
+    """
     if 'file' not in request.files:
         return jsonify({"success": False, "message": "No file part in request"}), 400
 
@@ -342,6 +509,9 @@ def bulk_upload():
     if file.filename == '':
         return jsonify({"success": False, "message": "No file selected"}), 400
 
+    if wants_background_import():
+        return queue_import("tatvapada-upload", file)
+
     try:
         records_added, errors = bulk_service.upload_csv_records(file)
         db_instance.session.commit()
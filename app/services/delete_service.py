@@ -1,5 +1,6 @@
 from app.config.database import db_instance
 from app.models.tatvapada import Tatvapada, TatvapadaAuthorInfo
+from app.utils.corpus_signals import notify_after_commit
 
 
 class DeleteService:
@@ -16,17 +17,30 @@ class DeleteService:
         if remaining == 0:
             author = TatvapadaAuthorInfo.query.get(author_id)
             if author:
+                # The database cascades this to the author's padavivarana/arthakosha rows
+                notify_after_commit(self.db, "tatvapada_author_info", deleted=[author.id])
                 self.db.delete(author)
 
+    def _delete_matching(self, **filters):
+        """Delete Tatvapadas matching ``filters`` and queue the ids for post-commit listeners."""
+        query = Tatvapada.query.filter_by(**filters)
+        deleted_ids = [row_id for (row_id,) in query.with_entities(Tatvapada.id)]
+        if not deleted_ids:
+            return 0
+
+        deleted = query.delete(synchronize_session=False)
+        notify_after_commit(self.db, "tatvapada", deleted=deleted_ids)
+        return deleted
+
     # ---------------------------
     # Delete operations
     # ---------------------------
     def delete_entry(self, samputa, tatvapada_sankhye, author_id):
-        deleted = Tatvapada.query.filter_by(
+        deleted = self._delete_matching(
             samputa_sankhye=samputa,
             tatvapada_sankhye=tatvapada_sankhye,
             tatvapada_author_id=author_id
-        ).delete(synchronize_session=False)
+        )
 
         if deleted > 0:
             self.cleanup_author_if_unused(author_id)
@@ -41,9 +55,7 @@ class DeleteService:
         if not author:
             return 0, None
 
-        deleted = Tatvapada.query.filter_by(
-            tatvapada_author_id=author.id
-        ).delete(synchronize_session=False)
+        deleted = self._delete_matching(tatvapada_author_id=author.id)
 
         if deleted > 0:
             self.cleanup_author_if_unused(author.id)
@@ -56,9 +68,7 @@ class DeleteService:
         ).distinct().all()
         author_ids = [a[0] for a in authors]
 
-        deleted = Tatvapada.query.filter_by(
-            samputa_sankhye=samputa
-        ).delete(synchronize_session=False)
+        deleted = self._delete_matching(samputa_sankhye=samputa)
 
         for aid in author_ids:
             self.cleanup_author_if_unused(aid)
@@ -70,10 +80,10 @@ class DeleteService:
         if not author:
             return 0, None
 
-        deleted = Tatvapada.query.filter_by(
+        deleted = self._delete_matching(
             samputa_sankhye=samputa,
             tatvapada_author_id=author_id
-        ).delete(synchronize_session=False)
+        )
 
         if deleted > 0:
             self.cleanup_author_if_unused(author_id)
@@ -92,11 +102,11 @@ class DeleteService:
             if not samputa or not author_id or not sankhya:
                 continue
 
-            deleted = Tatvapada.query.filter_by(
+            deleted = self._delete_matching(
                 samputa_sankhye=samputa,
                 tatvapada_author_id=author_id,
                 tatvapada_sankhye=sankhya
-            ).delete(synchronize_session=False)
+            )
 
             total_deleted += deleted
             author_ids.add(author_id)
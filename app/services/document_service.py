@@ -4,6 +4,9 @@ from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from app.config.database import db_instance
 from app.models.documents import KannadaDocument
+from app.utils.corpus_signals import notify_after_commit, row_snapshot
+
+DOCUMENTS_TABLE = KannadaDocument.__tablename__
 
 
 class ServiceResponse:
@@ -44,6 +47,8 @@ class DocumentService:
                 content=content
             )
             db_instance.session.add(doc)
+            db_instance.session.flush()
+            notify_after_commit(db_instance.session, DOCUMENTS_TABLE, upserted=[row_snapshot(doc)])
             db_instance.session.commit()
             return ServiceResponse(
                 success=True,
@@ -113,6 +118,7 @@ class DocumentService:
                 if hasattr(doc, key) and value is not None:
                     setattr(doc, key, value)
 
+            notify_after_commit(db_instance.session, DOCUMENTS_TABLE, upserted=[row_snapshot(doc)])
             db_instance.session.commit()
             return ServiceResponse(success=True, message="Document updated successfully")
         except SQLAlchemyError as e:
@@ -126,6 +132,7 @@ class DocumentService:
             if not doc:
                 return ServiceResponse(success=False, message="Document not found")
 
+            notify_after_commit(db_instance.session, DOCUMENTS_TABLE, deleted=[doc.id])
             db_instance.session.delete(doc)
             db_instance.session.commit()
             return ServiceResponse(success=True, message="Document deleted successfully")
@@ -0,0 +1,350 @@
+"""
+Background CSV imports.
+
+An upload is saved under ``IMPORT_JOB_DIR`` and recorded as an ``ImportJob``
+row, and the import runs on a small per-process thread pool instead of in the
+request. The job row is the only shared state: the running import writes its
+progress to it over a separate connection (its own transaction stays open
+until the end), and any worker can read it or set ``cancel_requested``, which
+the import notices after its current batch.
+
+Jobs live in the web worker that accepted them, so a worker that dies (crash,
+max_requests recycle, reload) leaves its jobs unfinished. Every progress
+report is a heartbeat: it moves ``updated_at`` of the running job and of the
+jobs still queued behind it in the same process. ``fail_stale_jobs`` marks
+unfinished jobs without a heartbeat for ``IMPORT_JOB_STALE_AFTER`` seconds as
+failed and removes their uploads; workers run it now and then, and the
+startup tasks run it for every unfinished job, since no worker is alive then.
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from flask import current_app
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config.database import db_instance
+from app.models.import_jobs import ImportJob, utc_now
+from app.services.right_section import BulkUploadService
+from app.services.tatvapada_service import BulkService
+from app.utils.csv_stream import ImportCancelled
+from app.utils.logger import setup_logger
+
+# Outside uploads/, which create_app serves without authentication
+IMPORT_JOB_DIR = os.getenv("IMPORT_JOB_DIR", os.path.join("instance", "import_jobs"))
+IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", 1))
+# No heartbeat for this long means the worker running or holding the job is gone
+IMPORT_JOB_STALE_AFTER = float(os.getenv("IMPORT_JOB_STALE_AFTER", 1800))
+# How often a worker looks for stale jobs (on job requests)
+STALE_CHECK_INTERVAL = 60
+# Errors kept on the job row; the count covers all of them
+MAX_STORED_ERRORS = 1000
+
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+INTERRUPTED_MESSAGE = "Import was interrupted because the server process running it stopped. Please upload the file again."
+
+
+def _upload_tatvapada(stream, progress) -> Tuple[int, List[str]]:
+    result = BulkService(db_instance.session).upload_csv_records(stream, progress=progress)
+    db_instance.session.commit()
+    return result
+
+
+def _update_tatvapada(stream, progress) -> Tuple[int, List[str], str]:
+    records, errors, counts = BulkService(db_instance.session).update_csv_records(stream, progress=progress)
+    db_instance.session.commit()
+    return records, errors, f"{counts['updated']} updated, {counts['unchanged']} unchanged, {counts['missing']} missing"
+
+
+def _upload_padavivarana(stream, progress) -> Tuple[int, List[str]]:
+    return BulkUploadService(db_instance.session).upload_paribhashika_padavivarana(stream, progress=progress)
+
+
+def _upload_arthakosha(stream, progress) -> Tuple[int, List[str]]:
+    return BulkUploadService(db_instance.session).upload_arthakosha(stream, progress=progress)
+
+
+# Job kind -> import(stream, progress) returning (records, errors[, summary message])
+# and committing its work
+IMPORTERS: Dict[str, Callable] = {
+    "tatvapada-upload": _upload_tatvapada,
+    "tatvapada-update": _update_tatvapada,
+    "padavivarana-upload": _upload_padavivarana,
+    "arthakosha-upload": _upload_arthakosha,
+}
+
+
+class ImportJobService:
+    """Submit, run, inspect and cancel background imports."""
+
+    def __init__(self, max_workers: int = IMPORT_JOB_WORKERS):
+        self.logger = setup_logger("import_jobs", "import_jobs.log")
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Unfinished jobs of this process; never stale while it runs
+        self._local_jobs: Set[str] = set()
+        self._next_stale_check = 0.0
+
+    # ----------------------
+    # Requests
+    # ----------------------
+    def submit(self, kind: str, upload, created_by: Optional[int] = None) -> dict:
+        """Save ``upload`` (a werkzeug ``FileStorage``) and queue it for ``kind``."""
+        if kind not in IMPORTERS:
+            raise ValueError(f"Unknown import kind: {kind}")
+        self._check_stale_jobs()
+
+        job_id = uuid.uuid4().hex
+        os.makedirs(IMPORT_JOB_DIR, exist_ok=True)
+        path = os.path.join(IMPORT_JOB_DIR, f"{job_id}.csv")
+        upload.save(path)
+
+        job = ImportJob(
+            id=job_id,
+            kind=kind,
+            filename=(upload.filename or "")[:255],
+            file_path=path,
+            bytes_total=os.path.getsize(path),
+            created_by=created_by,
+        )
+        try:
+            db_instance.session.add(job)
+            db_instance.session.commit()
+        except SQLAlchemyError:
+            db_instance.session.rollback()
+            os.remove(path)
+            raise
+
+        with self._lock:
+            self._local_jobs.add(job_id)
+        self._pool().submit(self._run, current_app._get_current_object(), job_id)
+        self.logger.info(f"Queued {kind} job {job_id} ({job.bytes_total} bytes)")
+        return self.to_dict(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        self._check_stale_jobs()
+        job = db_instance.session.get(ImportJob, job_id)
+        return self.to_dict(job) if job else None
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        """Ask a queued or running job to stop; finished jobs are returned unchanged."""
+        job = db_instance.session.get(ImportJob, job_id)
+        if job is None:
+            return None
+        if job.status not in FINISHED_STATUSES:
+            job.cancel_requested = True
+            db_instance.session.commit()
+        return self.to_dict(job)
+
+    @staticmethod
+    def to_dict(job: ImportJob) -> dict:
+        eta = None
+        if job.status == "running" and job.started_at and 0 < job.bytes_read < job.bytes_total:
+            elapsed = (utc_now() - _aware(job.started_at)).total_seconds()
+            eta = round(elapsed * (job.bytes_total - job.bytes_read) / job.bytes_read, 1)
+        return {
+            "id": job.id,
+            "kind": job.kind,
+            "filename": job.filename,
+            "status": job.status,
+            "cancel_requested": bool(job.cancel_requested),
+            "rows_processed": job.rows_processed,
+            "records": job.records,
+            "error_count": job.error_count,
+            "errors": job.errors or [],
+            "bytes_total": job.bytes_total,
+            "bytes_read": job.bytes_read,
+            "eta_seconds": eta,
+            "message": job.message,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        }
+
+    # ----------------------
+    # Worker
+    # ----------------------
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="import-job")
+            return self._executor
+
+    def _run(self, app, job_id: str):
+        with app.app_context():
+            try:
+                self._execute(job_id)
+            except Exception as e:
+                self.logger.error(f"Import job {job_id} crashed: {e}", exc_info=True)
+                self._finish(job_id, "failed", message=str(e))
+            finally:
+                db_instance.session.remove()
+                with self._lock:
+                    self._local_jobs.discard(job_id)
+
+    def _execute(self, job_id: str):
+        job = db_instance.session.get(ImportJob, job_id)
+        if job is None:
+            return
+        path, kind, cancelled = job.file_path, job.kind, job.cancel_requested
+        db_instance.session.rollback()  # end the read before the job row is written elsewhere
+        if cancelled:
+            self._finish(job_id, "cancelled", path=path)
+            return
+        self._report(job_id, status="running", started_at=utc_now())
+
+        started = time.monotonic()
+        rows_seen = [0]
+        with open(path, "rb") as stream:
+            def progress(rows_processed: int, errors: list):
+                rows_seen[0] = rows_processed
+                if self._report(
+                        job_id,
+                        rows_processed=rows_processed,
+                        error_count=len(errors),
+                        errors=_messages(errors[:MAX_STORED_ERRORS]),
+                        bytes_read=stream.tell(),
+                ):
+                    raise ImportCancelled()
+
+            try:
+                records, errors, *summary = IMPORTERS[kind](stream, progress)
+            except ImportCancelled as cancelled:
+                db_instance.session.rollback()
+                message = "Cancelled by request"
+                if cancelled.committed:
+                    message += f"; {cancelled.committed} record(s) committed before the stop were kept"
+                self._finish(job_id, "cancelled", path=path, message=message,
+                             rows_processed=rows_seen[0], records=cancelled.committed)
+                self.logger.info(f"Import job {job_id} cancelled")
+                return
+            except Exception as e:
+                db_instance.session.rollback()
+                self.logger.error(f"Import job {job_id} failed: {e}", exc_info=True)
+                self._finish(job_id, "failed", path=path, message=str(e))
+                return
+            bytes_read = stream.tell()
+
+        self._finish(
+            job_id, "succeeded", path=path,
+            rows_processed=rows_seen[0],
+            records=records,
+            message=summary[0] if summary else None,
+            error_count=len(errors),
+            errors=_messages(errors[:MAX_STORED_ERRORS]),
+            bytes_read=bytes_read,
+        )
+        self.logger.info(
+            f"Import job {job_id} finished in {time.monotonic() - started:.1f}s: "
+            f"{records} records, {len(errors)} errors"
+        )
+
+    def _report(self, job_id: str, **values) -> bool:
+        """
+        Write ``values`` to the job row in a transaction of its own and return
+        whether cancellation was requested. Failures are logged, not raised,
+        so a busy job table never aborts an import.
+        """
+        table = ImportJob.__table__
+        with self._lock:
+            queued = list(self._local_jobs - {job_id})
+        try:
+            with db_instance.engine.begin() as conn:
+                now = utc_now()
+                conn.execute(update(table).where(table.c.id == job_id).values(updated_at=now, **values))
+                if queued:
+                    # Heartbeat for the jobs waiting behind this one in the pool
+                    conn.execute(update(table).where(table.c.id.in_(queued), table.c.status == "queued")
+                                 .values(updated_at=now))
+                return bool(conn.execute(select(table.c.cancel_requested).where(table.c.id == job_id)).scalar())
+        except SQLAlchemyError as e:
+            self.logger.warning(f"Could not update import job {job_id}: {e}")
+            return False
+
+    def _finish(self, job_id: str, status: str, path: Optional[str] = None, **values):
+        self._report(job_id, status=status, finished_at=utc_now(), **values)
+        self._remove_upload(path)
+
+    def _remove_upload(self, path: Optional[str]):
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                self.logger.warning(f"Could not remove upload {path}: {e}")
+
+    # ----------------------
+    # Orphaned jobs
+    # ----------------------
+    def _check_stale_jobs(self):
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_stale_check:
+                return
+            self._next_stale_check = now + STALE_CHECK_INTERVAL
+        self.fail_stale_jobs()
+
+    def fail_stale_jobs(self, stale_after: float = IMPORT_JOB_STALE_AFTER) -> int:
+        """
+        Mark unfinished jobs of other processes with no heartbeat for
+        ``stale_after`` seconds as failed and remove their uploads. Returns the
+        number of jobs failed. Failures are logged, not raised.
+        """
+        table = ImportJob.__table__
+        now = utc_now()
+        with self._lock:
+            local = set(self._local_jobs)
+        try:
+            with db_instance.engine.begin() as conn:
+                unfinished = table.c.status.notin_(FINISHED_STATUSES)
+                stale = [
+                    (job_id, path) for job_id, path in conn.execute(
+                        select(table.c.id, table.c.file_path)
+                        .where(unfinished, table.c.updated_at < now - timedelta(seconds=stale_after))
+                    )
+                    if job_id not in local
+                ]
+                if stale:
+                    conn.execute(
+                        update(table).where(table.c.id.in_([job_id for job_id, _ in stale]), unfinished)
+                        .values(status="failed", message=INTERRUPTED_MESSAGE, finished_at=now, updated_at=now)
+                    )
+        except SQLAlchemyError as e:
+            self.logger.warning(f"Could not check for stale import jobs: {e}")
+            return 0
+
+        for job_id, path in stale:
+            self._remove_upload(path)
+            self.logger.warning(f"Import job {job_id} had no heartbeat for {stale_after:.0f}s; marked failed")
+        return len(stale)
+
+    def recover_after_restart(self) -> int:
+        """
+        Startup task: no worker is running yet, so every unfinished job is
+        orphaned. Fails them all and removes every upload left in
+        IMPORT_JOB_DIR. Returns the number of jobs failed.
+        """
+        failed = self.fail_stale_jobs(stale_after=0)
+        if os.path.isdir(IMPORT_JOB_DIR):
+            for name in os.listdir(IMPORT_JOB_DIR):
+                self._remove_upload(os.path.join(IMPORT_JOB_DIR, name))
+        return failed
+
+
+def _messages(errors: list) -> List[str]:
+    """Error messages from a list of messages or (row number, message) pairs."""
+    return [error[1] if isinstance(error, tuple) else error for error in errors]
+
+
+def _aware(value):
+    # SQLite hands back naive datetimes even for timezone=True columns
+    return value if value.tzinfo else value.replace(tzinfo=utc_now().tzinfo)
+
+
+import_jobs = ImportJobService()
@@ -0,0 +1,139 @@
+"""
+In-memory samputa -> author -> sankhye tree for the navigation endpoints.
+
+The tree is built from one query over three narrow columns of ``tatvapada``
+(plus the small author table) and stored compactly: every verse is one
+interned sankhye string in a single list sorted by (samputa, author id,
+sankhye), and each samputa/author pair is an ``array('I')`` of (author id,
+start, end) into it. The samputa list, per-samputa sankhye lists, author
+lists and delete keys are all read from it.
+
+Each worker keeps one snapshot and rebuilds it on the next request after the
+``tatvapada`` or ``tatvapada_author_info`` generation changes (see
+``app.utils.generations``).
+"""
+import sys
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from app.config.database import db_instance
+from app.models.tatvapada import Tatvapada, TatvapadaAuthorInfo
+from app.utils.generations import table_generations
+from app.utils.logger import setup_logger
+
+_TABLES = ("tatvapada", "tatvapada_author_info")
+
+
+def _int_or_none(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class NavigationTree:
+    """Immutable snapshot of every (samputa, author, sankhye) key."""
+
+    def __init__(self, rows: List[Tuple[str, int, str]], authors: Dict[int, str]):
+        rows.sort()
+        self.authors = authors
+        self.samputas: List[str] = []
+        self._sankhyes: List[str] = []
+        # samputa -> [(author id, lo, hi)] slices of _sankhyes
+        self._groups: Dict[str, List[array]] = {}
+        # int(samputa) -> samputa strings, so "1" also finds "01" like MySQL's comparison does
+        self._numeric: Dict[int, List[str]] = {}
+
+        groups = None
+        for samputa, author_id, sankhye in rows:
+            if samputa not in self._groups:
+                samputa = sys.intern(samputa)
+                self.samputas.append(samputa)
+                groups = self._groups[samputa] = []
+                number = _int_or_none(samputa)
+                if number is not None:
+                    self._numeric.setdefault(number, []).append(samputa)
+            if not groups or groups[-1][0] != author_id:
+                groups.append(array("I", (author_id, len(self._sankhyes), len(self._sankhyes))))
+            self._sankhyes.append(sys.intern(sankhye))
+            groups[-1][2] += 1
+
+    def __len__(self) -> int:
+        return len(self._sankhyes)
+
+    def _resolve(self, samputa) -> List[str]:
+        key = str(samputa).strip()
+        if key in self._groups:
+            return [key]
+        number = _int_or_none(key)
+        return self._numeric.get(number, []) if number is not None else []
+
+    def _slices(self, samputa) -> List[Tuple[str, int, int, int]]:
+        return [(s, author_id, lo, hi) for s in self._resolve(samputa) for author_id, lo, hi in self._groups[s]]
+
+    def sankhyes(self, samputa) -> List[str]:
+        """Distinct sankhyes of a samputa, across authors."""
+        seen = {}
+        for _, _, lo, hi in self._slices(samputa):
+            for sankhye in self._sankhyes[lo:hi]:
+                seen.setdefault(sankhye, None)
+        return list(seen)
+
+    def sankhyes_with_authors(self, samputa) -> List[Tuple[str, int, Optional[str]]]:
+        """(sankhye, author id, author name) of every verse in a samputa."""
+        return [
+            (sankhye, author_id, self.authors.get(author_id))
+            for _, author_id, lo, hi in self._slices(samputa)
+            for sankhye in self._sankhyes[lo:hi]
+        ]
+
+    def samputa_authors(self) -> List[Tuple[str, List[int]]]:
+        """(samputa, author ids) for every samputa."""
+        return [(samputa, [author_id for author_id, _, _ in self._groups[samputa]]) for samputa in self.samputas]
+
+    def author_groups(self) -> List[Tuple[str, int, List[str]]]:
+        """(samputa, author id, sankhyes) for every samputa/author pair."""
+        return [
+            (samputa, author_id, self._sankhyes[lo:hi])
+            for samputa in self.samputas
+            for author_id, lo, hi in self._groups[samputa]
+        ]
+
+
+class NavigationTreeCache:
+    """Per-worker holder of the current ``NavigationTree``."""
+
+    def __init__(self):
+        self.logger = setup_logger("navigation_tree", "navigation_tree.log")
+        self._lock = threading.Lock()
+        # (table generations it was built at, tree), swapped as one reference
+        self._snapshot: Optional[tuple] = None
+
+    def get(self) -> NavigationTree:
+        generation = table_generations.current(*_TABLES)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot[0] == generation:
+            return snapshot[1]
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot[0] != generation:
+                snapshot = self._snapshot = (generation, self._load())
+            return snapshot[1]
+
+    def _load(self) -> NavigationTree:
+        rows = [
+            ((samputa or "").strip(), author_id, (sankhye or "").strip())
+            for samputa, author_id, sankhye in db_instance.session.query(
+                Tatvapada.samputa_sankhye, Tatvapada.tatvapada_author_id, Tatvapada.tatvapada_sankhye
+            )
+        ]
+        authors = dict(
+            db_instance.session.query(TatvapadaAuthorInfo.id, TatvapadaAuthorInfo.tatvapadakarara_hesaru)
+        )
+        tree = NavigationTree(rows, authors)
+        self.logger.info(f"Navigation tree built: {len(tree.samputas)} samputas, {len(tree)} verses")
+        return tree
+
+
+navigation_tree = NavigationTreeCache()
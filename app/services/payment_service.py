@@ -3,10 +3,6 @@ import os
 import uuid
 import requests
 from flask import request
-from cashfree_pg.api_client import Cashfree
-from cashfree_pg.models.create_order_request import CreateOrderRequest
-from cashfree_pg.models.customer_details import CustomerDetails
-from cashfree_pg.models.order_meta import OrderMeta
 
 from app.services.shopping_user_service import ShoppingOrderService
 from app.utils.logger import setup_logger
@@ -14,6 +10,9 @@ from app.utils.logger import setup_logger
 
 class CashfreePaymentService:
     def __init__(self, environment: str = None, api_version: str = "2023-08-01"):
+        # The Cashfree SDK takes over a second to import, so it is only loaded with the service
+        from cashfree_pg.api_client import Cashfree
+
         self.logger = setup_logger("CashfreePaymentService")
 
         env = (environment or os.getenv("CASHFREE_ENV", "sandbox")).lower()
@@ -62,6 +61,10 @@ class CashfreePaymentService:
         host_url: str = None,
         **kwargs
     ):
+        from cashfree_pg.models.create_order_request import CreateOrderRequest
+        from cashfree_pg.models.customer_details import CustomerDetails
+        from cashfree_pg.models.order_meta import OrderMeta
+
         order_id = self.generate_order_id()
         base_url = self._get_base_url(host_url)
 
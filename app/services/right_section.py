@@ -1,14 +1,16 @@
-import csv
-import io
 from typing import Tuple, List
-from sqlalchemy import func
-from sqlalchemy import or_
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import joinedload
+from sqlalchemy import insert, or_
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from app.config.database import db_instance
 from app.models.documents import TatvapadakararaVivara
 from app.models.tatvapada import Tatvapada, Arthakosha, ParibhashikaPadavivarana
 from app.models.tatvapada import TatvapadaAuthorInfo
+from app.services.navigation_tree import navigation_tree
+from app.text import normalize_para
+from app.utils.corpus_signals import notify_after_commit, row_snapshot
+from app.utils.count_cache import count_cache
+from app.utils.csv_stream import CsvBatchReader, ImportCancelled
+from app.utils.pagination import keyset_page
 
 
 # ----------------- Tatvapada Service -----------------
@@ -16,8 +18,11 @@ class TatvapadaSuchiService:
     """Service to manage Tatvapada entries and related queries"""
 
     @staticmethod
-    def get_tatvapada_suchi(offset=0, limit=10, search=""):
-        """Fetch paginated list of Tatvapada entries."""
+    def get_tatvapada_suchi(offset=0, limit=10, search="", cursor=None, include_total=True):
+        """
+        Fetch paginated list of Tatvapada entries, ordered by
+        (samputa_sankhye, tatvapada_sankhye, tatvapada_author_id).
+        """
         try:
             query = (
                 Tatvapada.query
@@ -33,8 +38,17 @@ class TatvapadaSuchiService:
             if search:
                 query = query.filter(Tatvapada.tatvapada_first_line.ilike(f"{search.strip()}%"))
 
-            total = query.count()
-            rows = query.offset(offset).limit(limit).all()
+            total = None
+            if include_total:
+                total = count_cache.count(("tatvapada", "tatvapada_author_info"), ("suchi", search.strip()), query)
+            # Same column order as uq_tatvapada_composite, so pages are index range scans
+            rows, next_cursor = keyset_page(
+                query,
+                (Tatvapada.samputa_sankhye, Tatvapada.tatvapada_sankhye, Tatvapada.tatvapada_author_id),
+                limit,
+                cursor=cursor,
+                offset=offset,
+            )
             results = [
                 {
                     "samputa_sankhye": getattr(row, "samputa_sankhye", None),
@@ -45,7 +59,7 @@ class TatvapadaSuchiService:
                 }
                 for row in rows
             ]
-            return {"total": total, "results": results}
+            return {"total": total, "results": results, "next_cursor": next_cursor}
         except Exception as e:
             raise e
 
@@ -56,9 +70,11 @@ class TatvapadaSuchiService:
             row = (
                 Tatvapada.query
                 .filter(
-                    func.trim(Tatvapada.samputa_sankhye) == str(samputa_sankhye).strip(),
+                    # Plain equality so MySQL can use uq_tatvapada_composite; its PAD SPACE
+                    # collation already ignores trailing spaces in the stored values
+                    Tatvapada.samputa_sankhye == str(samputa_sankhye).strip(),
                     Tatvapada.tatvapada_author_id == int(tatvapada_author_id),
-                    func.trim(Tatvapada.tatvapada_sankhye) == str(tatvapada_sankhye).strip(),
+                    Tatvapada.tatvapada_sankhye == str(tatvapada_sankhye).strip(),
                 )
                 .first()
             )
@@ -93,22 +109,13 @@ class TatvapadaSuchiService:
     @staticmethod
     def get_samputa_with_authors():
         """Return list of Samputa numbers with authors."""
-        tatvapadas = (
-            db_instance.session.query(Tatvapada)
-            .options(joinedload(Tatvapada.tatvapadakarara_hesaru))
-            .all()
-        )
-        result = {}
-        for t in tatvapadas:
-            samputa = t.samputa_sankhye
-            author = t.tatvapadakarara_hesaru
-            if samputa not in result:
-                result[samputa] = {}
-            result[samputa][author.id] = author.tatvapadakarara_hesaru
-
+        tree = navigation_tree.get()
         return [
-            {"samputa": samputa, "authors": [{"id": aid, "name": name} for aid, name in authors.items()]}
-            for samputa, authors in result.items()
+            {
+                "samputa": samputa,
+                "authors": [{"id": aid, "name": tree.authors.get(aid)} for aid in author_ids],
+            }
+            for samputa, author_ids in tree.samputa_authors()
         ]
 
 
@@ -117,7 +124,7 @@ class ParibhashikaPadavivaranaService:
     """Service to manage ParibhashikaPadavivarana entries."""
 
     @staticmethod
-    def get_all(offset=0, limit=10, search=""):
+    def get_all(offset=0, limit=10, search="", cursor=None, include_total=True):
         query = (
             db_instance.session.query(
                 ParibhashikaPadavivarana.paribhashika_padavivarana_id,
@@ -135,13 +142,24 @@ class ParibhashikaPadavivaranaService:
                 TatvapadaAuthorInfo.tatvapadakarara_hesaru.ilike(search_str)
             )
 
-        total = query.count()
-        rows = query.order_by(ParibhashikaPadavivarana.paribhashika_padavivarana_id).offset(offset).limit(limit).all()
+        total = None
+        if include_total:
+            total = count_cache.count(
+                ("paribhashika_padavivarana", "tatvapada_author_info"), ("list", (search or "").strip()), query
+            )
+        rows, next_cursor = keyset_page(
+            query,
+            (ParibhashikaPadavivarana.paribhashika_padavivarana_id,),
+            limit,
+            cursor=cursor,
+            offset=offset,
+        )
 
         return {
             "total": total,
             "offset": offset,
             "limit": limit,
+            "next_cursor": next_cursor,
             "results": [
                 {
                     "id": row.paribhashika_padavivarana_id,
@@ -214,6 +232,8 @@ class ParibhashikaPadavivaranaService:
             paribhashika_padavivarana_content=content.strip()
         )
         db_instance.session.add(entry)
+        db_instance.session.flush()
+        notify_after_commit(db_instance.session, "paribhashika_padavivarana", upserted=[row_snapshot(entry)])
         db_instance.session.commit()
         return {
             "id": entry.paribhashika_padavivarana_id,
@@ -238,6 +258,7 @@ class ParibhashikaPadavivaranaService:
         if title is not None:
             entry.paribhashika_padavivarana_title = title.strip()
 
+        notify_after_commit(db_instance.session, "paribhashika_padavivarana", upserted=[row_snapshot(entry)])
         db_instance.session.commit()
         return {
             "id": entry.paribhashika_padavivarana_id,
@@ -256,6 +277,9 @@ class ParibhashikaPadavivaranaService:
         ).first()
         if not entry:
             return False
+        notify_after_commit(
+            db_instance.session, "paribhashika_padavivarana", deleted=[entry.paribhashika_padavivarana_id]
+        )
         db_instance.session.delete(entry)
         db_instance.session.commit()
         return True
@@ -269,8 +293,9 @@ class ArthakoshaService:
     def create(**kwargs):
         samputa = (kwargs.get("samputa") or "").strip()
         author_id = kwargs.get("author_id")
-        word = (kwargs.get("word") or "").strip()
-        meaning = (kwargs.get("meaning") or "").strip()
+        # Normalized so NFC/zero-width variants hash to the same meaning_hash
+        word = normalize_para(kwargs.get("word"))
+        meaning = normalize_para(kwargs.get("meaning"))
         notes = (kwargs.get("notes") or "").strip() or None
 
         if not samputa or not author_id or not word or not meaning:
@@ -286,10 +311,12 @@ class ArthakoshaService:
 
         try:
             db_instance.session.add(entry)
+            db_instance.session.flush()
+            notify_after_commit(db_instance.session, "arthakosha", upserted=[row_snapshot(entry)])
             db_instance.session.commit()
         except IntegrityError:
             db_instance.session.rollback()
-            raise ValueError("Duplicate entry: same word and meaning already exist for this author")
+            raise ValueError(_ARTHAKOSHA_DUPLICATE)
 
         return ArthakoshaService._to_dict(entry)
 
@@ -300,6 +327,8 @@ class ArthakoshaService:
         offset = int(kwargs.get("offset") or 0)
         limit = int(kwargs.get("limit") or 10)
         search = (kwargs.get("search") or "").strip()
+        cursor = kwargs.get("cursor")
+        include_total = kwargs.get("include_total", True)
 
         query = Arthakosha.query.join(Arthakosha.author)
 
@@ -318,13 +347,20 @@ class ArthakoshaService:
                 )
             )
 
-        total = query.count()
-        rows = query.offset(offset).limit(limit).all()
+        total = None
+        if include_total:
+            total = count_cache.count(
+                ("arthakosha", "tatvapada_author_info"),
+                ("list", samputa or None, int(author_id) if author_id else None, search),
+                query,
+            )
+        rows, next_cursor = keyset_page(query, (Arthakosha.id,), limit, cursor=cursor, offset=offset)
 
         return {
             "total": total,
             "offset": offset,
             "limit": limit,
+            "next_cursor": next_cursor,
             "results": [ArthakoshaService._to_dict(r) for r in rows]
         }
 
@@ -358,19 +394,20 @@ class ArthakoshaService:
             return None
 
         if "word" in kwargs and kwargs.get("word") is not None:
-            entry.word = kwargs["word"].strip()
+            entry.word = normalize_para(kwargs["word"])
 
         if "meaning" in kwargs and kwargs.get("meaning") is not None:
-            entry.set_meaning(kwargs["meaning"].strip())
+            entry.set_meaning(normalize_para(kwargs["meaning"]))
 
         if "notes" in kwargs:
             entry.notes = (kwargs.get("notes") or "").strip() or None
 
         try:
+            notify_after_commit(db_instance.session, "arthakosha", upserted=[row_snapshot(entry)])
             db_instance.session.commit()
         except IntegrityError:
             db_instance.session.rollback()
-            raise ValueError("Duplicate entry: same word and meaning already exist for this author")
+            raise ValueError(_ARTHAKOSHA_DUPLICATE)
 
         return ArthakoshaService._to_dict(entry)
 
@@ -389,6 +426,7 @@ class ArthakoshaService:
         if not entry:
             return False
 
+        notify_after_commit(db_instance.session, "arthakosha", deleted=[entry.id])
         db_instance.session.delete(entry)
         db_instance.session.commit()
         return True
@@ -416,65 +454,83 @@ class ArthakoshaService:
 
 
 # ----------------- Bulk Upload Service -----------------
+_ARTHAKOSHA_DUPLICATE = "Duplicate entry: same word and meaning already exist for this author"
+
+
+def _arthakosha_key(entry: dict) -> tuple:
+    # The unique key compares words under utf8mb4_unicode_ci: case and trailing blanks ignored
+    return entry["author_id"], entry["word"].rstrip().casefold(), entry["meaning_hash"]
+
+
 class BulkUploadService:
     """Service to handle bulk CSV uploads for ParibhashikaPadavivarana and Arthakosha"""
 
     def __init__(self, db_session=None):
         self.db = db_session or db_instance.session
 
-    def upload_paribhashika_padavivarana(self, file_stream) -> Tuple[int, List[str]]:
+    def upload_paribhashika_padavivarana(self, file_stream, progress=None) -> Tuple[int, List[str]]:
         """Bulk upload ParibhashikaPadavivarana from CSV.
         Ignores duplicates but logs them in errors.
+        ``progress(rows_processed, errors)`` is called after each batch.
         """
-        records_added = 0
+        records_added = rows_processed = 0
         errors: List[str] = []
 
         try:
-            file_content = file_stream.read().decode("utf-8-sig")
-            reader = csv.DictReader(io.StringIO(file_content))
-            if not reader.fieldnames:
-                return 0, ["CSV file has no header row."]
-
-            required_cols = {
-                "tatvapada_author_id",
-                "samputa_sankhye",
-                "paribhashika_padavivarana_title",
-                "paribhashika_padavivarana_content",
-            }
-            missing_cols = required_cols - set(reader.fieldnames)
-            if missing_cols:
-                return 0, [f"Missing columns: {', '.join(sorted(missing_cols))}"]
-
-            for i, row in enumerate(reader, start=2):
-                try:
-                    padavivarana = ParibhashikaPadavivarana(
-                        tatvapada_author_id=int(row.get("tatvapada_author_id")),
-                        samputa_sankhye=(row.get("samputa_sankhye") or "").strip(),
-                        paribhashika_padavivarana_title=(row.get("paribhashika_padavivarana_title") or "").strip(),
-                        paribhashika_padavivarana_content=(row.get("paribhashika_padavivarana_content") or "").strip(),
-                    )
-
-                    if not padavivarana.samputa_sankhye or not padavivarana.paribhashika_padavivarana_title or not padavivarana.paribhashika_padavivarana_content:
-                        errors.append(f"Row {i}: Missing required field(s).")
-                        continue
-
-                    self.db.add(padavivarana)
-                    self.db.flush()  # catch duplicates early
-                    records_added += 1
-
-                except IntegrityError:
-                    self.db.rollback()
-                    errors.append(
-                        f"Row {i}: Duplicate entry (title='{row.get('paribhashika_padavivarana_title')}', "
-                        f"author_id={row.get('tatvapada_author_id')})"
-                    )
-                except Exception as row_err:
-                    self.db.rollback()
-                    errors.append(f"Row {i}: {str(row_err)}")
+            with CsvBatchReader(file_stream) as reader:
+                if not reader.fieldnames:
+                    return 0, ["CSV file has no header row."]
+
+                required_cols = {
+                    "tatvapada_author_id",
+                    "samputa_sankhye",
+                    "paribhashika_padavivarana_title",
+                    "paribhashika_padavivarana_content",
+                }
+                missing_cols = reader.missing_columns(required_cols)
+                if missing_cols:
+                    return 0, [f"Missing columns: {', '.join(sorted(missing_cols))}"]
+
+                for batch in reader.batches(start=2):
+                    for i, row in batch:
+                        try:
+                            padavivarana = ParibhashikaPadavivarana(
+                                tatvapada_author_id=int(row.get("tatvapada_author_id")),
+                                samputa_sankhye=(row.get("samputa_sankhye") or "").strip(),
+                                paribhashika_padavivarana_title=(row.get("paribhashika_padavivarana_title") or "").strip(),
+                                paribhashika_padavivarana_content=(row.get("paribhashika_padavivarana_content") or "").strip(),
+                            )
+
+                            if not padavivarana.samputa_sankhye or not padavivarana.paribhashika_padavivarana_title or not padavivarana.paribhashika_padavivarana_content:
+                                errors.append(f"Row {i}: Missing required field(s).")
+                                continue
+
+                            self.db.add(padavivarana)
+                            self.db.flush()  # catch duplicates early
+                            notify_after_commit(self.db, "paribhashika_padavivarana", upserted=[row_snapshot(padavivarana)])
+                            records_added += 1
+
+                        except IntegrityError:
+                            self.db.rollback()
+                            errors.append(
+                                f"Row {i}: Duplicate entry (title='{row.get('paribhashika_padavivarana_title')}', "
+                                f"author_id={row.get('tatvapada_author_id')})"
+                            )
+                        except Exception as row_err:
+                            self.db.rollback()
+                            errors.append(f"Row {i}: {str(row_err)}")
+
+                    rows_processed += len(batch)
+                    if progress:
+                        progress(rows_processed, errors)
 
             self.db.commit()
             return records_added, errors
 
+        except ImportCancelled:
+            self.db.rollback()
+            raise
+
         except UnicodeDecodeError:
             self.db.rollback()
             return 0, ["File encoding error. Please upload UTF-8 encoded CSV."]
@@ -483,59 +539,147 @@ class BulkUploadService:
             self.db.rollback()
             return 0, [f"Unexpected error: {str(e)}"]
 
-    def upload_arthakosha(self, file_stream) -> Tuple[int, List[str]]:
-        """Bulk upload Arthakosha from CSV"""
+    def upload_arthakosha(self, file_stream, progress=None) -> Tuple[int, List[str]]:
+        """
+        Bulk upload Arthakosha from CSV, one transaction per batch of rows.
+        ``progress(rows_processed, errors)`` is called after each batch.
+        """
 
-        records_added = 0
+        records_added = rows_processed = 0
         errors: List[str] = []
 
         try:
-            file_content = file_stream.read().decode("utf-8-sig")
-            reader = csv.DictReader(io.StringIO(file_content))
-
-            if not reader.fieldnames:
-                return 0, ["CSV file has no header row."]
-
-            required_cols = {"samputa", "author_id", "word", "meaning"}
-            missing_cols = required_cols - set(reader.fieldnames)
-            if missing_cols:
-                return 0, [f"Missing columns: {', '.join(sorted(missing_cols))}"]
-
-            for i, row in enumerate(reader, start=2):
-                try:
-                    payload = {
-                        "samputa": (row.get("samputa") or "").strip(),
-                        "author_id": row.get("author_id"),
-                        "word": (row.get("word") or "").strip(),
-                        "meaning": (row.get("meaning") or "").strip(),
-                        "notes": (row.get("notes") or "").strip() or None
-                    }
-
-                    if not payload["samputa"] or not payload["author_id"] or not payload["word"] or not payload[
-                        "meaning"]:
-                        errors.append(f"Row {i}: Missing required field(s).")
-                        continue
-
-                    # Let service handle validation & commit
-                    ArthakoshaService.create(**payload)
-                    records_added += 1
-
-                except ValueError as ve:
-                    db_instance.session.rollback()
-                    errors.append(f"Row {i}: {str(ve)}")
-
-                except Exception as row_err:
-                    db_instance.session.rollback()
-                    errors.append(f"Row {i}: {str(row_err)}")
+            with CsvBatchReader(file_stream) as reader:
+                if not reader.fieldnames:
+                    return 0, ["CSV file has no header row."]
+
+                required_cols = {"samputa", "author_id", "word", "meaning"}
+                missing_cols = reader.missing_columns(required_cols)
+                if missing_cols:
+                    return 0, [f"Missing columns: {', '.join(sorted(missing_cols))}"]
+
+                for batch in reader.batches(start=2):
+                    records_added += self._ingest_arthakosha(batch, errors)
+                    rows_processed += len(batch)
+                    if progress:
+                        progress(rows_processed, errors)
 
             return records_added, errors
 
+        except ImportCancelled as cancelled:
+            # Batches before the cancellation are already committed; say how much stays
+            cancelled.committed = records_added
+            raise
+
         except UnicodeDecodeError:
-            return 0, ["File encoding error. Please upload UTF-8 encoded CSV."]
+            # Batches before the undecodable bytes are already committed
+            return records_added, ["File encoding error. Please upload UTF-8 encoded CSV."]
 
         except Exception as e:
             db_instance.session.rollback()
-            return 0, [f"Unexpected error: {str(e)}"]
+            # Only the failing batch is rolled back; the ones before it are committed
+            return records_added, errors + [
+                f"Unexpected error after {records_added} record(s) were committed: {str(e)}"
+            ]
+
+    def _ingest_arthakosha(self, rows: List[Tuple[int, dict]], errors: List[str]) -> int:
+        """
+        Insert one batch of (row number, CSV row) dictionary entries and commit.
+
+        Meanings are normalized and hashed up front, duplicates inside the file
+        are dropped against (author_id, word, meaning_hash), existing entries
+        are looked up with one query per author, and the rest go in as one
+        multi-row insert (row by row only if that fails).
+        """
+        batch_errors: List[Tuple[int, str]] = []
+        entries = []
+        for i, row in rows:
+            if not all((row.get(col) or "").strip() for col in ("samputa", "author_id", "word", "meaning")):
+                batch_errors.append((i, f"Row {i}: Missing required field(s)."))
+                continue
+            try:
+                entry = {
+                    "samputa": row["samputa"].strip(),
+                    "author_id": int(row["author_id"]),
+                    # Normalized as in ArthakoshaService.create
+                    "word": normalize_para(row["word"]),
+                    "meaning": normalize_para(row["meaning"]),
+                    "notes": (row.get("notes") or "").strip() or None,
+                }
+            except ValueError as ve:
+                batch_errors.append((i, f"Row {i}: {str(ve)}"))
+                continue
+            if not entry["word"] or not entry["meaning"]:
+                batch_errors.append((i, f"Row {i}: samputa, author_id, word, and meaning are required"))
+                continue
+            entry["meaning_hash"] = Arthakosha.hash_meaning(entry["meaning"])
+            entries.append((i, entry))
+
+        author_ids = {entry["author_id"] for _, entry in entries}
+        known_authors = {
+            author_id for author_id, in
+            self.db.query(TatvapadaAuthorInfo.id).filter(TatvapadaAuthorInfo.id.in_(author_ids))
+        } if author_ids else set()
+        taken = set(self._arthakosha_ids(entries))
+
+        pending = []
+        for i, entry in entries:
+            if entry["author_id"] not in known_authors:
+                batch_errors.append((i, f"Row {i}: Author id {entry['author_id']} not found."))
+                continue
+            key = _arthakosha_key(entry)
+            if key in taken:
+                batch_errors.append((i, f"Row {i}: {_ARTHAKOSHA_DUPLICATE}"))
+                continue
+            taken.add(key)
+            pending.append((i, entry))
+
+        inserted = []
+        # An empty parameter list would be sent as INSERT ... DEFAULT VALUES
+        if pending:
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(Arthakosha), [entry for _, entry in pending])
+                inserted = pending
+            except SQLAlchemyError:
+                for i, entry in pending:
+                    try:
+                        with self.db.begin_nested():
+                            self.db.execute(insert(Arthakosha), [entry])
+                        inserted.append((i, entry))
+                    except IntegrityError:
+                        batch_errors.append((i, f"Row {i}: {_ARTHAKOSHA_DUPLICATE}"))
+                    except SQLAlchemyError as row_err:
+                        batch_errors.append((i, f"Row {i}: {str(row_err)}"))
+
+        if inserted:
+            ids = self._arthakosha_ids(inserted)
+            upserted = [{**entry, "id": ids.get(_arthakosha_key(entry))} for _, entry in inserted]
+            if all(row["id"] is not None for row in upserted):
+                notify_after_commit(self.db, "arthakosha", upserted=upserted)
+            else:
+                notify_after_commit(self.db, "arthakosha", reset=True)
+        self.db.commit()
+
+        batch_errors.sort(key=lambda error: error[0])
+        errors.extend(message for _, message in batch_errors)
+        return len(inserted)
+
+    def _arthakosha_ids(self, entries: List[Tuple[int, dict]]) -> dict:
+        """``_arthakosha_key`` -> id of the stored entries sharing an author and meaning hash with ``entries``."""
+        hashes_by_author = {}
+        for _, entry in entries:
+            hashes_by_author.setdefault(entry["author_id"], set()).add(entry["meaning_hash"])
+
+        ids = {}
+        for author_id, hashes in hashes_by_author.items():
+            query = self.db.query(Arthakosha.id, Arthakosha.word, Arthakosha.meaning_hash).filter(
+                Arthakosha.author_id == author_id,
+                Arthakosha.meaning_hash.in_(hashes),
+            )
+            for row_id, word, meaning_hash in query:
+                ids[_arthakosha_key({"author_id": author_id, "word": word, "meaning_hash": meaning_hash})] = row_id
+        return ids
 
 
 # ----------------- TatvapadakararaVivara Service -----------------
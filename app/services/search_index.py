@@ -0,0 +1,460 @@
+"""
+Inverted index over the text columns of ``Tatvapada`` for whole-word and
+ranked search.
+
+Each token (see ``app.text.tokenize``: NFC, casefolded, split on whitespace,
+punctuation, danda and ZWNJ) maps to the rows containing it, with its
+frequency in each of ``FIELDS``. Whole-word search uses the verse text only;
+ranked search scores every field with BM25F. The index lives on disk (see
+``search_index_store``): an immutable base segment that every gunicorn worker
+memory-maps read-only, plus an append-only delta log of committed writes that
+is folded into a new base in the background once it grows.
+
+``TatvapadaService`` uses the index for the candidate set and exact total of a
+search and falls back to the MySQL ``REGEXP`` scan only while no base segment
+exists yet (first start, right after the index directory was cleared, or after
+a reset notification invalidated it until the rebuild finishes).
+"""
+import math
+import os
+import threading
+from array import array
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from flask import current_app, has_app_context
+
+from app.config.database import db_instance
+from app.models.tatvapada import Tatvapada
+from app.services.search_index_store import (
+    FIELDS,
+    VERSE_FIELD,
+    VERSION as SEGMENT_VERSION,
+    DocKey,
+    FieldCounts,
+    SearchIndexStore,
+    pack_posting,
+    slice_ranks,
+)
+from app.text import TOKENIZER_VERSION, tokenize, tokenize_batch
+from app.utils.corpus_signals import corpus_changed
+from app.utils.logger import setup_logger
+
+SEARCH_INDEX_DIR = os.getenv("SEARCH_INDEX_DIR", "search_index")
+# Fold the delta log into a new base segment once it is larger than this
+SEARCH_INDEX_MERGE_BYTES = int(os.getenv("SEARCH_INDEX_MERGE_BYTES", 1024 * 1024))
+
+# BM25F parameters; a title hit counts for more than a hit in the commentary
+BM25_K1 = 1.2
+BM25_B = 0.75
+FIELD_WEIGHTS = {
+    "tatvapada": 1.0,
+    "tatvapada_sheershike": 2.5,
+    "bhavanuvada": 0.7,
+    "tippani": 0.4,
+}
+_WEIGHTS = tuple(FIELD_WEIGHTS[field] for field in FIELDS)
+
+# (row id, score, doc key) of one ranked hit
+RankedHit = Tuple[int, float, DocKey]
+
+
+def _doc_key(samputa, sankhye, author_id) -> DocKey:
+    return (samputa or "").strip(), (sankhye or "").strip(), author_id or 0
+
+
+def _field_terms(field_tokens: Sequence[List[str]]) -> Tuple[Dict[str, List[int]], FieldCounts]:
+    """Per-field term frequencies and token counts of one row, from its tokens per field."""
+    terms: Dict[str, List[int]] = {}
+    for f, tokens in enumerate(field_tokens):
+        for tok in tokens:
+            tfs = terms.get(tok)
+            if tfs is None:
+                tfs = terms[tok] = [0] * len(FIELDS)
+            tfs[f] += 1
+    return terms, tuple(len(tokens) for tokens in field_tokens)
+
+
+def _bm25f(tfs: Sequence[int], lengths: FieldCounts, avg_lengths: Sequence[float]) -> float:
+    """Saturated, length-normalized and field-weighted frequency of one term in one doc."""
+    tf = 0.0
+    for weight, n, length, avg in zip(_WEIGHTS, tfs, lengths, avg_lengths):
+        if n:
+            tf += weight * n / (1 - BM25_B + BM25_B * (length / avg if avg else 1.0))
+    return tf / (BM25_K1 + tf)
+
+
+class TatvapadaSearchIndex:
+    """
+    Per-worker reader of the shared on-disk index.
+
+    The base segment answers most of a query; entries from the delta log are kept
+    in a small in-memory overlay (rows superseded in the base, plus their current
+    terms). Every search first follows any base swap or new delta entries, so a
+    write committed by one worker is visible to the others on their next search.
+    """
+
+    def __init__(self, directory: str = SEARCH_INDEX_DIR):
+        self.logger = setup_logger("search_index", "search_index.log")
+        # Tokens are persisted, so each segment format and tokenizer version gets its own index
+        self.store = SearchIndexStore(
+            os.path.join(directory, f"segment-v{SEGMENT_VERSION}-tokenizer-v{TOKENIZER_VERSION}")
+        )
+        self._lock = threading.RLock()
+        self._segment = None
+        self._delta_position = 0
+        self._superseded: Set[int] = set()
+        # Base ranks of superseded rows, and the live token totals per field, for ranked search
+        self._superseded_ranks: Set[int] = set()
+        self._total_lengths: List[int] = [0] * len(FIELDS)
+        # Verse-text postings of delta rows, for whole-word search
+        self._delta_postings: Dict[str, Set[int]] = {}
+        self._delta_tokens: Dict[int, frozenset] = {}
+        # All-field frequencies and lengths of delta rows, for ranked search
+        self._delta_terms: Dict[int, Dict[str, List[int]]] = {}
+        self._delta_lengths: Dict[int, FieldCounts] = {}
+        self._delta_keys: Dict[int, DocKey] = {}
+        self._building = False
+        self._merging = False
+
+    # ----------------------
+    # Build / refresh
+    # ----------------------
+    def ensure_warm(self) -> bool:
+        """Return True if the index can answer queries; otherwise start a background build."""
+        with self._lock:
+            self._refresh()
+            if self._segment is not None:
+                return True
+            if self._building:
+                return False
+            self._building = True
+
+        self._start_build(current_app._get_current_object())
+        return False
+
+    def _start_build(self, app):
+        threading.Thread(target=self._build_in_context, args=(app,), daemon=True).start()
+
+    def _build_in_context(self, app):
+        with app.app_context():
+            try:
+                self.build()
+            except Exception as e:
+                self.logger.error(f"Search index build failed: {e}", exc_info=True)
+            finally:
+                with self._lock:
+                    self._building = False
+                db_instance.session.remove()
+
+    def build(self):
+        """Write a new base segment from a database snapshot."""
+        counts = {}
+
+        def snapshot():
+            rows = (
+                db_instance.session.query(
+                    Tatvapada.id,
+                    Tatvapada.samputa_sankhye,
+                    Tatvapada.tatvapada_sankhye,
+                    Tatvapada.tatvapada_author_id,
+                    *(getattr(Tatvapada, field) for field in FIELDS),
+                )
+                .yield_per(2000)
+            )
+            docs, lengths, postings = self.collect(rows)
+            counts.update(rows=len(docs), tokens=len(postings))
+            return docs, lengths, postings
+
+        if self.store.build(snapshot):
+            self.logger.info(f"Search index built: {counts['rows']} rows, {counts['tokens']} tokens")
+        else:
+            self.logger.info("Search index build skipped; another worker is building, or a reset came first")
+
+    @classmethod
+    def collect(cls, rows) -> Tuple[Dict[int, DocKey], Dict[int, FieldCounts], Dict[str, array]]:
+        """(docs, lengths, postings) of ``rows``: (id, samputa, sankhye, author id, *FIELDS texts)."""
+        docs: Dict[int, DocKey] = {}
+        lengths: Dict[int, FieldCounts] = {}
+        postings: Dict[str, array] = {}
+        batch = []
+        for row_id, samputa, sankhye, author_id, *texts in rows:
+            docs[row_id] = _doc_key(samputa, sankhye, author_id)
+            batch.append((row_id, texts))
+            if len(batch) >= 2000:
+                cls._add_postings(postings, lengths, batch)
+                batch = []
+        cls._add_postings(postings, lengths, batch)
+        return docs, lengths, postings
+
+    @staticmethod
+    def _add_postings(
+            postings: Dict[str, array],
+            lengths: Dict[int, FieldCounts],
+            batch: List[Tuple[int, List[Optional[str]]]],
+    ):
+        # One tokenize_batch call for every field of every row in the batch
+        width = len(FIELDS)
+        token_lists = tokenize_batch(text for _, texts in batch for text in texts)
+        for i, (row_id, _) in enumerate(batch):
+            terms, lengths[row_id] = _field_terms(token_lists[i * width:(i + 1) * width])
+            for tok, tfs in terms.items():
+                packed = postings.get(tok)
+                if packed is None:
+                    packed = postings[tok] = array("Q")
+                packed.append(pack_posting(row_id, tfs))
+
+    def _refresh(self):
+        """Follow base swaps and new delta entries written by any worker."""
+        try:
+            identity = os.stat(self.store.base_path).st_ino
+        except FileNotFoundError:
+            identity = None  # never built, or invalidated by a reset
+
+        if self._segment is None or self._segment.identity != identity:
+            self._segment = self.store.open_segment() if identity is not None else None
+            self._delta_position = 0
+            self._superseded, self._delta_postings = set(), {}
+            self._superseded_ranks = set()
+            self._delta_tokens, self._delta_keys = {}, {}
+            self._delta_terms, self._delta_lengths = {}, {}
+            if self._segment is None:
+                return
+            self._total_lengths = list(self._segment.total_lengths)
+
+        generation = self._segment.generation
+        if self.store.delta_size(generation) > self._delta_position:
+            entries, self._delta_position = self.store.read_delta(generation, self._delta_position)
+            for entry in entries:
+                self._apply(entry)
+
+    def _apply(self, entry: dict):
+        row_id = entry["id"]
+        if row_id not in self._superseded:
+            self._superseded.add(row_id)
+            rank = self._segment.rank_of(row_id)
+            if rank is not None:
+                self._superseded_ranks.add(rank)
+                self._add_lengths(self._segment.doc_lengths(rank), -1)
+        for tok in self._delta_tokens.pop(row_id, ()):
+            ids = self._delta_postings.get(tok)
+            if ids is not None:
+                ids.discard(row_id)
+                if not ids:
+                    del self._delta_postings[tok]
+        self._delta_keys.pop(row_id, None)
+        self._delta_terms.pop(row_id, None)
+        lengths = self._delta_lengths.pop(row_id, None)
+        if lengths is not None:
+            self._add_lengths(lengths, -1)
+
+        if entry["op"] == "upsert":
+            terms = entry["terms"]
+            tokens = frozenset(tok for tok, tfs in terms.items() if tfs[VERSE_FIELD])
+            self._delta_tokens[row_id] = tokens
+            self._delta_terms[row_id] = terms
+            self._delta_lengths[row_id] = tuple(entry["lengths"])
+            self._add_lengths(self._delta_lengths[row_id], 1)
+            self._delta_keys[row_id] = (entry["samputa"], entry["sankhye"], entry["author_id"])
+            for tok in tokens:
+                self._delta_postings.setdefault(tok, set()).add(row_id)
+
+    def _add_lengths(self, lengths: FieldCounts, sign: int):
+        for f, n in enumerate(lengths):
+            self._total_lengths[f] += sign * n
+
+    # ----------------------
+    # Writes
+    # ----------------------
+    def on_corpus_changed(self, sender, upserted=(), deleted=(), reset=False, **_):
+        if reset:
+            # Every worker goes cold (REGEXP fallback) until the rebuild; without an
+            # app context here, the next search starts it
+            try:
+                self.store.invalidate()
+            except OSError as e:
+                self.logger.error(f"Failed to invalidate search index: {e}", exc_info=True)
+            with self._lock:
+                self._refresh()
+                if self._building or not has_app_context():
+                    return
+                self._building = True
+            self._start_build(current_app._get_current_object())
+            return
+
+        entries = [{"op": "delete", "id": row_id} for row_id in deleted]
+        for row in upserted:
+            samputa, sankhye, author_id = _doc_key(
+                row.get("samputa_sankhye"), row.get("tatvapada_sankhye"), row.get("tatvapada_author_id")
+            )
+            terms, lengths = _field_terms(tokenize_batch(row.get(field) for field in FIELDS))
+            entries.append({
+                "op": "upsert",
+                "id": row["id"],
+                "samputa": samputa,
+                "sankhye": sankhye,
+                "author_id": author_id,
+                "terms": terms,
+                "lengths": list(lengths),
+            })
+
+        try:
+            self.store.append(entries)
+        except OSError as e:
+            self.logger.error(f"Failed to append to search index delta: {e}", exc_info=True)
+            return
+        self._maybe_merge()
+
+    def _maybe_merge(self):
+        generation = self.store.current_generation()
+        if self.store.delta_size(generation) < SEARCH_INDEX_MERGE_BYTES:
+            return
+        with self._lock:
+            if self._merging:
+                return
+            self._merging = True
+        threading.Thread(target=self._merge, daemon=True).start()
+
+    def _merge(self):
+        try:
+            if self.store.merge():
+                self.logger.info("Search index delta merged into a new base segment")
+        except Exception as e:
+            self.logger.error(f"Search index merge failed: {e}", exc_info=True)
+        finally:
+            with self._lock:
+                self._merging = False
+
+    # ----------------------
+    # Query
+    # ----------------------
+    def search(
+            self,
+            keyword: str,
+            samputa: Optional[str] = None,
+            author_id: Optional[int] = None,
+    ) -> Optional[Tuple[List[Tuple[int, DocKey]], bool]]:
+        """
+        Return ((row id, doc key) hits ordered by samputa/sankhye/id, is_phrase) or
+        None when cold.
+
+        For a single-token keyword the hits are the exact result. For a multi-token
+        keyword they are the rows containing every token; the caller still has to
+        confirm the tokens are adjacent.
+        """
+        if not self.ensure_warm():
+            return None
+
+        keyword_tokens = tokenize(keyword)
+        if not keyword_tokens:
+            return [], False
+        tokens = set(keyword_tokens)
+        is_phrase = len(keyword_tokens) > 1
+        samputa = (samputa or "").strip() or None
+
+        with self._lock:
+            segment = self._segment
+
+            # Base hits as ranks (already in display order)
+            base_lists = sorted((segment.lookup(tok) for tok in tokens), key=len)
+            ranks = base_lists[0]
+            if len(base_lists) > 1 and ranks:
+                ranks = sorted(set(ranks).intersection(*base_lists[1:]))
+            if samputa:
+                ranks = slice_ranks(ranks, *segment.samputa_range(samputa))
+
+            base_hits: List[Tuple[int, DocKey]] = []
+            for rank in ranks:
+                row_id, key = segment.doc(rank)
+                if row_id in self._superseded or (author_id and key[2] != author_id):
+                    continue
+                base_hits.append((row_id, key))
+
+            # Overlay hits from the delta log
+            delta_sets = [self._delta_postings.get(tok) for tok in tokens]
+            delta_ids = set.intersection(*delta_sets) if all(delta_sets) else set()
+            delta_hits = [
+                (row_id, self._delta_keys[row_id]) for row_id in delta_ids
+                if (not samputa or self._delta_keys[row_id][0] == samputa)
+                and (not author_id or self._delta_keys[row_id][2] == author_id)
+            ]
+
+        if delta_hits:
+            hits = sorted(base_hits + delta_hits, key=lambda hit: (hit[1][0], hit[1][1], hit[0]))
+        else:
+            hits = base_hits
+        return hits, is_phrase
+
+    def search_ranked(
+            self,
+            keyword: str,
+            samputa: Optional[str] = None,
+            author_id: Optional[int] = None,
+    ) -> Optional[Tuple[List[RankedHit], List[str]]]:
+        """
+        Return (hits by descending BM25F score, query tokens) or None when cold.
+
+        A row matches if any query token occurs in any of ``FIELDS``; rows with
+        more (and rarer) tokens, in shorter or higher-weighted fields, score higher.
+        Equal scores keep the samputa/sankhye order.
+        """
+        if not self.ensure_warm():
+            return None
+
+        tokens = list(dict.fromkeys(tokenize(keyword)))
+        if not tokens:
+            return [], []
+        samputa = (samputa or "").strip() or None
+
+        with self._lock:
+            segment = self._segment
+            superseded_ranks = self._superseded_ranks
+            # Live rows only: a base row the delta updated or deleted is counted once, or not at all
+            n_docs = segment.n_docs - len(superseded_ranks) + len(self._delta_keys)
+            avg_lengths = [total / n_docs if n_docs else 0.0 for total in self._total_lengths]
+            lo, hi = segment.samputa_range(samputa) if samputa else (0, segment.n_docs)
+
+            delta_ids = [
+                row_id for row_id, key in self._delta_keys.items()
+                if (not samputa or key[0] == samputa) and (not author_id or key[2] == author_id)
+            ]
+
+            base_scores: Dict[int, float] = {}
+            doc_lengths: Dict[int, FieldCounts] = {}
+            delta_scores: Dict[int, float] = {}
+            for tok in tokens:
+                entries = segment.field_lookup(tok)
+                if superseded_ranks:
+                    entries = [(rank, tfs) for rank, tfs in entries if rank not in superseded_ranks]
+                df = len(entries) + sum(1 for terms in self._delta_terms.values() if tok in terms)
+                if not df:
+                    continue
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+                for rank, tfs in entries:
+                    if rank < lo or rank >= hi:
+                        continue
+                    lengths = doc_lengths.get(rank)
+                    if lengths is None:
+                        lengths = doc_lengths[rank] = segment.doc_lengths(rank)
+                    base_scores[rank] = base_scores.get(rank, 0.0) + idf * _bm25f(tfs, lengths, avg_lengths)
+
+                for row_id in delta_ids:
+                    tfs = self._delta_terms[row_id].get(tok)
+                    if tfs:
+                        score = idf * _bm25f(tfs, self._delta_lengths[row_id], avg_lengths)
+                        delta_scores[row_id] = delta_scores.get(row_id, 0.0) + score
+
+            hits: List[RankedHit] = []
+            for rank, score in base_scores.items():
+                row_id, key = segment.doc(rank)
+                if row_id in self._superseded or (author_id and key[2] != author_id):
+                    continue
+                hits.append((row_id, score, key))
+            hits.extend((row_id, score, self._delta_keys[row_id]) for row_id, score in delta_scores.items())
+
+        hits.sort(key=lambda hit: (-hit[1], hit[2][0], hit[2][1], hit[0]))
+        return hits, tokens
+
+
+search_index = TatvapadaSearchIndex()
+corpus_changed.connect(search_index.on_corpus_changed, sender="tatvapada")
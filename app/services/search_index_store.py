@@ -0,0 +1,529 @@
+"""
+On-disk storage for the Tatvapada search index, shared read-only by all workers.
+
+Files in the index directory::
+
+    base.seg          immutable segment, memory-mapped by every worker
+    delta-<G>.log     append-only JSON lines (row upserts/deletes) on top of base generation G
+    append.lock       held briefly while appending to the delta or swapping in a new base
+    maintenance.lock  held by the one worker that is building or merging
+    reset.log         grows by one byte each time the index is invalidated
+
+Building or merging writes base generation G + 1 and moves the delta entries
+appended since it started from ``delta-<G>.log`` to ``delta-<G+1>.log``.
+
+Segment layout (little endian)::
+
+    header                 magic, version, generation, counts, section offsets and
+                           the total token count of each field
+    term offsets           (n_terms + 1) x uint32 into the term blob
+    term blob              UTF-8 terms in byte order (the sorted term dictionary)
+    posting offsets        (n_terms + 1) x uint64 into the posting blob
+    posting blob           per term: LEB128 varint gaps between ascending doc ranks
+                           of the docs whose verse text contains it
+    field posting offsets  (n_terms + 1) x uint64 into the field posting blob
+    field posting blob     per term: varint rank gap + one uint8 term frequency per
+                           field (see ``FIELDS``) for every doc containing it in any field
+    docs                   n_docs x (id, samputa sid, sankhye sid, author id), ordered by
+                           (samputa, sankhye, id) so a rank is also the result order
+    field lengths          n_docs x uint16 token count per field, for BM25 length normalization
+    string offsets         (n_strings + 1) x uint32 into the string blob
+    string blob            interned samputa/sankhye values
+
+Posting lists hold ranks rather than row ids, so a decoded list is already in
+display order and a samputa filter is a contiguous rank range. The verse-only
+postings answer the whole-word search; the field postings feed ranked search.
+"""
+import json
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows dev machines run a single process
+    fcntl = None
+
+MAGIC = b"KTSI"
+VERSION = 2
+
+# Indexed Tatvapada columns, in the order their frequencies/lengths are stored
+FIELDS = ("tatvapada", "tatvapada_sheershike", "bhavanuvada", "tippani")
+VERSE_FIELD = 0
+
+_HEADER = struct.Struct("<4sHHQIII" + "Q" * 10 + "Q" * len(FIELDS))
+_DOC = struct.Struct("<IIII")
+_LENGTHS = struct.Struct("<" + "H" * len(FIELDS))
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+DocKey = Tuple[str, str, int]  # (samputa, sankhye, author_id)
+FieldCounts = Tuple[int, ...]  # one count per entry of FIELDS
+# (docs, lengths, postings) of a database snapshot, as taken by ``write_segment``
+Snapshot = Tuple[Dict[int, DocKey], Dict[int, FieldCounts], Dict[str, Iterable[int]]]
+
+
+# ----------------------
+# Varint / posting helpers
+# ----------------------
+def encode_gaps(sorted_values: Iterable[int]) -> bytes:
+    out = bytearray()
+    prev = 0
+    for value in sorted_values:
+        gap = value - prev
+        prev = value
+        while gap >= 0x80:
+            out.append((gap & 0x7F) | 0x80)
+            gap >>= 7
+        out.append(gap)
+    return bytes(out)
+
+
+def decode_gaps(buf) -> List[int]:
+    values = []
+    value = shift = prev = 0
+    for byte in buf:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        prev += value
+        values.append(prev)
+        value = shift = 0
+    return values
+
+
+def pack_posting(row_id: int, tfs: Iterable[int]) -> int:
+    """Pack a row id and its per-field term frequencies (capped at 255) into one int."""
+    value = row_id
+    for tf in tfs:
+        value = (value << 8) | min(tf, 255)
+    return value
+
+
+def unpack_posting(value: int) -> Tuple[int, bytes]:
+    """Inverse of ``pack_posting``: (row id, one frequency byte per field)."""
+    width = len(FIELDS)
+    return value >> (8 * width), (value & ((1 << (8 * width)) - 1)).to_bytes(width, "big")
+
+
+def _encode_field_postings(entries: List[Tuple[int, bytes]]) -> bytes:
+    out = bytearray()
+    prev = 0
+    for rank, tfs in entries:
+        gap = rank - prev
+        prev = rank
+        while gap >= 0x80:
+            out.append((gap & 0x7F) | 0x80)
+            gap >>= 7
+        out.append(gap)
+        out += tfs
+    return bytes(out)
+
+
+def _decode_field_postings(buf: bytes) -> List[Tuple[int, bytes]]:
+    width = len(FIELDS)
+    entries = []
+    i, end, prev = 0, len(buf), 0
+    while i < end:
+        value = shift = 0
+        while True:
+            byte = buf[i]
+            i += 1
+            value |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                break
+            shift += 7
+        prev += value
+        entries.append((prev, buf[i:i + width]))
+        i += width
+    return entries
+
+
+# ----------------------
+# Segment
+# ----------------------
+def write_segment(
+        path: str,
+        generation: int,
+        docs: Dict[int, DocKey],
+        lengths: Dict[int, FieldCounts],
+        postings: Dict[str, Iterable[int]],
+):
+    """
+    Write an immutable segment to ``path``.
+
+    ``docs`` and ``lengths`` are keyed by row id; ``postings`` maps each term to
+    ``pack_posting`` values of the rows containing it.
+    """
+    order = sorted(docs, key=lambda i: (docs[i][0], docs[i][1], i))
+    rank_of = {row_id: rank for rank, row_id in enumerate(order)}
+
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    doc_section, length_section = bytearray(), bytearray()
+    totals = [0] * len(FIELDS)
+    for row_id in order:
+        samputa, sankhye, author_id = docs[row_id]
+        doc_section += _DOC.pack(row_id, intern(samputa), intern(sankhye), author_id or 0)
+        doc_lengths = [min(n, 0xFFFF) for n in lengths.get(row_id, (0,) * len(FIELDS))]
+        length_section += _LENGTHS.pack(*doc_lengths)
+        for f, n in enumerate(doc_lengths):
+            totals[f] += n
+
+    terms = sorted((term.encode("utf-8"), packed) for term, packed in postings.items())
+    term_blob, term_offsets = bytearray(), [0]
+    posting_blob, posting_offsets = bytearray(), [0]
+    field_blob, field_offsets = bytearray(), [0]
+    for term, packed in terms:
+        entries = []
+        for value in packed:
+            row_id, tfs = unpack_posting(value)
+            rank = rank_of.get(row_id)
+            if rank is not None:
+                entries.append((rank, tfs))
+        if not entries:
+            continue
+        entries.sort()
+        term_blob += term
+        term_offsets.append(len(term_blob))
+        posting_blob += encode_gaps(rank for rank, tfs in entries if tfs[VERSE_FIELD])
+        posting_offsets.append(len(posting_blob))
+        field_blob += _encode_field_postings(entries)
+        field_offsets.append(len(field_blob))
+
+    string_blob, string_offsets = bytearray(), [0]
+    for value in strings:
+        string_blob += value.encode("utf-8")
+        string_offsets.append(len(string_blob))
+
+    sections = [
+        b"".join(_U32.pack(o) for o in term_offsets),
+        bytes(term_blob),
+        b"".join(_U64.pack(o) for o in posting_offsets),
+        bytes(posting_blob),
+        b"".join(_U64.pack(o) for o in field_offsets),
+        bytes(field_blob),
+        bytes(doc_section),
+        bytes(length_section),
+        b"".join(_U32.pack(o) for o in string_offsets),
+        bytes(string_blob),
+    ]
+    offsets, pos = [], _HEADER.size
+    for section in sections:
+        offsets.append(pos)
+        pos += len(section)
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, 0, generation,
+        len(order), len(term_offsets) - 1, len(strings),
+        *offsets,
+        *totals,
+    )
+    with open(path, "wb") as f:
+        f.write(header)
+        for section in sections:
+            f.write(section)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class IndexSegment:
+    """Read-only, memory-mapped view of a segment file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.identity = os.fstat(f.fileno()).st_ino
+
+        fields = _HEADER.unpack_from(self._mm, 0)
+        (magic, version, _, self.generation, self.n_docs, self.n_terms, n_strings,
+         self._term_offsets, self._term_blob, self._posting_offsets, self._posting_blob,
+         self._field_offsets, self._field_blob, self._docs, self._lengths,
+         string_offsets, string_blob) = fields[:17]
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a search index segment: {path}")
+        # Total and average tokens per field, for BM25 length normalization
+        self.total_lengths = tuple(fields[17:])
+        self.avg_lengths = tuple(total / self.n_docs if self.n_docs else 0.0 for total in self.total_lengths)
+        self._ranks: Optional[Dict[int, int]] = None
+
+        mm = self._mm
+        self._strings = []
+        for i in range(n_strings):
+            start = _U32.unpack_from(mm, string_offsets + 4 * i)[0]
+            end = _U32.unpack_from(mm, string_offsets + 4 * (i + 1))[0]
+            self._strings.append(mm[string_blob + start:string_blob + end].decode("utf-8"))
+
+        # Docs are ordered by samputa first, so each samputa owns one rank range
+        self._samputa_ranges: Dict[str, Tuple[int, int]] = {}
+        docs = mm[self._docs:self._docs + _DOC.size * self.n_docs]
+        for rank, (_, samputa_sid, _, _) in enumerate(_DOC.iter_unpack(docs)):
+            samputa = self._strings[samputa_sid]
+            lo, _ = self._samputa_ranges.get(samputa, (rank, rank))
+            self._samputa_ranges[samputa] = (lo, rank + 1)
+
+    def _term(self, i: int) -> bytes:
+        start, end = struct.unpack_from("<II", self._mm, self._term_offsets + 4 * i)
+        return self._mm[self._term_blob + start:self._term_blob + end]
+
+    def _find(self, term: str) -> Optional[int]:
+        """Index of ``term`` in the term dictionary (binary search), or None."""
+        key = term.encode("utf-8")
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n_terms and self._term(lo) == key:
+            return lo
+        return None
+
+    def _postings_at(self, i: int) -> List[int]:
+        start, end = struct.unpack_from("<QQ", self._mm, self._posting_offsets + 8 * i)
+        return decode_gaps(self._mm[self._posting_blob + start:self._posting_blob + end])
+
+    def _field_postings_at(self, i: int) -> List[Tuple[int, bytes]]:
+        start, end = struct.unpack_from("<QQ", self._mm, self._field_offsets + 8 * i)
+        return _decode_field_postings(self._mm[self._field_blob + start:self._field_blob + end])
+
+    def lookup(self, term: str) -> List[int]:
+        """Ascending ranks of the docs whose verse text contains ``term``."""
+        i = self._find(term)
+        return [] if i is None else self._postings_at(i)
+
+    def field_lookup(self, term: str) -> List[Tuple[int, bytes]]:
+        """(rank, per-field frequency bytes) for every doc containing ``term`` in any field."""
+        i = self._find(term)
+        return [] if i is None else self._field_postings_at(i)
+
+    def doc(self, rank: int) -> Tuple[int, DocKey]:
+        row_id, samputa_sid, sankhye_sid, author_id = _DOC.unpack_from(self._mm, self._docs + _DOC.size * rank)
+        return row_id, (self._strings[samputa_sid], self._strings[sankhye_sid], author_id)
+
+    def rank_of(self, row_id: int) -> Optional[int]:
+        """Rank of ``row_id`` in this segment, or None if it is not in it."""
+        if self._ranks is None:
+            docs = self._mm[self._docs:self._docs + _DOC.size * self.n_docs]
+            self._ranks = {doc[0]: rank for rank, doc in enumerate(_DOC.iter_unpack(docs))}
+        return self._ranks.get(row_id)
+
+    def doc_lengths(self, rank: int) -> FieldCounts:
+        return _LENGTHS.unpack_from(self._mm, self._lengths + _LENGTHS.size * rank)
+
+    def samputa_range(self, samputa: str) -> Tuple[int, int]:
+        return self._samputa_ranges.get(samputa, (0, 0))
+
+    def iter_docs(self) -> Iterator[Tuple[int, DocKey, FieldCounts]]:
+        for rank in range(self.n_docs):
+            row_id, key = self.doc(rank)
+            yield row_id, key, self.doc_lengths(rank)
+
+    def iter_postings(self) -> Iterator[Tuple[str, List[int]]]:
+        """Yield (term, ``pack_posting`` values keyed by row id) for every term; used when merging."""
+        ids = [self.doc(rank)[0] for rank in range(self.n_docs)]
+        for i in range(self.n_terms):
+            yield self._term(i).decode("utf-8"), [
+                pack_posting(ids[rank], tfs) for rank, tfs in self._field_postings_at(i)
+            ]
+
+
+def slice_ranks(ranks: List[int], lo: int, hi: int) -> List[int]:
+    """Ranks within [lo, hi) from an ascending list."""
+    return ranks[bisect_left(ranks, lo):bisect_left(ranks, hi)]
+
+
+# ----------------------
+# Store
+# ----------------------
+class SearchIndexStore:
+    """Directory holding the base segment, its delta log and the coordination locks."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.base_path = os.path.join(directory, "base.seg")
+
+    def delta_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"delta-{generation}.log")
+
+    @contextmanager
+    def _locked(self, name: str, blocking: bool = True):
+        """Hold an exclusive file lock; yields False if ``blocking`` is off and it is taken."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, name), "a+") as lock_file:
+            if fcntl is None:
+                yield True
+                return
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(lock_file.fileno(), flags)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def current_generation(self) -> int:
+        try:
+            with open(self.base_path, "rb") as f:
+                return _HEADER.unpack(f.read(_HEADER.size))[3]
+        except (FileNotFoundError, struct.error):
+            return 0
+
+    def open_segment(self) -> Optional[IndexSegment]:
+        try:
+            return IndexSegment(self.base_path)
+        except FileNotFoundError:
+            return None
+
+    # ---------- delta ----------
+    def append(self, entries: List[dict]):
+        """Append delta entries to the log of the current base generation."""
+        if not entries:
+            return
+        data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries).encode("utf-8")
+        with self._locked("append.lock"):
+            fd = os.open(self.delta_path(self.current_generation()), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+    def delta_size(self, generation: int) -> int:
+        try:
+            return os.path.getsize(self.delta_path(generation))
+        except FileNotFoundError:
+            return 0
+
+    def read_delta(self, generation: int, position: int, until: Optional[int] = None) -> Tuple[List[dict], int]:
+        """Complete delta entries from byte ``position`` (up to ``until``); returns (entries, new position)."""
+        try:
+            with open(self.delta_path(generation), "rb") as f:
+                f.seek(position)
+                data = f.read() if until is None else f.read(max(until - position, 0))
+        except FileNotFoundError:
+            return [], position
+
+        complete = data.rfind(b"\n") + 1  # a writer may be mid-line
+        entries = [json.loads(line) for line in data[:complete].splitlines() if line]
+        return entries, position + complete
+
+    # ---------- maintenance ----------
+    def build(self, snapshot: Callable[[], Snapshot]) -> bool:
+        """
+        Write a fresh base from ``snapshot()`` (docs, lengths, postings read from the
+        database) as the next generation. Delta entries appended before the snapshot
+        started are already in it and are dropped; later ones carry over to the new
+        log, so a write the snapshot missed is not lost and an old one never wins.
+        Returns False if another worker holds the maintenance lock or the index was
+        invalidated meanwhile.
+        """
+        with self._locked("maintenance.lock", blocking=False) as acquired:
+            if not acquired:
+                return False
+            with self._locked("append.lock"):
+                # Appends hold this lock for a whole write, so the size is a line boundary
+                generation = self.current_generation()
+                position = self.delta_size(generation)
+                resets = self.reset_count()
+
+            docs, lengths, postings = snapshot()
+            tmp_path = f"{self.base_path}.{os.getpid()}.tmp"
+            write_segment(tmp_path, generation + 1, docs, lengths, postings)
+            return self._install(tmp_path, generation, position, resets)
+
+    def _install(self, tmp_path: str, generation: int, position: int, resets: int) -> bool:
+        """Swap in the base at ``tmp_path`` (generation + 1), carrying the delta after ``position``."""
+        with self._locked("append.lock"):
+            if self.reset_count() != resets or self.current_generation() != generation:
+                # Invalidated meanwhile: the new base would miss that change
+                os.remove(tmp_path)
+                return False
+            tail, _ = self.read_delta(generation, position)
+            if tail:
+                data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in tail)
+                with open(self.delta_path(generation + 1), "a", encoding="utf-8") as f:
+                    f.write(data)
+            os.replace(tmp_path, self.base_path)
+            try:
+                os.remove(self.delta_path(generation))
+            except FileNotFoundError:
+                pass
+        return True
+
+    def invalidate(self):
+        """
+        Drop the base and its delta logs after a change that cannot be described
+        row by row; readers go cold until the next build, which cannot install a
+        snapshot taken before this call.
+        """
+        with self._locked("append.lock"):
+            fd = os.open(os.path.join(self.directory, "reset.log"), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, b".")
+            finally:
+                os.close(fd)
+            for name in os.listdir(self.directory):
+                if name == "base.seg" or (name.startswith("delta-") and name.endswith(".log")):
+                    os.remove(os.path.join(self.directory, name))
+
+    def reset_count(self) -> int:
+        try:
+            return os.path.getsize(os.path.join(self.directory, "reset.log"))
+        except FileNotFoundError:
+            return 0
+
+    def merge(self) -> bool:
+        """Fold the delta log into a new base generation. Returns False if skipped."""
+        with self._locked("maintenance.lock", blocking=False) as acquired:
+            if not acquired:
+                return False
+            segment = self.open_segment()
+            if segment is None:
+                return False
+
+            with self._locked("append.lock"):
+                generation = self.current_generation()
+                resets = self.reset_count()
+            if generation != segment.generation:
+                return False
+            entries, merged_upto = self.read_delta(generation, 0)
+            if not entries:
+                return False
+
+            # Only the last entry per row matters; drop every touched row, then re-add upserts
+            latest = {entry["id"]: entry for entry in entries}
+            docs, lengths = {}, {}
+            for row_id, key, doc_lengths in segment.iter_docs():
+                if row_id not in latest:
+                    docs[row_id], lengths[row_id] = key, doc_lengths
+            postings: Dict[str, List[int]] = {}
+            for term, packed in segment.iter_postings():
+                kept = [value for value in packed if unpack_posting(value)[0] not in latest]
+                if kept:
+                    postings[term] = kept
+            for row_id, entry in latest.items():
+                if entry["op"] == "upsert":
+                    docs[row_id] = (entry["samputa"], entry["sankhye"], entry["author_id"])
+                    lengths[row_id] = tuple(entry["lengths"])
+                    for tok, tfs in entry["terms"].items():
+                        postings.setdefault(tok, []).append(pack_posting(row_id, tfs))
+
+            tmp_path = f"{self.base_path}.{os.getpid()}.tmp"
+            write_segment(tmp_path, generation + 1, docs, lengths, postings)
+            # Entries appended while we were merging carry over to the new log
+            return self._install(tmp_path, generation, merged_upto, resets)
@@ -6,6 +6,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from werkzeug.utils import secure_filename
 from app.config.database import db_instance
 from app.models.tatvapada import ShoppingBooks, ist_now, Tatvapada, TatvapadaAuthorInfo
+from app.utils.pagination import keyset_page
 
 UPLOAD_FOLDER = "uploads/covers"
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
@@ -184,10 +185,15 @@ class ShoppingBooksService:
             self.db.session.rollback()
             return False, f"Database error: {str(e)}"
 
-    def list_books(self, search_word: str = "", limit: int = 10, offset: int = 0) -> Tuple[
-        int, int, List["ShoppingBooks"]]:
+    def list_books(self, search_word: str = "", limit: int = 10, offset: int = 0, cursor: Optional[str] = None,
+                   include_total: bool = True) -> Tuple[
+        Optional[int], Optional[int], List["ShoppingBooks"], Optional[str]]:
+        """
+        Newest books first. Returns (total, filtered total, books, next cursor);
+        both totals are None when ``include_total`` is off.
+        """
         query = self.db.session.query(ShoppingBooks)
-        total_count = query.count()
+        total_count = query.count() if include_total else None
 
         if search_word:
             like = f"%{search_word.strip()}%"
@@ -197,9 +203,12 @@ class ShoppingBooksService:
                 (ShoppingBooks.author_name.ilike(like))
             )
 
-        filtered_count = query.count()
-        books = query.order_by(ShoppingBooks.created_at.desc()).offset(offset).limit(limit).all()
-        return total_count, filtered_count, books
+        filtered_count = query.count() if include_total else None
+        books, next_cursor = keyset_page(
+            query, (ShoppingBooks.created_at, ShoppingBooks.id), limit,
+            cursor=cursor, offset=offset, descending=True,
+        )
+        return total_count, filtered_count, books, next_cursor
 
     def bulk_upload_from_csv(self, csv_file_path: str) -> Tuple[List["ShoppingBooks"], List[str]]:
         uploaded, errors = [], []
@@ -7,6 +7,7 @@ from app.config.database import db_instance
 from app.models.tatvapada import Tatvapada, ShoppingTatvapada, TatvapadaAuthorInfo
 
 from app.models.user_management import ShoppingUser, ShoppingUserAddress, ShoppingOrder, User
+from app.utils.pagination import keyset_page
 import pytz
 from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
@@ -686,7 +687,8 @@ class ShoppingTatvapadaService:
     from sqlalchemy import or_
 
     @staticmethod
-    def get_catalog(offset: int = 0, limit: int = 10, search: str = None):
+    def get_catalog(offset: int = 0, limit: int = 10, search: str = None, cursor: str = None,
+                    include_total: bool = True):
         session = db_instance.session
         query = (
             session.query(
@@ -708,8 +710,8 @@ class ShoppingTatvapadaService:
                 (TatvapadaAuthorInfo.tatvapadakarara_hesaru.ilike(search_pattern))
             )
 
-        total = query.count()
-        results = query.offset(offset).limit(limit).all()
+        total = query.count() if include_total else None
+        results, next_cursor = keyset_page(query, (ShoppingTatvapada.id,), limit, cursor=cursor, offset=offset)
 
         items = [
             {
@@ -722,7 +724,7 @@ class ShoppingTatvapadaService:
             }
             for r in results
         ]
-        return {"items": items, "total": total, "offset": offset, "limit": limit}
+        return {"items": items, "total": total, "offset": offset, "limit": limit, "next_cursor": next_cursor}
 
     @staticmethod
     def get_book_by_id(book_id: int):
@@ -0,0 +1,292 @@
+"""
+In-memory prefix index for typeahead over verse first lines, padavivarana
+titles and Arthakosha words.
+
+Each kind keeps ``(key, row_id)`` pairs in a list sorted by key, where the key
+is the text run through ``app.text.tokenize`` and re-joined with single spaces.
+A lookup bisects to the first key >= the typed prefix and walks forward while
+keys still start with it, so it never touches the database.
+
+Writes committed by this worker are applied in place through ``corpus_changed``.
+Every lookup also compares the generations of the source tables (see
+``generations``) with the ones the index was built at, and rebuilds it when a
+write from any worker moved them.
+"""
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config.database import db_instance
+from app.models.tatvapada import Arthakosha, ParibhashikaPadavivarana, Tatvapada, TatvapadaAuthorInfo
+from app.text import tokenize, tokenize_batch
+from app.utils.corpus_signals import corpus_changed
+from app.utils.generations import table_generations
+from app.utils.logger import setup_logger
+
+# Suggestion kind -> table whose corpus_changed notifications update it
+SUGGEST_KINDS = {
+    "tatvapada": "tatvapada",
+    "padavivarana": "paribhashika_padavivarana",
+    "arthakosha": "arthakosha",
+}
+# Tables the index is built from, for its generation check
+_TABLES = tuple(SUGGEST_KINDS.values()) + ("tatvapada_author_info",)
+
+
+def suggest_key(text: Optional[str]) -> str:
+    """Normalized form used both for indexed text and typed prefixes."""
+    return " ".join(tokenize(text))
+
+
+def _prefix_key(prefix: str) -> str:
+    key = suggest_key(prefix)
+    # "ಗುರು " should only complete whole words starting with "ಗುರು"
+    if key and prefix[-1:].isspace():
+        key += " "
+    return key
+
+
+class _PrefixList:
+    """Sorted (key, row_id) pairs plus the payload returned for each row."""
+
+    def __init__(self, author_field: str, rows: Iterable[Tuple[int, Optional[str], dict]] = ()):
+        self.author_field = author_field
+        self.keys: Dict[int, str] = {}
+        self.payloads: Dict[int, dict] = {}
+        rows = list(rows)
+        for (row_id, _, payload), tokens in zip(rows, tokenize_batch(text for _, text, _ in rows)):
+            if tokens:
+                self.keys[row_id] = " ".join(tokens)
+                self.payloads[row_id] = payload
+        self.items: List[Tuple[str, int]] = sorted((key, row_id) for row_id, key in self.keys.items())
+
+    def upsert(self, row_id: int, text: Optional[str], payload: dict):
+        self.remove(row_id)
+        key = suggest_key(text)
+        if not key:
+            return
+        insort(self.items, (key, row_id))
+        self.keys[row_id] = key
+        self.payloads[row_id] = payload
+
+    def remove(self, row_id: int):
+        key = self.keys.pop(row_id, None)
+        if key is None:
+            return
+        self.payloads.pop(row_id, None)
+        i = bisect_left(self.items, (key, row_id))
+        if i < len(self.items) and self.items[i] == (key, row_id):
+            del self.items[i]
+
+    def remove_author(self, author_id: int):
+        row_ids = [row_id for row_id, payload in self.payloads.items() if payload[self.author_field] == author_id]
+        for row_id in row_ids:
+            self.remove(row_id)
+
+    def complete(self, prefix: str, limit: int) -> Tuple[List[dict], bool]:
+        """First ``limit`` payloads whose key starts with ``prefix``, and whether more exist."""
+        items = self.items
+        i = bisect_left(items, (prefix,))
+        results = []
+        while i < len(items) and items[i][0].startswith(prefix):
+            if len(results) == limit:
+                return results, True
+            results.append(self.payloads[items[i][1]])
+            i += 1
+        return results, False
+
+
+def _tatvapada_row(row: dict) -> Tuple[int, Optional[str], dict]:
+    return row["id"], row.get("tatvapada_first_line"), {
+        "samputa_sankhye": row.get("samputa_sankhye"),
+        "tatvapada_sankhye": row.get("tatvapada_sankhye"),
+        "tatvapada_author_id": row.get("tatvapada_author_id"),
+        "tatvapada_first_line": row.get("tatvapada_first_line"),
+    }
+
+
+def _padavivarana_row(row: dict) -> Tuple[int, Optional[str], dict]:
+    return row["paribhashika_padavivarana_id"], row.get("paribhashika_padavivarana_title"), {
+        "id": row["paribhashika_padavivarana_id"],
+        "samputa_sankhye": row.get("samputa_sankhye"),
+        "tatvapada_author_id": row.get("tatvapada_author_id"),
+        "title": row.get("paribhashika_padavivarana_title"),
+    }
+
+
+def _arthakosha_row(row: dict) -> Tuple[int, Optional[str], dict]:
+    return row["id"], row.get("word"), {
+        "id": row["id"],
+        "samputa": row.get("samputa"),
+        "author_id": row.get("author_id"),
+        "word": row.get("word"),
+    }
+
+
+# kind -> (model, loaded columns, row -> (row_id, text, payload), author id field, author name field)
+# Field names follow the existing list endpoints of each kind.
+_SOURCES = {
+    "tatvapada": (
+        Tatvapada,
+        ("id", "samputa_sankhye", "tatvapada_sankhye", "tatvapada_author_id", "tatvapada_first_line"),
+        _tatvapada_row,
+        "tatvapada_author_id",
+        "tatvapadakarara_hesaru",
+    ),
+    "padavivarana": (
+        ParibhashikaPadavivarana,
+        ("paribhashika_padavivarana_id", "samputa_sankhye", "tatvapada_author_id",
+         "paribhashika_padavivarana_title"),
+        _padavivarana_row,
+        "tatvapada_author_id",
+        "tatvapadakarara_hesaru",
+    ),
+    "arthakosha": (
+        Arthakosha,
+        ("id", "samputa", "author_id", "word"),
+        _arthakosha_row,
+        "author_id",
+        "author_name",
+    ),
+}
+
+
+class SuggestIndex:
+    """Per-worker typeahead index; built on first use, rebuilt when a source table generation moves."""
+
+    def __init__(self):
+        self.logger = setup_logger("suggest_index", "suggest_index.log")
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._lists: Optional[Dict[str, _PrefixList]] = None
+        self._authors: Dict[int, str] = {}
+        self._authors_stale = False
+        # Table generations the lists were loaded at; None forces a rebuild
+        self._generation: Optional[tuple] = None
+        self._building = False
+        # Changes seen while a rebuild runs; replayed onto its result
+        self._pending: List[tuple] = []
+
+    # ----------------------
+    # Build
+    # ----------------------
+    def _load(self) -> Tuple[Dict[str, _PrefixList], Dict[int, str]]:
+        lists = {}
+        for kind, (model, columns, to_row, author_field, _) in _SOURCES.items():
+            rows = db_instance.session.query(*(getattr(model, col) for col in columns))
+            lists[kind] = _PrefixList(author_field, (to_row(dict(zip(columns, row))) for row in rows))
+        return lists, self._load_authors()
+
+    @staticmethod
+    def _load_authors() -> Dict[int, str]:
+        return dict(
+            db_instance.session.query(TatvapadaAuthorInfo.id, TatvapadaAuthorInfo.tatvapadakarara_hesaru)
+        )
+
+    def build(self):
+        """Load every kind from the database and swap it in."""
+        with self._lock:
+            self._building = True
+            self._pending = []
+        # Taken before loading, so a write committed during the load moves it again
+        generation = table_generations.current(*_TABLES)
+        try:
+            lists, authors = self._load()
+        except Exception:
+            with self._lock:
+                self._building = False
+            raise
+
+        with self._lock:
+            for args in self._pending:
+                self._apply(lists, *args)
+            self._lists, self._authors = lists, authors
+            self._authors_stale = False
+            self._generation = generation
+            self._building = False
+            self._pending = []
+        self.logger.info(
+            "Suggest index built: " + ", ".join(f"{kind}={len(lst.items)}" for kind, lst in lists.items())
+        )
+
+    def _ensure_warm(self):
+        if self._lists is None or self._generation != table_generations.current(*_TABLES):
+            with self._build_lock:
+                if self._lists is None:
+                    self.build()
+                elif self._generation != table_generations.current(*_TABLES):
+                    try:
+                        self.build()
+                    except Exception as e:
+                        # Keep serving the lists we have; the next lookup retries
+                        self.logger.error(f"Suggest index rebuild failed: {e}", exc_info=True)
+        elif self._authors_stale:
+            authors = self._load_authors()
+            with self._lock:
+                self._authors, self._authors_stale = authors, False
+
+    # ----------------------
+    # Writes
+    # ----------------------
+    def on_corpus_changed(self, sender, upserted=(), deleted=(), reset=False, **_):
+        if reset:
+            with self._lock:
+                self._generation = None
+            return
+
+        kinds = [kind for kind, table in SUGGEST_KINDS.items() if table == sender]
+        with self._lock:
+            for kind in kinds:
+                args = (kind, list(upserted), list(deleted))
+                if self._building:
+                    self._pending.append(args)
+                if self._lists is not None:
+                    self._apply(self._lists, *args)
+            if sender == "tatvapada_author_info":
+                for row in upserted:
+                    self._authors[row["id"]] = row.get("tatvapadakarara_hesaru")
+                # Author rows cascade to padavivarana/arthakosha in the database
+                for author_id in deleted:
+                    self._authors.pop(author_id, None)
+                    for lst in (self._lists or {}).values():
+                        lst.remove_author(author_id)
+
+    def _apply(self, lists: Dict[str, _PrefixList], kind: str, upserted: List[dict], deleted: List[int]):
+        lst = lists[kind]
+        to_row = _SOURCES[kind][2]
+        for row_id in deleted:
+            lst.remove(row_id)
+        for row in upserted:
+            row_id, text, payload = to_row(row)
+            lst.upsert(row_id, text, payload)
+            if payload[lst.author_field] not in self._authors:
+                self._authors_stale = True
+
+    # ----------------------
+    # Query
+    # ----------------------
+    def suggest(self, prefix: str, kinds: Iterable[str], limit: int = 10) -> Dict[str, dict]:
+        """Return {kind: {"results": [...], "has_more": bool}} for the first ``limit`` completions."""
+        self._ensure_warm()
+        key = _prefix_key(prefix)
+        out = {}
+        with self._lock:
+            for kind in kinds:
+                lst = self._lists[kind]
+                name_field = _SOURCES[kind][4]
+                results, has_more = lst.complete(key, limit) if key else ([], False)
+                out[kind] = {
+                    "results": [
+                        {**payload, name_field: self._authors.get(payload[lst.author_field])}
+                        for payload in results
+                    ],
+                    "has_more": has_more,
+                }
+        return out
+
+
+suggest_index = SuggestIndex()
+corpus_changed.connect(suggest_index.on_corpus_changed, sender="tatvapada")
+corpus_changed.connect(suggest_index.on_corpus_changed, sender="paribhashika_padavivarana")
+corpus_changed.connect(suggest_index.on_corpus_changed, sender="arthakosha")
+corpus_changed.connect(suggest_index.on_corpus_changed, sender="tatvapada_author_info")
@@ -1,17 +1,23 @@
 import csv
-import io
-from collections import defaultdict
-from typing import List, Tuple
+import os
+from bisect import bisect_right
+from typing import Dict, List, Tuple
 from typing import Optional
 
-from sqlalchemy import distinct
-from sqlalchemy import func
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import func, insert, tuple_, update
+from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
 
 from app.config.database import db_instance
 from app.models.tatvapada import Tatvapada
 from app.models.tatvapada import TatvapadaAuthorInfo
+from app.services.navigation_tree import navigation_tree
+from app.services.search_index import search_index
+from app.services.search_index_store import FIELDS
+from app.text import highlight_snippet, tokenize
+from app.utils.corpus_signals import notify_after_commit, row_snapshot
+from app.utils.csv_stream import CsvBatchReader, ImportCancelled
 from app.utils.logger import setup_logger
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_page
 
 
 class TatvapadaService:
@@ -52,6 +58,8 @@ class TatvapadaService:
             # --- Create new Tatvapada ---
             new_entry = Tatvapada(**payload)
             db_instance.session.add(new_entry)
+            db_instance.session.flush()  # generate new_entry.id
+            notify_after_commit(db_instance.session, "tatvapada", upserted=[row_snapshot(new_entry)])
             db_instance.session.commit()
 
             self.logger.info(
@@ -109,8 +117,13 @@ class TatvapadaService:
             # Step 4: If author name is provided, update the author record
             author_name = update_data.pop("tatvapadakarara_hesaru", None)
             if author_name and author_name.strip():
-                if existing_entry.tatvapadakarara_hesaru:
-                    existing_entry.tatvapadakarara_hesaru.tatvapadakarara_hesaru = author_name.strip()
+                author = existing_entry.tatvapadakarara_hesaru
+                if author:
+                    if author.tatvapadakarara_hesaru != author_name.strip():
+                        author.tatvapadakarara_hesaru = author_name.strip()
+                        notify_after_commit(
+                            db_instance.session, "tatvapada_author_info", upserted=[row_snapshot(author)]
+                        )
                 else:
                     raise ValueError("Author relationship missing; cannot update author name.")
 
@@ -119,6 +132,7 @@ class TatvapadaService:
                 if hasattr(existing_entry, key):
                     setattr(existing_entry, key, value)
 
+            notify_after_commit(db_instance.session, "tatvapada", upserted=[row_snapshot(existing_entry)])
             db_instance.session.commit()
             self.logger.info(
                 f"Updated Tatvapada entry with keys: {samputa_sankhye}, {tatvapada_sankhye}, {tatvapada_author_id}"
@@ -162,7 +176,10 @@ class TatvapadaService:
         Returns the count of rows deleted.
         """
         try:
-            deleted = Tatvapada.query.filter_by(samputa_sankhye=samputa_sankhye).delete()
+            query = Tatvapada.query.filter_by(samputa_sankhye=samputa_sankhye)
+            deleted_ids = [row_id for (row_id,) in query.with_entities(Tatvapada.id)]
+            deleted = query.delete()
+            notify_after_commit(db_instance.session, "tatvapada", deleted=deleted_ids)
             db_instance.session.commit()
             self.logger.info(f"Deleted {deleted} Tatvapada entries for samputa_sankhye={samputa_sankhye}")
             return deleted
@@ -192,6 +209,7 @@ class TatvapadaService:
             if not entry:
                 raise ValueError("Tatvapada entry not found with the given composite keys.")
 
+            notify_after_commit(db_instance.session, "tatvapada", deleted=[entry.id])
             db_instance.session.delete(entry)
             db_instance.session.commit()
 
@@ -222,10 +240,21 @@ class TatvapadaService:
             author_id: int,
             offset: int = 0,
             limit: int = 10,
-    ) -> Tuple[List[Tatvapada], int]:
+            cursor: Optional[str] = None,
+            include_total: bool = True,
+    ) -> Tuple[List[Tatvapada], Optional[int], Optional[str]]:
         """
         Search Tatvapada entries by keyword (whole-word match), samputa, and author_id.
         Supports Kannada Unicode words with ZWNJ handling.
+
+        Results are ordered by (samputa_sankhye, tatvapada_sankhye, id). Returns
+        (rows, total, next cursor); pass the cursor back to continue after the last
+        row instead of using ``offset``. ``total`` is None when ``include_total`` is
+        off and counting would cost a query.
+
+        Index hits are ordered in Python while the SQL path follows the column
+        collation (case folding, trailing spaces ignored), so a cursor records
+        which of the two issued it and is only resumed in that order.
         """
         try:
             keyword = (keyword or "").strip()
@@ -233,62 +262,173 @@ class TatvapadaService:
             author_id = int(author_id) if author_id else None
 
             if not keyword:
-                return [], 0
+                return [], 0, None
+
+            index_cursor = _is_index_cursor(cursor)
+            hits = search_index.search(keyword, samputa=samputa, author_id=author_id)
+            if hits is not None and cursor and not index_cursor and not hits[1]:
+                # Cursor from the SQL path (issued before the index warmed): stay in SQL order
+                hits = None
+            if index_cursor and (hits is None or hits[1]):
+                raise ValueError("Cursor was issued by the search index, which cannot serve this page")
+            if hits is not None:
+                candidates, is_phrase = hits
+                if not is_phrase:
+                    return self._page_hits(candidates, offset, limit, cursor)
+                if not candidates:
+                    return [], 0, None
+
+            base_q = self._keyword_regexp_query(keyword)
+
+            if hits is not None:
+                # Multi-word keyword: the index narrowed the rows, REGEXP confirms adjacency
+                base_q = base_q.filter(Tatvapada.id.in_([row_id for row_id, _ in candidates]))
+            else:
+                # Optional filters (cold index only; candidates are already filtered)
+                if samputa:
+                    base_q = base_q.filter(func.trim(Tatvapada.samputa_sankhye) == samputa)
+                if author_id:
+                    base_q = base_q.filter(Tatvapada.tatvapada_author_id == author_id)
 
-            # Escape regex special chars in keyword
-            escaped_keyword = keyword.replace(r"([.*+?^${}()|\[\]\\])", r"\\\1")
+            # Total count
+            total = None
+            if include_total:
+                total = db_instance.session.query(func.count()).select_from(base_q.subquery()).scalar()
 
-            # Whole-word regex with optional ZWNJ (zero-width non-joiner) around Kannada words
-            # Matches: start-of-string, whitespace, punctuation, or ZWNJ boundaries
-            word_bound_regex = (
-                fr"(^|[[:space:][:punct:]]|‌)"  # start or space/punct or ZWNJ (U+200C)
-                fr"{escaped_keyword}"
-                fr"([[:space:][:punct:]]|$|‌)"  # end or space/punct or ZWNJ
+            # Pagination
+            results, next_cursor = keyset_page(
+                base_q,
+                (Tatvapada.samputa_sankhye, Tatvapada.tatvapada_sankhye, Tatvapada.id),
+                limit,
+                cursor=cursor,
+                offset=offset,
             )
 
-            # Base query with join to author
-            base_q = db_instance.session.query(Tatvapada)
+            return results, total, next_cursor
 
-            # Apply regex filter on tatvapada text or author name
-            base_q = base_q.filter(
-                Tatvapada.tatvapada.op("REGEXP")(word_bound_regex)
-            )
+        except SQLAlchemyError as e:
+            self.logger.error(f"DB error in search_by_keyword: {e}")
+            return [], 0, None
+        except ValueError as e:
+            self.logger.error(f"Invalid input in search_by_keyword: {e}")
+            return [], 0, None
+
+    def _page_hits(
+            self,
+            hits: List[Tuple[int, tuple]],
+            offset: int,
+            limit: int,
+            cursor: Optional[str],
+    ) -> Tuple[List[Tatvapada], int, Optional[str]]:
+        """One page of index hits (already in samputa/sankhye/id order) plus the exact total."""
+        sort_keys = [(key[0], key[1], row_id) for row_id, key in hits]
+        if cursor:
+            _, samputa, sankhye, row_id = decode_cursor(cursor, 4)
+            start = bisect_right(sort_keys, ((samputa or "").strip(), (sankhye or "").strip(), row_id))
+        else:
+            start = offset
+        end = start + limit
+        next_cursor = encode_cursor((INDEX_CURSOR_TAG,) + sort_keys[end - 1]) if end < len(hits) else None
+        return self._fetch_ordered([row_id for row_id, _ in hits[start:end]]), len(hits), next_cursor
+
+    def search_ranked(
+            self,
+            keyword: str,
+            samputa: str,
+            author_id: int,
+            offset: int = 0,
+            limit: int = 10,
+    ) -> Tuple[List[dict], int]:
+        """
+        Search the verse, title, bhavanuvada and tippani of every Tatvapada and
+        return the best matches first, each with highlighted snippets instead of
+        the full texts.
 
-            # Optional filters
-            if samputa:
-                base_q = base_q.filter(func.trim(Tatvapada.samputa_sankhye) == samputa)
-            if author_id:
-                base_q = base_q.filter(Tatvapada.tatvapada_author_id == author_id)
+        Falls back to the whole-word search order (with ``score`` None) while the
+        search index is still being built.
+        """
+        try:
+            keyword = (keyword or "").strip()
+            samputa = (samputa or "").strip() or None
+            author_id = int(author_id) if author_id else None
 
-            # Total count
-            total = db_instance.session.query(func.count()).select_from(base_q.subquery()).scalar()
+            if not keyword:
+                return [], 0
 
-            # Pagination
-            results = (
-                base_q.order_by(Tatvapada.samputa_sankhye, Tatvapada.tatvapada_sankhye)
-                .offset(offset)
-                .limit(limit)
-                .all()
-            )
+            ranked = search_index.search_ranked(keyword, samputa=samputa, author_id=author_id)
+            if ranked is None:
+                rows, total, _ = self.search_by_keyword(keyword, samputa, author_id, offset, limit)
+                terms = tokenize(keyword)
+                return [self._ranked_result(row, None, terms) for row in rows], total
 
-            return results, total
+            hits, terms = ranked
+            page = hits[offset:offset + limit]
+            rows = self._fetch_ordered([row_id for row_id, _, _ in page])
+            scores = {row_id: score for row_id, score, _ in page}
+            return [self._ranked_result(row, scores[row.id], terms) for row in rows], len(hits)
 
         except SQLAlchemyError as e:
-            self.logger.error(f"DB error in search_by_keyword: {e}")
+            self.logger.error(f"DB error in search_ranked: {e}")
             return [], 0
         except ValueError as e:
-            self.logger.error(f"Invalid input in search_by_keyword: {e}")
+            self.logger.error(f"Invalid input in search_ranked: {e}")
             return [], 0
 
-    def get_all_samputa_sankhye(self) -> List[int]:
+    @staticmethod
+    def _ranked_result(row: Tatvapada, score: Optional[float], terms: List[str]) -> dict:
+        """Identifying fields of a ranked hit plus a snippet of every field that matched."""
+        snippets = {}
+        for field in FIELDS:
+            snippet = highlight_snippet(getattr(row, field), terms)
+            if snippet:
+                snippets[field] = snippet
+        return {
+            "id": row.id,
+            "samputa_sankhye": row.samputa_sankhye,
+            "tatvapada_sankhye": row.tatvapada_sankhye,
+            "tatvapada_author_id": row.tatvapada_author_id,
+            "tatvapadakarara_hesaru": (
+                row.tatvapadakarara_hesaru.tatvapadakarara_hesaru if row.tatvapadakarara_hesaru else None
+            ),
+            "tatvapada_first_line": row.tatvapada_first_line,
+            "tatvapada_sheershike": row.tatvapada_sheershike,
+            "score": round(score, 4) if score is not None else None,
+            "snippets": snippets,
+        }
+
+    @staticmethod
+    def _keyword_regexp_query(keyword: str):
+        """Query matching ``keyword`` as a whole word in the verse text via MySQL REGEXP."""
+        # Escape regex special chars in keyword
+        escaped_keyword = keyword.replace(r"([.*+?^${}()|\[\]\\])", r"\\\1")
+
+        # Whole-word regex with optional ZWNJ (zero-width non-joiner) around Kannada words
+        # Matches: start-of-string, whitespace, punctuation, or ZWNJ boundaries
+        word_bound_regex = (
+            fr"(^|[[:space:][:punct:]]|‌)"  # start or space/punct or ZWNJ (U+200C)
+            fr"{escaped_keyword}"
+            fr"([[:space:][:punct:]]|$|‌)"  # end or space/punct or ZWNJ
+        )
+
+        return db_instance.session.query(Tatvapada).filter(
+            Tatvapada.tatvapada.op("REGEXP")(word_bound_regex)
+        )
+
+    @staticmethod
+    def _fetch_ordered(row_ids: List[int]) -> List[Tatvapada]:
+        """Load Tatvapada rows by primary key, preserving the order of ``row_ids``."""
+        if not row_ids:
+            return []
+        rows = Tatvapada.query.filter(Tatvapada.id.in_(row_ids)).all()
+        by_id = {row.id: row for row in rows}
+        return [by_id[row_id] for row_id in row_ids if row_id in by_id]
+
+    def get_all_samputa_sankhye(self) -> List[str]:
         """
         Returns a list of all distinct samputa_sankhye values (non-null).
         """
         try:
-            results = Tatvapada.query.with_entities(
-                distinct(Tatvapada.samputa_sankhye)
-            ).all()
-            return [row[0] for row in results if row is not None]
+            return list(navigation_tree.get().samputas)
         except SQLAlchemyError as e:
             self.logger.error(f"Error fetching all samputa_sankhye: {e}")
             return []
@@ -298,11 +438,8 @@ class TatvapadaService:
         Returns a list of tatvapada_sankhye integers for a given samputa_sankhye.
         """
         try:
-            results = Tatvapada.query.filter_by(
-                samputa_sankhye=samputa_sankhye
-            ).with_entities(Tatvapada.tatvapada_sankhye).distinct().all()
-
-            return [int(row[0]) for row in results if row is not None]
+            sankhyes = navigation_tree.get().sankhyes(samputa_sankhye)
+            return [int(sankhye) for sankhye in sankhyes if sankhye.isdigit()]
         except SQLAlchemyError as e:
             self.logger.error(f"Error fetching tatvapada_sankhye by samputa {samputa_sankhye}: {e}")
             return []
@@ -312,27 +449,14 @@ class TatvapadaService:
         Returns list of dicts containing tatvapada_sankhye, author id, and author name for a samputa.
         """
         try:
-            results = (
-                db_instance.session.query(
-                    Tatvapada.tatvapada_sankhye,
-                    TatvapadaAuthorInfo.id,
-                    TatvapadaAuthorInfo.tatvapadakarara_hesaru
-                )
-                .join(
-                    TatvapadaAuthorInfo,
-                    Tatvapada.tatvapada_author_id == TatvapadaAuthorInfo.id
-                )
-                .filter(Tatvapada.samputa_sankhye == samputa_sankhye)
-                .distinct()
-                .all()
-            )
             return [
                 {
                     "tatvapada_sankhye": int(tps),
                     "tatvapadakarara_id": author_id,
                     "tatvapadakarara_hesaru": author_name
                 }
-                for tps, author_id, author_name in results if tps is not None
+                for tps, author_id, author_name in navigation_tree.get().sankhyes_with_authors(samputa_sankhye)
+                if tps.isdigit()
             ]
         except SQLAlchemyError as e:
             self.logger.error(f"Error fetching sankhyes with author for samputa {samputa_sankhye}: {e}")
@@ -367,28 +491,16 @@ class TatvapadaService:
         Optimized response: groups tatvapada_sankhyes by samputa and author for delete keys.
         Returns dict with key "delete_keys".
         """
-        results = (
-            db_instance.session.query(
-                Tatvapada.samputa_sankhye,
-                Tatvapada.tatvapada_author_id,
-                TatvapadaAuthorInfo.tatvapadakarara_hesaru,
-                Tatvapada.tatvapada_sankhye
-            )
-            .join(TatvapadaAuthorInfo, Tatvapada.tatvapada_author_id == TatvapadaAuthorInfo.id)
-            .order_by(Tatvapada.samputa_sankhye, Tatvapada.tatvapada_author_id, Tatvapada.tatvapada_sankhye)
-            .all()
-        )
-
-        grouped = defaultdict(lambda: {"tatvapada_sankhyes": []})
-
-        for row in results:
-            key = (row.samputa_sankhye, row.tatvapada_author_id)
-            grouped[key]["samputa_sankhye"] = row.samputa_sankhye
-            grouped[key]["tatvapada_author_id"] = row.tatvapada_author_id
-            grouped[key]["tatvapadakarara_hesaru"] = row.tatvapadakarara_hesaru
-            grouped[key]["tatvapada_sankhyes"].append(row.tatvapada_sankhye)
-
-        delete_keys = list(grouped.values())
+        tree = navigation_tree.get()
+        delete_keys = [
+            {
+                "samputa_sankhye": samputa,
+                "tatvapada_author_id": author_id,
+                "tatvapadakarara_hesaru": tree.authors.get(author_id),
+                "tatvapada_sankhyes": sankhyes,
+            }
+            for samputa, author_id, sankhyes in tree.author_groups()
+        ]
 
         return {"delete_keys": delete_keys}
 
@@ -408,183 +520,427 @@ BULK_UPLOAD_COLUMNS = [
 ]
 
 
+# Columns of a CSV row that map directly onto Tatvapada
+_VERSE_COLUMNS = [column for column in BULK_UPLOAD_COLUMNS if column != 'tatvapadakarara_hesaru']
+
+# Text columns a bulk update may rewrite; the key columns only select the row
+UPDATABLE_COLUMNS = [
+    column for column in _VERSE_COLUMNS if column not in ('samputa_sankhye', 'tatvapada_sankhye')
+]
+_SNAPSHOT_COLUMNS = ['id', 'samputa_sankhye', 'tatvapada_sankhye', 'tatvapada_author_id'] + UPDATABLE_COLUMNS
+
+# Rows per multi-row INSERT (and keys per IN list) in bulk ingest
+BULK_INSERT_CHUNK = int(os.getenv("BULK_INSERT_CHUNK", 1000))
+
+# First value of a keyword-search cursor issued from index hits (SQL cursors carry just the sort key)
+INDEX_CURSOR_TAG = "idx"
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _is_index_cursor(cursor: Optional[str]) -> bool:
+    if not cursor:
+        return False
+    try:
+        return decode_cursor(cursor, 4)[0] == INDEX_CURSOR_TAG
+    except ValueError:
+        return False
+
+
+def check_search_cursor(cursor: str) -> None:
+    """Raise ValueError unless ``cursor`` is one ``search_by_keyword`` issues."""
+    if not _is_index_cursor(cursor):
+        decode_cursor(cursor, 3)
+
+
+def _verse_key(values: dict) -> tuple:
+    return values['samputa_sankhye'], values['tatvapada_sankhye'], values['tatvapada_author_id']
+
+
+def _match_key(samputa, sankhye, author_id) -> tuple:
+    # Roughly how the utf8mb4_unicode_ci unique key compares: case and trailing blanks ignored
+    return (samputa or '').rstrip().casefold(), (sankhye or '').rstrip().casefold(), author_id
+
+
+def _same_text(stored, incoming) -> bool:
+    # Uploads keep cells as given while updates strip them and store blanks as NULL
+    stored = stored.strip() if isinstance(stored, str) else stored
+    return (stored or None) == (incoming or None)
+
+
+def _update_params(current: dict) -> dict:
+    return {"id": current["id"], **{column: current[column] for column in UPDATABLE_COLUMNS}}
+
+
+def _duplicate_message(i: int, values: dict) -> str:
+    return (f"Row {i}: Duplicate Tatvapada detected "
+            f"(samputa '{values['samputa_sankhye']}', sankhye '{values['tatvapada_sankhye']}').")
+
+
 class BulkService:
     def __init__(self, db_session=None):
         self.db = db_session or db_instance.session
 
-    def upload_csv_records(self, file_stream) -> Tuple[int, List[str]]:
+    def upload_csv_records(self, file_stream, progress=None) -> Tuple[int, List[str]]:
         """
         Reads CSV from file_stream and inserts Tatvapada and author records in bulk.
+        ``progress(rows_processed, errors)`` is called after each batch (see ``csv_stream``).
 
         Returns:
             records_added (int): Number of records successfully added.
             errors (List[str]): List of user-friendly errors encountered.
         """
-        records_added = 0
-        errors: List[str] = []
-
         try:
-            file_content = file_stream.read().decode('utf-8-sig')
-            reader = csv.DictReader(io.StringIO(file_content))
-
-            if not reader.fieldnames:
-                return 0, ["CSV file has no header row."]
-
-            header = [h.strip() for h in reader.fieldnames]
-            missing_cols = set(BULK_UPLOAD_COLUMNS) - set(header)
-            if missing_cols:
-                return 0, [f"Missing columns in CSV header: {', '.join(missing_cols)}"]
-
-            for i, row in enumerate(reader, 1):
-                try:
-                    row = {k.strip(): v for k, v in row.items()}
-
-                    author_name = row.get('tatvapadakarara_hesaru', '').strip()
-                    if not author_name:
-                        errors.append(f"Row {i}: Author name missing.")
-                        continue
-
-                    author = TatvapadaAuthorInfo.query.filter_by(
-                        tatvapadakarara_hesaru=author_name
-                    ).first()
-                    if not author:
-                        author = TatvapadaAuthorInfo(tatvapadakarara_hesaru=author_name)
-                        self.db.add(author)
-                        try:
-                            self.db.flush()
-                        except IntegrityError:
-                            self.db.rollback()
-                            errors.append(f"Row {i}: Duplicate author '{author_name}' detected.")
-                            author = TatvapadaAuthorInfo.query.filter_by(
-                                tatvapadakarara_hesaru=author_name
-                            ).first()
-                            if not author:
-                                continue  # skip this row
-
-                    tatvapada = Tatvapada(
-                        samputa_sankhye=row.get('samputa_sankhye'),
-                        tatvapadakosha_sheershike=row.get('tatvapadakosha_sheershike'),
-                        tatvapada_author_id=author.id,
-                        vibhag=row.get('vibhag'),
-                        tatvapada_sheershike=row.get('tatvapada_sheershike'),
-                        tatvapada_sankhye=row.get('tatvapada_sankhye'),
-                        tatvapada_first_line=row.get('tatvapada_first_line'),
-                        tatvapada=row.get('tatvapada'),
-                        bhavanuvada=row.get('bhavanuvada'),
-                        klishta_padagalu_artha=row.get('klishta_padagalu_artha'),
-                        tippani=row.get('tippani')
-                    )
-                    self.db.add(tatvapada)
-                    try:
-                        self.db.flush()
-                        records_added += 1
-                    except IntegrityError:
-                        self.db.rollback()
-                        errors.append(
-                            f"Row {i}: Duplicate Tatvapada detected (samputa '{row.get('samputa_sankhye')}', sankhye '{row.get('tatvapada_sankhye')}').")
-
-                except Exception as row_err:
-                    self.db.rollback()
-                    errors.append(f"Row {i}: {str(row_err)}")
-
-            return records_added, errors
-
+            with CsvBatchReader(file_stream, batch_size=BULK_INSERT_CHUNK) as reader:
+                if not reader.fieldnames:
+                    return 0, ["CSV file has no header row."]
+
+                missing_cols = reader.missing_columns(BULK_UPLOAD_COLUMNS)
+                if missing_cols:
+                    return 0, [f"Missing columns in CSV header: {', '.join(missing_cols)}"]
+
+                records_added = rows_processed = 0
+                errors: List[Tuple[int, str]] = []
+                for batch in reader.batches():
+                    records_added += len(self._ingest_rows(batch, errors))
+                    rows_processed += len(batch)
+                    if progress:
+                        progress(rows_processed, [message for _, message in errors])
+
+            errors.sort(key=lambda error: error[0])
+            return records_added, [message for _, message in errors]
+
+        except ImportCancelled:
+            self.db.rollback()
+            raise
         except UnicodeDecodeError:
+            self.db.rollback()
             return 0, ["Failed to decode CSV. Ensure the file is UTF-8 encoded."]
         except csv.Error as csv_err:
+            self.db.rollback()
             return 0, [f"CSV parsing error: {str(csv_err)}"]
         except Exception as e:
+            self.db.rollback()
             return 0, [f"Unexpected error: {str(e)}"]
 
-    def update_csv_records(self, file_stream) -> Tuple[int, List[str]]:
+    def ingest_records(self, records: List[dict]) -> List[dict]:
+        """
+        Insert JSON records (the ``/api/tatvapada/add`` schema) through the same
+        set-based path as the CSV upload, without committing.
+
+        Returns one ``{"index", "status"[, "message"]}`` entry per record, in
+        order, where ``index`` counts from 1 and status is ``inserted`` or
+        ``error``.
+        """
+        errors: List[Tuple[int, str]] = []
+        rows = []
+        for i, record in enumerate(records, 1):
+            if not isinstance(record, dict):
+                errors.append((i, f"Row {i}: Expected a JSON object."))
+                continue
+            # Same shape as a CSV row: text values, unknown keys ignored
+            rows.append((i, {
+                column: None if record.get(column) is None else str(record[column])
+                for column in BULK_UPLOAD_COLUMNS
+            }))
+
+        inserted = set()
+        for chunk in _chunks(rows, BULK_INSERT_CHUNK):
+            inserted.update(self._ingest_rows(chunk, errors))
+
+        messages = dict(errors)
+        results = []
+        for i in range(1, len(records) + 1):
+            if i in inserted:
+                results.append({"index": i, "status": "inserted"})
+            else:
+                results.append({"index": i, "status": "error", "message": messages.get(i, f"Row {i}: Not inserted.")})
+        return results
+
+    def _ingest_rows(self, rows: List[Tuple[int, dict]], errors: List[Tuple[int, str]]) -> List[int]:
+        """
+        Insert (row number, CSV row) pairs as new Tatvapadas, set at a time:
+        authors are resolved with one ``IN`` query and the missing ones created
+        with one multi-row insert, composite-key conflicts are found with one
+        query per ``BULK_INSERT_CHUNK`` samputas, and the remaining rows go in
+        as chunked multi-row inserts.
+
+        A chunk that still fails (e.g. a concurrent insert of the same key) is
+        rolled back to its savepoint and retried row by row, so one bad row
+        only costs itself. Appends (row number, message) to ``errors`` and
+        returns the row numbers inserted.
+        """
+        verses = []
+        for i, row in rows:
+            author_name = (row.get('tatvapadakarara_hesaru') or '').strip()
+            if not author_name:
+                errors.append((i, f"Row {i}: Author name missing."))
+                continue
+            verses.append((i, author_name, {field: row.get(field) for field in _VERSE_COLUMNS}))
+        if not verses:
+            return []
+
+        author_ids = self._resolve_authors(verses, errors)
+
+        samputas = {values['samputa_sankhye'] for _, _, values in verses}
+        taken = set(self._verse_ids(samputas))
+        pending = []
+        for i, author_name, values in verses:
+            if author_name not in author_ids:
+                continue
+            values['tatvapada_author_id'] = author_ids[author_name]
+            key = _verse_key(values)
+            if key in taken:
+                errors.append((i, _duplicate_message(i, values)))
+                continue
+            taken.add(key)
+            pending.append((i, values))
+
+        inserted = []
+        for chunk in _chunks(pending, BULK_INSERT_CHUNK):
+            inserted.extend(self._insert_verses(chunk, errors))
+
+        if inserted:
+            ids = self._verse_ids(samputas)
+            upserted = [{**values, "id": ids.get(_verse_key(values))} for _, values in inserted]
+            if all(row["id"] is not None for row in upserted):
+                notify_after_commit(self.db, "tatvapada", upserted=upserted)
+            else:
+                # A key came back changed by the database; let the consumers reload
+                notify_after_commit(self.db, "tatvapada", reset=True)
+        return [i for i, _ in inserted]
+
+    def _resolve_authors(self, verses: List[tuple], errors: List[Tuple[int, str]]) -> dict:
+        """Author name -> id for every author in ``verses``, creating the missing ones."""
+        first_rows = {}
+        for i, author_name, _ in verses:
+            first_rows.setdefault(author_name, i)
+        author_ids = self._author_ids(first_rows)
+
+        missing = [name for name in first_rows if name not in author_ids]
+        if not missing:
+            return author_ids
+
+        conflicted = []
+        try:
+            with self.db.begin_nested():
+                self.db.execute(insert(TatvapadaAuthorInfo), [{"tatvapadakarara_hesaru": name} for name in missing])
+        except IntegrityError:
+            # Created meanwhile, or equal to another name under the column collation
+            for name in missing:
+                try:
+                    with self.db.begin_nested():
+                        self.db.execute(insert(TatvapadaAuthorInfo), [{"tatvapadakarara_hesaru": name}])
+                except IntegrityError:
+                    conflicted.append(name)
+
+        author_ids.update(self._author_ids(missing))
+        for name in conflicted:
+            errors.append((first_rows[name], f"Row {first_rows[name]}: Duplicate author '{name}' detected."))
+            if name not in author_ids:
+                author = TatvapadaAuthorInfo.query.filter_by(tatvapadakarara_hesaru=name).first()
+                if author:
+                    author_ids[name] = author.id
+
+        notify_after_commit(
+            self.db, "tatvapada_author_info",
+            upserted=[
+                {"id": author_ids[name], "tatvapadakarara_hesaru": name}
+                for name in missing if name not in conflicted and name in author_ids
+            ]
+        )
+        return author_ids
+
+    def _author_ids(self, names) -> dict:
+        author_ids = {}
+        for chunk in _chunks(list(names), BULK_INSERT_CHUNK):
+            author_ids.update(
+                self.db.query(TatvapadaAuthorInfo.tatvapadakarara_hesaru, TatvapadaAuthorInfo.id)
+                .filter(TatvapadaAuthorInfo.tatvapadakarara_hesaru.in_(chunk))
+            )
+        return author_ids
+
+    def _verse_ids(self, samputas) -> dict:
+        """(samputa, sankhye, author id) -> id of every verse in ``samputas``."""
+        ids = {}
+        for chunk in _chunks(list(samputas), BULK_INSERT_CHUNK):
+            for row_id, samputa, sankhye, author_id in self.db.query(
+                    Tatvapada.id, Tatvapada.samputa_sankhye, Tatvapada.tatvapada_sankhye, Tatvapada.tatvapada_author_id
+            ).filter(Tatvapada.samputa_sankhye.in_(chunk)):
+                ids[(samputa, sankhye, author_id)] = row_id
+        return ids
+
+    def _insert_verses(self, chunk: List[Tuple[int, dict]], errors: List[Tuple[int, str]]) -> List[Tuple[int, dict]]:
+        """Insert ``chunk`` in one statement, falling back to one row at a time if it fails."""
+        try:
+            with self.db.begin_nested():
+                self.db.execute(insert(Tatvapada), [values for _, values in chunk])
+            return chunk
+        except OperationalError:
+            # Lock timeout or deadlock: the transaction is lost, not just this chunk
+            raise
+        except SQLAlchemyError:
+            pass
+
+        inserted = []
+        for i, values in chunk:
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(Tatvapada), [values])
+                inserted.append((i, values))
+            except IntegrityError:
+                errors.append((i, _duplicate_message(i, values)))
+            except OperationalError:
+                raise
+            except SQLAlchemyError as row_err:
+                errors.append((i, f"Row {i}: {str(row_err)}"))
+        return inserted
+
+    def update_csv_records(self, file_stream, progress=None) -> Tuple[int, List[str], Dict[str, int]]:
         """
         Reads CSV and updates existing Tatvapada records.
         Matching is done using (samputa_sankhye + tatvapada_sankhye + tatvapadakarara_hesaru).
+        ``progress(rows_processed, errors)`` is called after each batch.
+
+        Each batch loads its authors and target rows with one query each and
+        only rows whose text actually differs are written, so re-uploading a
+        mostly unchanged samputa costs a few SELECTs per batch.
 
         Returns:
             records_updated (int)
             errors (List[str])
+            counts (Dict[str, int]): updated / unchanged / missing row counts
         """
-        records_updated = 0
+        counts = {"updated": 0, "unchanged": 0, "missing": 0}
+        rows_processed = 0
         errors: List[str] = []
 
         try:
-            file_content = file_stream.read().decode('utf-8-sig')
-            reader = csv.DictReader(io.StringIO(file_content))
+            with CsvBatchReader(file_stream, batch_size=BULK_INSERT_CHUNK) as reader:
+                if not reader.fieldnames:
+                    return 0, ["CSV file has no header row."], counts
 
-            if not reader.fieldnames:
-                return 0, ["CSV file has no header row."]
+                missing_cols = reader.missing_columns(BULK_UPLOAD_COLUMNS)
+                if missing_cols:
+                    return 0, [f"Missing columns in CSV header: {', '.join(missing_cols)}"], counts
 
-            header = [h.strip() for h in reader.fieldnames]
-            missing_cols = set(BULK_UPLOAD_COLUMNS) - set(header)
-            if missing_cols:
-                return 0, [f"Missing columns in CSV header: {', '.join(missing_cols)}"]
+                for batch in reader.batches():
+                    self._update_rows(batch, errors, counts)
+                    rows_processed += len(batch)
+                    if progress:
+                        progress(rows_processed, errors)
 
-            for i, row in enumerate(reader, 1):
-                try:
-                    row = {k.strip(): (v.strip() if v else None) for k, v in row.items()}
-
-                    samputa = row.get("samputa_sankhye")
-                    sankhye = row.get("tatvapada_sankhye")
-                    author_name = row.get("tatvapadakarara_hesaru")
-
-                    if not samputa or not sankhye:
-                        errors.append(f"Row {i}: samputa_sankhye or tatvapada_sankhye missing.")
-                        continue
-
-                    if not author_name:
-                        errors.append(f"Row {i}: tatvapadakarara_hesaru (author) missing.")
-                        continue
-
-                    # --- Find Author ---
-                    author = TatvapadaAuthorInfo.query.filter_by(
-                        tatvapadakarara_hesaru=author_name
-                    ).first()
-
-                    if not author:
-                        errors.append(
-                            f"Row {i}: Author '{author_name}' not found. Cannot match Tatvapada."
-                        )
-                        continue
-
-                    # --- Find Tatvapada using samputa + sankhye + author ---
-                    tatvapada = Tatvapada.query.filter_by(
-                        samputa_sankhye=samputa,
-                        tatvapada_sankhye=sankhye,
-                        tatvapada_author_id=author.id
-                    ).first()
-
-                    if not tatvapada:
-                        errors.append(
-                            f"Row {i}: Tatvapada not found (samputa {samputa}, sankhye {sankhye}, author {author_name})."
-                        )
-                        continue
-
-                    # --- Update fields ---
-                    tatvapada.tatvapadakosha_sheershike = row.get('tatvapadakosha_sheershike')
-                    tatvapada.vibhag = row.get('vibhag')
-                    tatvapada.tatvapada_sheershike = row.get('tatvapada_sheershike')
-                    tatvapada.tatvapada_first_line = row.get('tatvapada_first_line')
-                    tatvapada.tatvapada = row.get('tatvapada')
-                    tatvapada.bhavanuvada = row.get('bhavanuvada')
-                    tatvapada.klishta_padagalu_artha = row.get('klishta_padagalu_artha')
-                    tatvapada.tippani = row.get('tippani')
-
-                    self.db.flush()
-                    records_updated += 1
-
-                except IntegrityError:
-                    self.db.rollback()
-                    errors.append(f"Row {i}: Integrity error while updating record.")
-                except Exception as row_err:
-                    self.db.rollback()
-                    errors.append(f"Row {i}: {str(row_err)}")
-
-            return records_updated, errors
+            return counts["updated"], errors, counts
 
+        except ImportCancelled:
+            self.db.rollback()
+            raise
         except UnicodeDecodeError:
-            return 0, ["Failed to decode CSV. Ensure the file is UTF-8 encoded."]
+            self.db.rollback()
+            return 0, ["Failed to decode CSV. Ensure the file is UTF-8 encoded."], counts
         except csv.Error as csv_err:
-            return 0, [f"CSV parsing error: {str(csv_err)}"]
+            self.db.rollback()
+            return 0, [f"CSV parsing error: {str(csv_err)}"], counts
         except Exception as e:
-            return 0, [f"Unexpected error: {str(e)}"]
+            self.db.rollback()
+            return 0, [f"Unexpected error: {str(e)}"], counts
+
+    def _update_rows(self, rows: List[Tuple[int, dict]], errors: List[str], counts: Dict[str, int]):
+        """Apply one batch of (row number, CSV row) updates, writing only the rows that changed."""
+        batch_errors: List[Tuple[int, str]] = []
+        incoming = []
+        for i, row in rows:
+            try:
+                row = {k.strip(): (v.strip() if v else None) for k, v in row.items()}
+            except Exception as row_err:
+                batch_errors.append((i, f"Row {i}: {str(row_err)}"))
+                continue
+
+            samputa = row.get("samputa_sankhye")
+            sankhye = row.get("tatvapada_sankhye")
+            author_name = row.get("tatvapadakarara_hesaru")
+
+            if not samputa or not sankhye:
+                batch_errors.append((i, f"Row {i}: samputa_sankhye or tatvapada_sankhye missing."))
+                continue
+
+            if not author_name:
+                batch_errors.append((i, f"Row {i}: tatvapadakarara_hesaru (author) missing."))
+                continue
+
+            incoming.append((i, samputa, sankhye, author_name, row))
+
+        author_ids = self._author_ids({author_name for _, _, _, author_name, _ in incoming})
+        targets = []
+        for i, samputa, sankhye, author_name, row in incoming:
+            if author_name not in author_ids:
+                counts["missing"] += 1
+                batch_errors.append((i, f"Row {i}: Author '{author_name}' not found. Cannot match Tatvapada."))
+                continue
+            targets.append((i, samputa, sankhye, author_name, author_ids[author_name], row))
+
+        stored = self._stored_verses({(samputa, sankhye, author_id) for _, samputa, sankhye, _, author_id, _ in targets})
+
+        changed: Dict[int, Tuple[int, dict]] = {}
+        for i, samputa, sankhye, author_name, author_id, row in targets:
+            current = stored.get(_match_key(samputa, sankhye, author_id))
+            if current is None:
+                counts["missing"] += 1
+                batch_errors.append((
+                    i, f"Row {i}: Tatvapada not found (samputa {samputa}, sankhye {sankhye}, author {author_name})."
+                ))
+                continue
+
+            values = {column: row.get(column) for column in UPDATABLE_COLUMNS}
+            if all(_same_text(current[column], value) for column, value in values.items()):
+                counts["unchanged"] += 1
+                continue
+            current.update(values)  # a later row for the same verse is diffed against this one
+            changed[current["id"]] = (i, current)
+
+        for chunk in _chunks(list(changed.values()), BULK_INSERT_CHUNK):
+            updated = self._write_updates(chunk, batch_errors)
+            counts["updated"] += len(updated)
+            if updated:
+                notify_after_commit(self.db, "tatvapada", upserted=[dict(current) for _, current in updated])
+
+        batch_errors.sort(key=lambda error: error[0])
+        errors.extend(message for _, message in batch_errors)
+
+    def _stored_verses(self, keys) -> Dict[tuple, dict]:
+        """Column dicts of the verses with the given (samputa, sankhye, author id) keys, by ``_match_key``."""
+        columns = [Tatvapada.__table__.c[name] for name in _SNAPSHOT_COLUMNS]
+        stored = {}
+        for chunk in _chunks(list(keys), BULK_INSERT_CHUNK):
+            query = self.db.query(*columns).filter(
+                tuple_(Tatvapada.samputa_sankhye, Tatvapada.tatvapada_sankhye, Tatvapada.tatvapada_author_id).in_(chunk)
+            )
+            for row in query:
+                current = dict(row._mapping)
+                stored[_match_key(current["samputa_sankhye"], current["tatvapada_sankhye"],
+                                  current["tatvapada_author_id"])] = current
+        return stored
+
+    def _write_updates(self, chunk: List[Tuple[int, dict]], errors: List[Tuple[int, str]]) -> List[Tuple[int, dict]]:
+        """Bulk UPDATE ``chunk`` by primary key, falling back to one row at a time if it fails."""
+        try:
+            with self.db.begin_nested():
+                self.db.execute(update(Tatvapada), [_update_params(current) for _, current in chunk])
+            return chunk
+        except SQLAlchemyError:
+            pass
+
+        updated = []
+        for i, current in chunk:
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(update(Tatvapada), [_update_params(current)])
+                updated.append((i, current))
+            except IntegrityError:
+                errors.append((i, f"Row {i}: Integrity error while updating record."))
+            except SQLAlchemyError as row_err:
+                errors.append((i, f"Row {i}: {str(row_err)}"))
+        return updated
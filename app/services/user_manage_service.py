@@ -10,6 +10,8 @@ from sqlalchemy import or_
 
 from app.config.database import db_instance
 from app.models.user_management import User, Admin
+from app.utils.auth_cache import auth_cache, token_versions
+from app.utils.credential_cache import credential_cache
 from app.utils.logger import setup_logger
 
 load_dotenv()
@@ -18,6 +20,9 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 if not SECRET_KEY:
     raise ValueError("SECRET_KEY not found in environment variables")
 
+# bcrypt work factor for new hashes; older hashes are upgraded on the next login
+BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", 12))
+
 
 class UserService:
     def __init__(self):
@@ -32,7 +37,7 @@ class UserService:
         if User.query.filter((User.email == email) | (User.username == username)).first():
             raise ValueError("Email or username already exists.")
 
-        hashed_password = self.bcrypt.generate_password_hash(password).decode("utf-8")
+        hashed_password = self._hash_password(password)
         new_user = User(
             name=name,
             phone=phone,
@@ -57,6 +62,7 @@ class UserService:
         )
         db_instance.session.add(new_admin)
         db_instance.session.commit()
+        auth_cache.invalidate()
         return new_admin
 
 
@@ -103,7 +109,7 @@ class UserService:
 
             user_created = False
             if not user:
-                hashed_password = self.bcrypt.generate_password_hash(password).decode("utf-8")
+                hashed_password = self._hash_password(password)
                 user = User(
                     name=name,
                     phone=phone,
@@ -125,6 +131,7 @@ class UserService:
             )
             db_instance.session.add(new_admin)
             db_instance.session.commit()
+            auth_cache.invalidate()
 
             message = (
                 f"User '{username}' created and promoted to admin."
@@ -198,6 +205,8 @@ class UserService:
         user = User.query.get_or_404(user_id)
 
         if username:
+            if username != user.username:
+                self._revoke_tokens(user)  # tokens carry the old username
             user.username = username
         if email is not None:
             user.email = email
@@ -208,6 +217,7 @@ class UserService:
             self.update_admin_status(user_id, is_admin)
 
         db_instance.session.commit()
+        token_versions.invalidate()
         return user
 
     def update_admin_status(self, user_id: int, is_admin: bool) -> bool:
@@ -223,9 +233,18 @@ class UserService:
             if admin_entry:
                 db_instance.session.delete(admin_entry)
 
+        # Tokens carry the admin flag, so the ones issued before the change stop working
+        self._revoke_tokens(user)
         db_instance.session.commit()
+        auth_cache.invalidate()
+        token_versions.invalidate()
         return is_admin
 
+    @staticmethod
+    def _revoke_tokens(user: User):
+        """Invalidate every token issued to ``user`` so far; takes effect when the session commits."""
+        user.token_version = (user.token_version or 0) + 1
+
     # ----------------------
     # DELETE
     # ----------------------
@@ -239,6 +258,8 @@ class UserService:
 
         db_instance.session.delete(user)
         db_instance.session.commit()
+        auth_cache.invalidate()
+        token_versions.invalidate()
         return True
 
     # ----------------------
@@ -261,6 +282,13 @@ class UserService:
         :param password: Raw password entered by the user
         :return: User object if credentials are correct, else None
         """
+        # Service accounts: a recent successful check stands while the hash is unchanged
+        cached = credential_cache.get(identifier, password)
+        if cached:
+            user = db_instance.session.get(User, cached[0])
+            if user and user.password_hash == cached[1] and identifier in (user.username, user.email):
+                return user
+
         user = User.query.filter(
             or_(User.username == identifier, User.email == identifier)
         ).first()
@@ -268,14 +296,44 @@ class UserService:
         if not user or not self.bcrypt.check_password_hash(user.password_hash, password):
             return None
 
+        if self._hash_rounds(user.password_hash) != BCRYPT_LOG_ROUNDS:
+            self._rehash_password(user, password)
+
+        credential_cache.put(identifier, password, user.username, user.id, user.password_hash)
         return user
 
+    def _hash_password(self, password: str) -> str:
+        return self.bcrypt.generate_password_hash(password, BCRYPT_LOG_ROUNDS).decode("utf-8")
+
+    @staticmethod
+    def _hash_rounds(password_hash: str) -> Optional[int]:
+        """Work factor of a bcrypt hash ("$2b$12$..."), or None if it is not one."""
+        parts = (password_hash or "").split("$")
+        try:
+            return int(parts[2])
+        except (IndexError, ValueError):
+            return None
+
+    def _rehash_password(self, user: User, password: str):
+        """Re-hash at BCRYPT_LOG_ROUNDS after a successful login; a failure keeps the old hash."""
+        old_rounds = self._hash_rounds(user.password_hash)
+        try:
+            user.password_hash = self._hash_password(password)
+            db_instance.session.commit()
+            self.logger.info(f"Rehashed password of '{user.username}' from cost {old_rounds} to {BCRYPT_LOG_ROUNDS}")
+        except Exception:
+            db_instance.session.rollback()
+            self.logger.exception(f"Failed to rehash password of '{user.username}'")
+
     def generate_jwt_token(self, user: User, user_type: str, expires_in: int = 30) -> str:
         """Generate JWT token for a user."""
         payload = {
             "user_id": user.id,
             "username": user.username,
             "user_type": user_type,
+            # Trusted as-is with JWT_CLAIMS_MODE=signed (see auth_cache)
+            "is_admin": user_type == "admin",
+            "token_version": user.token_version or 0,
             "exp": int((datetime.now(timezone.utc) + timedelta(minutes=expires_in)).timestamp()),
         }
         return jwt.encode(payload, SECRET_KEY, algorithm="HS256")
@@ -298,12 +356,14 @@ class UserService:
             raise ValueError("Password must be at least 6 characters long.")
 
         user = User.query.get_or_404(user_id)
-        user.set_password(new_password, self.bcrypt)
+        user.set_password(new_password, self.bcrypt, BCRYPT_LOG_ROUNDS)
 
         if hasattr(user, "password_reset_at"):
             user.password_reset_at = datetime.now(timezone.utc)
 
+        self._revoke_tokens(user)
         db_instance.session.commit()
+        token_versions.invalidate()
         return True
     @staticmethod
     def is_jwt_expired(token: str) -> bool:
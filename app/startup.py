@@ -0,0 +1,43 @@
+"""
+One-time startup tasks: log the database tables, make sure the default
+admin exists and fail the import jobs the previous run left unfinished.
+
+They belong to the deployment, not to a worker, so they run once per start:
+in the gunicorn master before any worker is forked (gunicorn.conf.py), in
+serve.py before waitress starts, or in ``python app.py``.
+"""
+from app.config.database import db_instance
+from app.utils.logger import setup_logger
+
+
+def run_startup_tasks(app) -> dict:
+    """Returns the ``create_default_admin`` result."""
+    from app.services.import_jobs import import_jobs
+    from app.services.user_manage_service import UserService
+
+    logger = setup_logger("main", "main.log")
+    with app.app_context():
+        tables = db_instance.inspect(db_instance.engine).get_table_names()
+        if tables:
+            tables_list = "\n".join(f"  {i + 1}. {table}" for i, table in enumerate(tables))
+            logger.info(f"Tables in the database:\n{tables_list}\n")
+        else:
+            logger.info("No tables found in the database.\n")
+
+        result = UserService().create_default_admin()
+        logger.info(f"default user creation : {result}")
+
+        interrupted = import_jobs.recover_after_restart()
+        if interrupted:
+            logger.info(f"Marked {interrupted} interrupted import job(s) as failed")
+
+        # Release the startup connections; serving opens its own as needed
+        db_instance.engine.dispose()
+    return result
+
+
+if __name__ == "__main__":
+    # ``python -m app.startup``: what gunicorn.conf.py runs before forking workers
+    from app import create_app
+
+    run_startup_tasks(create_app())
@@ -69,6 +69,7 @@ const apiEndpoints = {
         arthakoshaApi: `${BASE_URL}/api/v1/right-section/arthakosha`,
         arthakoshaApiUpload: `${BASE_URL}/api/v1/right-section/upload-arthakosha`,
         tatvapadaSuchi: `${BASE_URL}/api/v1/right-section/tatvapadasuchi`,
+        suggest: `${BASE_URL}/api/v1/right-section/suggest`,
         getTatvapada: (samputa, authorId, sankhye) =>
             `${BASE_URL}/api/v1/right-section/tatvapada?samputa_sankhye=${samputa}&tatvapada_author_id=${authorId}&tatvapada_sankhye=${sankhye}`,
         arthakosha: `${BASE_URL}/arthakosha`,
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _workdir(tmp_path, monkeypatch):
+    # Loggers and index directories are relative to the working directory
+    monkeypatch.chdir(tmp_path)
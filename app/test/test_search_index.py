@@ -0,0 +1,139 @@
+import pytest
+
+from app.services.search_index import TatvapadaSearchIndex
+from app.services.search_index_store import FIELDS
+
+
+def _row(row_id, text, sankhye=None):
+    return {
+        "id": row_id,
+        "samputa_sankhye": "1",
+        "tatvapada_sankhye": sankhye or str(row_id),
+        "tatvapada_author_id": 1,
+        "tatvapada": text,
+        "tatvapada_sheershike": None,
+        "bhavanuvada": None,
+        "tippani": None,
+    }
+
+
+def _values(row):
+    return (row["id"], row["samputa_sankhye"], row["tatvapada_sankhye"], row["tatvapada_author_id"],
+            *(row[field] for field in FIELDS))
+
+
+def _build(index, rows):
+    return index.store.build(lambda: index.collect(_values(row) for row in rows))
+
+
+def _ids(index, keyword):
+    hits, _ = index.search(keyword)
+    return [row_id for row_id, _ in hits]
+
+
+def test_build_after_delta_upsert_keeps_snapshot_text(tmp_path):
+    index = TatvapadaSearchIndex(str(tmp_path / "index"))
+    rows = [_row(1, "ಮೊದಲ ಪದ"), _row(2, "ಎರಡನೇ ಪದ")]
+    assert _build(index, rows)
+
+    index.on_corpus_changed("tatvapada", upserted=[_row(1, "ಹಳೆಯ ಮೊದಲು")])
+    assert _ids(index, "ಹಳೆಯ") == [1]
+
+    rows[0] = _row(1, "ಹೊಸತು ಬದಲು")
+    assert _build(index, rows)
+    assert _ids(index, "ಹಳೆಯ") == []
+    assert _ids(index, "ಹೊಸತು") == [1]
+
+    index.on_corpus_changed("tatvapada", upserted=[_row(2, "ಎರಡನೇ ಸಾಲು")])
+    assert index.store.merge()
+    assert _ids(index, "ಹಳೆಯ") == []
+    assert _ids(index, "ಹೊಸತು") == [1]
+    assert _ids(index, "ಸಾಲು") == [2]
+
+
+def test_build_keeps_writes_committed_during_the_snapshot(tmp_path):
+    index = TatvapadaSearchIndex(str(tmp_path / "index"))
+    rows = [_row(1, "ಮೊದಲ ಪದ"), _row(2, "ಎರಡನೇ ಪದ")]
+    assert _build(index, rows)
+
+    def snapshot():
+        taken = index.collect(_values(row) for row in rows)
+        # Committed after the snapshot was read, so only the delta has it
+        index.on_corpus_changed("tatvapada", upserted=[_row(2, "ತಡವಾದ ಬದಲಾವಣೆ")])
+        return taken
+
+    assert index.store.build(snapshot)
+    assert _ids(index, "ತಡವಾದ") == [2]
+    assert _ids(index, "ಎರಡನೇ") == []
+
+
+def test_reset_notification_invalidates_the_index(tmp_path, monkeypatch):
+    from flask import Flask
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.utils import corpus_signals
+
+    monkeypatch.setattr(corpus_signals, "NOTIFY_MAX_ROWS", 2)
+    index = TatvapadaSearchIndex(str(tmp_path / "index"))
+    builds = []
+    monkeypatch.setattr(index, "_start_build", builds.append)
+    assert _build(index, [_row(1, "ಹಳೆಯ ಪದ")])
+    assert _ids(index, "ಹಳೆಯ") == [1]
+
+    corpus_signals.corpus_changed.connect(index.on_corpus_changed, sender="tatvapada")
+    try:
+        # Three rows are over the limit, so one reset is sent instead; no app context here
+        with Session(create_engine("sqlite://")) as session:
+            session.connection()
+            rows = [_row(1, "ಹೊಸ ಪದ"), _row(2, "ಎರಡು"), _row(3, "ಮೂರು")]
+            corpus_signals.notify_after_commit(session, "tatvapada", upserted=rows)
+            session.commit()
+    finally:
+        corpus_signals.corpus_changed.disconnect(index.on_corpus_changed, sender="tatvapada")
+
+    assert builds == []
+    assert index.store.open_segment() is None
+    with Flask(__name__).app_context():
+        # Cold: the caller falls back to SQL and the rebuild starts now
+        assert index.search("ಹಳೆಯ") is None
+    assert len(builds) == 1
+
+
+def test_build_started_before_a_reset_is_not_installed(tmp_path):
+    index = TatvapadaSearchIndex(str(tmp_path / "index"))
+    assert _build(index, [_row(1, "ಹಳೆಯ ಪದ")])
+
+    def snapshot():
+        taken = index.collect([_values(_row(1, "ಹಳೆಯ ಪದ"))])
+        index.store.invalidate()
+        return taken
+
+    assert not index.store.build(snapshot)
+    assert index.store.open_segment() is None
+    assert _build(index, [_row(1, "ಹೊಸ ಪದ")])
+    assert _ids(index, "ಹೊಸ") == [1]
+
+
+def _scores(index, keyword):
+    hits, _ = index.search_ranked(keyword)
+    return {row_id: score for row_id, score, _ in hits}
+
+
+def test_ranked_scores_after_an_update_match_a_fresh_build(tmp_path):
+    rows = [_row(1, "ಗುರು ಕರುಣೆ ಗುರು"), _row(2, "ಗುರು ನಾಮ ಸ್ಮರಣೆ ಮಾಡು"), _row(3, "ಶಿವ ನಾಮ"), _row(4, "ಹರಿ")]
+    index = TatvapadaSearchIndex(str(tmp_path / "index"))
+    assert _build(index, rows)
+
+    rows[1] = _row(2, "ಶಿವ ಶಿವ")
+    index.on_corpus_changed("tatvapada", upserted=[rows[1]], deleted=[4])
+    del rows[3]
+    fresh = TatvapadaSearchIndex(str(tmp_path / "fresh"))
+    assert _build(fresh, rows)
+
+    keywords = ("ಗುರು", "ಶಿವ", "ನಾಮ ಗುರು")
+    for keyword in keywords:
+        assert _scores(index, keyword) == pytest.approx(_scores(fresh, keyword))
+    assert index.store.merge()
+    for keyword in keywords:
+        assert _scores(index, keyword) == pytest.approx(_scores(fresh, keyword))
@@ -0,0 +1,20 @@
+import pytest
+
+from app.text import highlight_snippet
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("ಗುರು ನಾಮ", "<mark>ಗುರು</mark> ನಾಮ"),
+    (" ಗುರು ನಾಮ", "<mark>ಗುರು</mark> ನಾಮ"),
+    ("“ಗುರು” ನಾಮ", "“<mark>ಗುರು</mark>” ನಾಮ"),
+    ("॥ ಗುರು ನಾಮ", "॥ <mark>ಗುರು</mark> ನಾಮ"),
+])
+def test_match_near_the_start_keeps_the_first_characters(text, expected):
+    assert highlight_snippet(text, ["ಗುರು"]) == expected
+
+
+def test_match_far_from_the_start_is_cut_with_an_ellipsis():
+    text = "ಹರಿ " * 60 + "ಗುರು ನಾಮ"
+    snippet = highlight_snippet(text, ["ಗುರು"], max_chars=40)
+    assert snippet.startswith("…")
+    assert "<mark>ಗುರು</mark>" in snippet
@@ -0,0 +1,27 @@
+from app.text.normalize import (
+    DANDA,
+    DOUBLE_DANDA,
+    KANNADA_DIGITS,
+    TOKENIZER_VERSION,
+    clean_text,
+    iter_word_spans,
+    kannada_to_english_digits,
+    normalize_para,
+    tokenize,
+    tokenize_batch,
+)
+from app.text.snippets import highlight_snippet
+
+__all__ = [
+    "DANDA",
+    "DOUBLE_DANDA",
+    "KANNADA_DIGITS",
+    "TOKENIZER_VERSION",
+    "clean_text",
+    "highlight_snippet",
+    "iter_word_spans",
+    "kannada_to_english_digits",
+    "normalize_para",
+    "tokenize",
+    "tokenize_batch",
+]
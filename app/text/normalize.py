@@ -0,0 +1,144 @@
+"""
+Kannada text normalization and tokenization.
+
+Tokenizing is one ``str.translate`` pass with a table built at import time,
+then NFC, then ``casefold``/``split``. NFC is the expensive step, so it is
+skipped when the text provably is NFC already (only Latin-1, Kannada and
+punctuation, with none of the Kannada vowel-sign pairs that compose). Search
+indexing, the search query path, the DOCX extractors and Arthakosha all go
+through these helpers so they agree on what a "word" is.
+"""
+import re
+import string
+import unicodedata
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Bump when ``tokenize`` changes its output; persisted indexes are keyed on it.
+TOKENIZER_VERSION = 2
+
+KANNADA_DIGITS = "೦೧೨೩೪೫೬೭೮೯"
+DANDA = "\u0964"         # ।
+DOUBLE_DANDA = "\u0965"  # ॥
+
+ZWSP = "\u200b"
+ZWNJ = "\u200c"
+ZWJ = "\u200d"
+WORD_JOINER = "\u2060"
+BOM = "\ufeff"
+
+_DIGIT_TABLE = str.maketrans(KANNADA_DIGITS, "0123456789")
+
+# Text made only of Latin-1, Kannada and punctuation is already NFC unless it
+# contains one of the Kannada sequences that compose or reorder:
+#   ಿ + ೕ -> ೀ    ೆ + ೕ -> ೇ    ೊ + ೕ -> ೋ    ೆ + ೖ -> ೈ    ೆ + ೂ -> ೊ
+#   virama + nukta is reordered to nukta + virama
+# Length marks and nukta are rare, so testing for them alone is cheap.
+_NFC_UNSAFE_RE = re.compile("[\u0100-\u0963\u0966-\u0c7f\u0d00-\u2001\u205f-\U0010ffff]")
+_NFC_UNSAFE_CHARS = ("\u0cd5", "\u0cd6", "\u0cbc")
+_NFC_UNSAFE_PAIR = "\u0cc6\u0cc2"
+
+# Tokenization: Kannada digits -> ASCII, ZWJ/word joiner dropped, and every
+# separator (ASCII/Latin-1/general punctuation, danda, ``||``, ZWSP, ZWNJ) -> a
+# space so a plain ``str.split()`` finishes the job. Kannada vowel signs and
+# virama are combining marks and must stay inside the word.
+#
+# A list indexed by code point translates about twice as fast as a dict; code
+# points past its end raise IndexError, which ``str.translate`` treats as "keep".
+# The only separator beyond it, BOM, is removed separately.
+_TOKEN_TABLE: List[Optional[int]] = list(range(0x2070))
+for _ch, _to in _DIGIT_TABLE.items():
+    _TOKEN_TABLE[_ch] = _to
+for _ch in ZWJ + WORD_JOINER:
+    _TOKEN_TABLE[ord(_ch)] = None
+for _ch in (
+        string.punctuation
+        + ZWSP + ZWNJ + DANDA + DOUBLE_DANDA
+        + "".join(map(chr, range(0x00A0, 0x00C0)))  # NBSP and Latin-1 punctuation
+        + "".join(map(chr, range(0x2010, 0x2060)))  # General punctuation
+):
+    _TOKEN_TABLE[ord(_ch)] = ord(" ")
+del _ch, _to
+
+# Joins batch input for a single translate/NFC/casefold pass; split back afterwards.
+_BATCH_SEPARATOR = "\x1e"
+
+# A run of characters that ``tokenize`` keeps together, in the original text
+_WORD_RE = re.compile(
+    "[^\\s" + "".join(re.escape(chr(i)) for i, to in enumerate(_TOKEN_TABLE) if to == ord(" ")) + BOM + "]+"
+)
+
+
+def _nfc(text: str) -> str:
+    if (
+            _NFC_UNSAFE_RE.search(text) is None
+            and _NFC_UNSAFE_PAIR not in text
+            and not any(ch in text for ch in _NFC_UNSAFE_CHARS)
+    ):
+        return text
+    return unicodedata.normalize("NFC", text)
+
+
+def _drop(text: str, chars: str) -> str:
+    # A substring test per character beats a translate pass when they are absent
+    for ch in chars:
+        if ch in text:
+            text = text.replace(ch, "")
+    return text
+
+
+def kannada_to_english_digits(text: str) -> str:
+    """Replace Kannada digits (೦-೯) with ASCII digits."""
+    return text.translate(_DIGIT_TABLE)
+
+
+def clean_text(text: Optional[str]) -> str:
+    """Remove zero-width characters and trim spaces."""
+    if not text:
+        return ""
+    return _drop(text, ZWSP + ZWNJ + ZWJ + WORD_JOINER + BOM).strip()
+
+
+def normalize_para(text: Optional[str]) -> str:
+    """NFC-normalize a paragraph, dropping ZWSP/BOM but keeping ZWJ/ZWNJ."""
+    if not text:
+        return ""
+    # ZWJ/ZWNJ are kept because they change how conjuncts render
+    return _nfc(_drop(text, ZWSP + WORD_JOINER + BOM).strip())
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into normalized (NFC, casefolded, ASCII-digit) search tokens."""
+    if not text:
+        return []
+    text = text.translate(_TOKEN_TABLE)
+    if BOM in text:
+        text = text.replace(BOM, "")
+    return _nfc(text).casefold().split()
+
+
+def iter_word_spans(text: Optional[str]) -> Iterator[Tuple[int, int, str]]:
+    """
+    Yield (start, end, token) for every word of ``text``, with offsets into the
+    original string, so a match on a token can be highlighted in place.
+    """
+    for match in _WORD_RE.finditer(text or ""):
+        tokens = tokenize(match.group())
+        if tokens:
+            yield match.start(), match.end(), tokens[0]
+
+
+def tokenize_batch(texts: Iterable[Optional[str]]) -> List[List[str]]:
+    """
+    Tokenize many texts at once; same result as ``[tokenize(t) for t in texts]``.
+
+    The texts are joined and translated, normalized and casefolded as one string,
+    which saves the per-call overhead when indexing thousands of verses.
+    """
+    texts = [text or "" for text in texts]
+    if not texts:
+        return []
+    joined = _BATCH_SEPARATOR.join(texts)
+    if joined.count(_BATCH_SEPARATOR) != len(texts) - 1:
+        return [tokenize(text) for text in texts]
+    joined = _nfc(_drop(joined.translate(_TOKEN_TABLE), BOM)).casefold()
+    return [chunk.split() for chunk in joined.split(_BATCH_SEPARATOR)]
@@ -0,0 +1,73 @@
+"""
+Search result snippets: a short window of a field with the matched words
+wrapped in ``<mark>``.
+
+Matching is by token (see ``tokenize``), so a query for "ಗುರು" highlights
+"ಗುರು," and "ಗುರು।" but not "ಗುರುವಿನ". The returned string is HTML; the text
+around the marks is escaped.
+"""
+import re
+from typing import Iterable, List, Optional, Tuple
+
+from markupsafe import escape
+
+from app.text.normalize import iter_word_spans
+
+ELLIPSIS = "…"
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _plain(text: str) -> str:
+    return str(escape(_WHITESPACE_RE.sub(" ", text)))
+
+
+def _best_window(matches: List[Tuple[int, int, str]], max_chars: int) -> Tuple[int, int]:
+    """Start/end of the window of ``max_chars`` holding the most distinct matched tokens."""
+    best, best_count = 0, 0
+    for i, (start, _, _) in enumerate(matches):
+        count = len({tok for s, e, tok in matches[i:] if e - start <= max_chars})
+        if count > best_count:
+            best, best_count = i, count
+    return matches[best][0], matches[best][1]
+
+
+def highlight_snippet(text: Optional[str], terms: Iterable[str], max_chars: int = 160) -> Optional[str]:
+    """
+    Return about ``max_chars`` characters of ``text`` around its best cluster of
+    ``terms`` (already tokenized), with each matched word marked, or None if
+    no term occurs in the text.
+    """
+    if not text:
+        return None
+    terms = set(terms)
+    spans = list(iter_word_spans(text))
+    matches = [span for span in spans if span[2] in terms]
+    if not matches:
+        return None
+
+    first_start, first_end = _best_window(matches, max_chars)
+    # Show a little context before the first match, starting on a word boundary
+    lead = max(0, min(max_chars // 4, max_chars - (first_end - first_start)))
+    if first_start - lead <= 0:
+        window_start = 0  # nothing would be cut, so no ellipsis either
+    else:
+        window_start = next((s for s, _, _ in spans if s >= first_start - lead), first_start)
+    window_end = window_start + max_chars
+    if window_end >= len(text):
+        window_end = len(text)
+    else:
+        window_end = max((e for _, e, _ in spans if window_start < e <= window_end), default=first_end)
+        window_end = max(window_end, first_end)
+
+    parts = [ELLIPSIS] if window_start > 0 else []
+    pos = window_start
+    for start, end, _ in matches:
+        if start < window_start or end > window_end:
+            continue
+        parts.append(_plain(text[pos:start]))
+        parts.append(f"<mark>{escape(text[start:end])}</mark>")
+        pos = end
+    parts.append(_plain(text[pos:window_end]))
+    if window_end < len(text):
+        parts.append(ELLIPSIS)
+    return "".join(parts).strip()
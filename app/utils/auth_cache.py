@@ -0,0 +1,154 @@
+"""
+Per-worker cache of authorization context for ``login_required`` and
+``admin_required``.
+
+Two things are memoized:
+
+* decoded JWT claims, per token, until ``AUTH_CACHE_TTL`` seconds pass or
+  the token's own ``exp`` arrives, whichever is first. Entries are only made
+  after the signature was verified, so the token string is a safe key.
+* whether a username is an admin, answered by an ``EXISTS`` on ``admins``
+  rather than loading every user and admin. Entries carry the ``admins``
+  table generation (see ``generations``); ``invalidate`` bumps it, so a
+  promotion, demotion or deletion in any worker is seen by all of them on
+  their next check. The TTL only bounds edits made outside the app.
+
+With ``JWT_CLAIMS_MODE=signed`` the decorators go further and trust the
+username and admin flag signed into the token, so an authenticated request
+needs no query at all. Revocation then rests on ``token_versions``: a
+compact ``user id -> token_version`` map of every user, reloaded every
+``TOKEN_VERSION_REFRESH`` seconds or as soon as the ``users`` generation
+moves. A token whose version is not the user's current one (or whose user
+is gone) is rejected.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional
+
+from sqlalchemy import exists, select
+
+from app.config.database import db_instance
+from app.models.user_management import Admin, User
+from app.utils.generations import TableGenerations, table_generations
+
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", 60))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 4096))
+
+# "db": load the user per request (default); "signed": trust the token's claims
+SIGNED_CLAIMS = os.getenv("JWT_CLAIMS_MODE", "db").strip().lower() == "signed"
+TOKEN_VERSION_REFRESH = float(os.getenv("TOKEN_VERSION_REFRESH", 30))
+
+ADMINS_TABLE = Admin.__tablename__
+USERS_TABLE = User.__tablename__
+
+
+class TokenUser(NamedTuple):
+    """``g.user`` in signed-claims mode, built from the token without a query."""
+    id: int
+    username: str
+    is_admin: bool
+
+
+class AuthContextCache:
+    """Memoized token claims and admin membership, bounded LRU per worker."""
+
+    def __init__(self, generations: TableGenerations, ttl: float = AUTH_CACHE_TTL,
+                 max_entries: int = AUTH_CACHE_SIZE):
+        self.generations = generations
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._claims: "OrderedDict[str, tuple]" = OrderedDict()
+        self._admins: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def _put(self, entries: OrderedDict, key, value):
+        with self._lock:
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def claims(self, token: str, decode: Callable[[str], dict]) -> dict:
+        """``decode(token)``, reused until the TTL or the token's ``exp`` runs out."""
+        now = time.time()
+        with self._lock:
+            entry = self._claims.get(token)
+            if entry is not None and entry[0] > now:
+                self._claims.move_to_end(token)
+                return entry[1]
+
+        payload = decode(token)  # raises for a bad or expired token; nothing is cached
+        expires_at = now + self.ttl
+        if isinstance(payload.get("exp"), (int, float)):
+            expires_at = min(expires_at, payload["exp"])
+        self._put(self._claims, token, (expires_at, payload))
+        return payload
+
+    def is_admin(self, username: Optional[str]) -> bool:
+        if not username:
+            return False
+        now = time.time()
+        # Read before querying: a change that lands meanwhile moves the generation on
+        generation = self.generations.current(ADMINS_TABLE)
+        with self._lock:
+            entry = self._admins.get(username)
+            if entry is not None and entry[0] == generation and entry[1] > now:
+                self._admins.move_to_end(username)
+                return entry[2]
+
+        admin = bool(db_instance.session.execute(
+            select(exists().where(Admin.username == username))
+        ).scalar())
+        self._put(self._admins, username, (generation, now + self.ttl, admin))
+        return admin
+
+    def invalidate(self):
+        """Forget admin membership here and in every other worker; call after the change commits."""
+        self.generations.bump(ADMINS_TABLE)
+        with self._lock:
+            self._admins.clear()
+
+
+auth_cache = AuthContextCache(table_generations)
+
+
+class TokenVersions:
+    """Current ``token_version`` of every user, shared by the threads of a worker."""
+
+    _MISSING = -1
+
+    def __init__(self, generations: TableGenerations, refresh: float = TOKEN_VERSION_REFRESH):
+        self.generations = generations
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._versions: Dict[int, int] = {}
+        self._generation = None
+        self._expires_at = 0.0
+
+    def current(self, user_id) -> Optional[int]:
+        """The user's token_version, or None if there is no such user."""
+        if not isinstance(user_id, int):
+            return None
+        generation = self.generations.current(USERS_TABLE)
+        with self._lock:
+            if generation != self._generation or time.monotonic() >= self._expires_at:
+                self._versions = dict(db_instance.session.execute(select(User.id, User.token_version)).all())
+                self._generation = generation
+                self._expires_at = time.monotonic() + self.refresh
+            version = self._versions.get(user_id)
+            if version is None:
+                # Created after the last load (or deleted): look once, remember until the next load
+                version = db_instance.session.execute(
+                    select(User.token_version).where(User.id == user_id)
+                ).scalar()
+                self._versions[user_id] = self._MISSING if version is None else version
+        return None if version == self._MISSING else version
+
+    def invalidate(self):
+        """Reload in every worker on the next check; call after users or their versions change."""
+        self.generations.bump(USERS_TABLE)
+
+
+token_versions = TokenVersions(table_generations)
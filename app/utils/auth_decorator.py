@@ -2,11 +2,13 @@ from functools import wraps
 from flask import g, jsonify, request, redirect, url_for, flash
 
 from app.services.user_manage_service import UserService
+from app.utils.auth_cache import SIGNED_CLAIMS, TokenUser, auth_cache, token_versions
+from app.utils.lazy import LazyService
 from app.utils.logger import setup_logger
 
 logger = setup_logger("auth_decorator")
 
-user_service = UserService()
+user_service = LazyService(UserService)
 
 
 # ------------------------------------------------------------
@@ -26,6 +28,27 @@ def _extract_token():
     return None
 
 
+# ------------------------------------------------------------
+# Helper: Current user from verified claims
+# ------------------------------------------------------------
+def _load_user(payload):
+    user_id = payload.get("user_id")
+    if not user_id:
+        raise Exception("Invalid token payload")
+
+    # Signed-claims mode: no user query, only the token_version check.
+    # Tokens issued before token_version existed fall back to the database.
+    if SIGNED_CLAIMS and "token_version" in payload:
+        if token_versions.current(user_id) != payload["token_version"]:
+            raise Exception("Token revoked")
+        return TokenUser(user_id, payload.get("username"), bool(payload.get("is_admin")))
+
+    user = user_service.get_user_by_id(user_id)
+    if not user:
+        raise Exception("User not found")
+    return user
+
+
 # ------------------------------------------------------------
 # LOGIN REQUIRED
 # ------------------------------------------------------------
@@ -48,13 +71,8 @@ def login_required(view_func):
             return redirect(url_for("auth.login"))
 
         try:
-            payload = user_service.decode_jwt_token(token)
-            user = user_service.get_user_by_id(payload.get("user_id"))
-
-            if not user:
-                raise Exception("User not found")
-
-            g.user = user
+            payload = auth_cache.claims(token, user_service.decode_jwt_token)
+            g.user = _load_user(payload)
 
         except Exception as e:
             logger.warning(f"Login check failed: {str(e)}")
@@ -93,31 +111,20 @@ def admin_required(route_function):
             return redirect(url_for("auth.login"))
 
         try:
-            payload = user_service.decode_jwt_token(token)
-            user_id = payload.get("user_id")
-
-            if not user_id:
-                raise Exception("Invalid token payload")
-
-            current_user = user_service.get_user_by_id(user_id)
-
-            if not current_user:
-                raise Exception("User not found")
-
-            g.user = current_user
+            payload = auth_cache.claims(token, user_service.decode_jwt_token)
+            g.user = _load_user(payload)
 
             # Special bypass for kagapa
             if g.user.username == "kagapa":
                 return route_function(*args, **kwargs)
 
-            # Normal admin check
-            admin_users = {
-                admin["username"]
-                for admin in user_service.get_all_users_with_admin_status()
-                if admin.get("is_admin")
-            }
+            # Normal admin check: the signed claim, or one cached EXISTS (see auth_cache)
+            if isinstance(g.user, TokenUser):
+                is_admin = g.user.is_admin
+            else:
+                is_admin = auth_cache.is_admin(g.user.username)
 
-            if g.user.username not in admin_users:
+            if not is_admin:
                 return jsonify({
                     "error": "forbidden",
                     "message": "Admin privileges required."
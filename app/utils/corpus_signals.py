@@ -0,0 +1,67 @@
+"""
+Corpus change notifications.
+
+Services queue a notification while they write and it is delivered only
+after the surrounding transaction commits; a rollback discards it. In-process
+structures derived from the corpus (search index, caches) subscribe to
+``corpus_changed`` instead of every service knowing about every consumer.
+"""
+import os
+
+from blinker import Namespace
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_signals = Namespace()
+
+# Sent with sender=<table name> and keyword arguments:
+#   upserted - list of row dicts (column -> value) that were inserted/updated
+#   deleted  - list of primary keys that were removed
+#   reset    - True when the change cannot be described row by row; a subscriber
+#              must drop what it derived from the table, not just schedule a refresh
+corpus_changed = _signals.signal("corpus-changed")
+
+_PENDING_KEY = "corpus_changed_pending"
+_COUNTS_KEY = "corpus_changed_counts"
+
+# Once more rows than this are queued for one table in a transaction, they are
+# dropped in favour of a single reset, so a bulk import does not keep a copy of
+# every row it wrote until commit
+NOTIFY_MAX_ROWS = int(os.getenv("NOTIFY_MAX_ROWS", 10000))
+_RESET_QUEUED = -1
+
+
+def row_snapshot(entry) -> dict:
+    """Plain dict of the mapped columns of ``entry`` (safe to use after commit)."""
+    return {col.key: getattr(entry, col.key) for col in entry.__table__.columns}
+
+
+def notify_after_commit(session, table: str, upserted=None, deleted=None, reset=False):
+    """Queue a ``corpus_changed`` notification for delivery after ``session`` commits."""
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    counts = session.info.setdefault(_COUNTS_KEY, {})
+    if counts.get(table) == _RESET_QUEUED:
+        return
+    upserted, deleted = list(upserted or []), list(deleted or [])
+    count = counts.get(table, 0) + len(upserted) + len(deleted)
+    if reset or count > NOTIFY_MAX_ROWS:
+        pending[:] = [entry for entry in pending if entry[0] != table]
+        pending.append((table, [], [], True))
+        counts[table] = _RESET_QUEUED
+        return
+    counts[table] = count
+    pending.append((table, upserted, deleted, False))
+
+
+@event.listens_for(Session, "after_commit")
+def _deliver_pending(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_COUNTS_KEY, None)
+    for table, upserted, deleted, reset in pending or []:
+        corpus_changed.send(table, upserted=upserted, deleted=deleted, reset=reset)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_COUNTS_KEY, None)
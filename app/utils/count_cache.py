@@ -0,0 +1,51 @@
+"""
+Cache of ``COUNT(*)`` results for paginated lists.
+
+A list endpoint asks for the total of the same filter on every page turn.
+Counts are cached per (tables, normalized filter) together with the
+generations of the tables the query reads (see ``generations``); a write to
+any of them, from any worker, makes the entry miss on its next lookup.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Hashable, Tuple
+
+from app.utils.generations import TableGenerations, table_generations
+
+COUNT_CACHE_SIZE = int(os.getenv("COUNT_CACHE_SIZE", 1024))
+
+
+class CountCache:
+    """Per-worker LRU of counts, validated against table generations."""
+
+    def __init__(self, generations: TableGenerations, max_entries: int = COUNT_CACHE_SIZE):
+        self.generations = generations
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+    def count(self, tables: Tuple[str, ...], key: Hashable, query) -> int:
+        """
+        Return ``query.count()``, reusing the cached value while none of
+        ``tables`` has been written since it was computed.
+        """
+        cache_key = (tables, key)
+        # Read before counting: a write that lands meanwhile changes the generation
+        generation = self.generations.current(*tables)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] == generation:
+                self._entries.move_to_end(cache_key)
+                return entry[1]
+
+        total = query.count()
+        with self._lock:
+            self._entries[cache_key] = (generation, total)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return total
+
+
+count_cache = CountCache(table_generations)
@@ -0,0 +1,80 @@
+"""
+Short-lived cache of successful password checks for service accounts.
+
+Ingest tools call ``/generate-token`` over and over with the same
+credentials, and each call costs a full bcrypt verification. For the
+usernames listed in ``SERVICE_ACCOUNTS`` (comma separated; empty disables
+the cache) a successful check is remembered for ``CREDENTIAL_CACHE_TTL``
+seconds, so repeats cost one HMAC instead.
+
+* Entries are keyed by an HMAC-SHA256 of (identifier, password) under a
+  random per-process key, so neither the password nor anything that can be
+  brute-forced offline is kept in memory.
+* The value is the user id plus the password hash the check succeeded
+  against. A hit is only honoured while the stored hash is still the user's
+  current one, so a password reset ends it immediately.
+* Failed checks are never cached.
+"""
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+SERVICE_ACCOUNTS = frozenset(
+    name.strip() for name in os.getenv("SERVICE_ACCOUNTS", "").split(",") if name.strip()
+)
+CREDENTIAL_CACHE_TTL = float(os.getenv("CREDENTIAL_CACHE_TTL", 300))
+CREDENTIAL_CACHE_SIZE = int(os.getenv("CREDENTIAL_CACHE_SIZE", 256))
+
+
+class CredentialCache:
+    """Per-worker LRU of verified (identifier, password) pairs, bounded in size and age."""
+
+    def __init__(self, accounts=SERVICE_ACCOUNTS, ttl: float = CREDENTIAL_CACHE_TTL,
+                 max_entries: int = CREDENTIAL_CACHE_SIZE):
+        self.accounts = frozenset(accounts)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._key = os.urandom(32)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+    def _digest(self, identifier: str, password: str) -> bytes:
+        message = identifier.encode("utf-8") + b"\0" + password.encode("utf-8")
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+    def get(self, identifier: str, password: str) -> Optional[Tuple[int, str]]:
+        """(user id, password hash) of an earlier successful check, or None."""
+        if not self.accounts:
+            return None
+        digest = self._digest(identifier, password)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return entry[1], entry[2]
+
+    def put(self, identifier: str, password: str, username: str, user_id: int, password_hash: str):
+        """Remember a successful check; ignored unless ``username`` is a service account."""
+        if username not in self.accounts:
+            return
+        digest = self._digest(identifier, password)
+        with self._lock:
+            self._entries[digest] = (time.monotonic() + self.ttl, user_id, password_hash)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+credential_cache = CredentialCache()
@@ -0,0 +1,78 @@
+"""
+Streaming reader for CSV uploads.
+
+The upload is decoded incrementally through a ``TextIOWrapper`` over the
+werkzeug stream and handed out in batches of (row number, row) pairs, so an
+importer holds one batch at a time instead of the whole file as bytes, text
+and parsed rows.
+"""
+import csv
+import io
+import os
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+CSV_BATCH_SIZE = int(os.getenv("CSV_BATCH_SIZE", 1000))
+
+
+class ImportCancelled(Exception):
+    """
+    Raised by an importer's ``progress`` callback to stop the import. An
+    importer that commits per batch sets ``committed`` to the records it kept.
+    """
+    committed = 0
+
+
+class CsvBatchReader:
+    """
+    Read a binary CSV upload (a werkzeug ``FileStorage`` or its stream) as
+    batches of rows keyed by the stripped header names.
+
+    Use as a context manager; leaving it detaches the decoder without closing
+    the underlying stream. Decoding errors surface as ``UnicodeDecodeError``
+    from ``fieldnames`` or ``batches`` when the offending bytes are reached.
+    """
+
+    def __init__(self, file_stream, batch_size: int = CSV_BATCH_SIZE, encoding: str = "utf-8-sig"):
+        self.batch_size = batch_size
+        self._text = io.TextIOWrapper(_binary_stream(file_stream), encoding=encoding, newline="")
+        self._reader = csv.DictReader(self._text)
+        self._fieldnames: Optional[List[str]] = None
+
+    def __enter__(self) -> "CsvBatchReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._text is not None:
+            self._text.detach()
+            self._text = None
+
+    @property
+    def fieldnames(self) -> List[str]:
+        """Stripped header names; empty if the file has no header row."""
+        if self._fieldnames is None:
+            raw = self._reader.fieldnames or []
+            self._fieldnames = [name.strip() for name in raw]
+            self._reader.fieldnames = self._fieldnames if raw else None
+        return self._fieldnames
+
+    def missing_columns(self, required: Iterable[str]) -> Set[str]:
+        return set(required) - set(self.fieldnames)
+
+    def batches(self, start: int = 1) -> Iterator[List[Tuple[int, dict]]]:
+        """Yield lists of (row number, row) with row numbers counted from ``start``."""
+        self.fieldnames  # noqa: B018  (strip the header before the first row is read)
+        batch = []
+        for i, row in enumerate(self._reader, start):
+            batch.append((i, row))
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _binary_stream(file_stream):
+    return getattr(file_stream, "stream", file_stream)
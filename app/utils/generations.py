@@ -0,0 +1,73 @@
+"""
+Per-table write generations shared by all workers.
+
+Each table has a small file under ``GENERATIONS_DIR`` that grows by one byte
+on every committed write (see ``corpus_changed``). The file's (inode, size)
+is the table's generation: an ``O_APPEND`` write is atomic across processes
+and reading it back is a single ``stat``, so any worker can tell cheaply
+whether a table changed since it cached something derived from it, whichever
+worker made the change.
+"""
+import os
+from typing import Tuple
+
+from app.utils.corpus_signals import corpus_changed
+from app.utils.logger import setup_logger
+
+GENERATIONS_DIR = os.getenv("GENERATIONS_DIR", "generations")
+# A file is replaced by a fresh one (new inode) once it reaches this size
+_MAX_SIZE = 1024 * 1024
+
+Generation = Tuple[int, int]  # (inode, size) of the table's file; (0, 0) before the first write
+
+
+class TableGenerations:
+    """Read and bump the generation of each table."""
+
+    def __init__(self, directory: str = GENERATIONS_DIR):
+        self.directory = directory
+        self.logger = setup_logger("generations", "generations.log")
+
+    def _path(self, table: str) -> str:
+        return os.path.join(self.directory, f"{table}.gen")
+
+    def current(self, *tables: str) -> Tuple[Generation, ...]:
+        """Generation of each of ``tables``; compare snapshots for equality only."""
+        snapshot = []
+        for table in tables:
+            try:
+                st = os.stat(self._path(table))
+                snapshot.append((st.st_ino, st.st_size))
+            except FileNotFoundError:
+                snapshot.append((0, 0))
+        return tuple(snapshot)
+
+    def bump(self, table: str):
+        path = self._path(table)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, b".")
+                size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+            if size >= _MAX_SIZE:
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(b".")
+                os.replace(tmp_path, path)
+        except OSError as e:
+            # Caches keyed on this table may serve stale values until the next bump
+            self.logger.error(f"Failed to bump generation of {table}: {e}", exc_info=True)
+
+    def on_corpus_changed(self, sender, **_):
+        self.bump(sender)
+
+
+table_generations = TableGenerations()
+corpus_changed.connect(table_generations.on_corpus_changed, sender="tatvapada")
+corpus_changed.connect(table_generations.on_corpus_changed, sender="paribhashika_padavivarana")
+corpus_changed.connect(table_generations.on_corpus_changed, sender="arthakosha")
+corpus_changed.connect(table_generations.on_corpus_changed, sender="tatvapada_author_info")
+corpus_changed.connect(table_generations.on_corpus_changed, sender="sampadakar_documents")
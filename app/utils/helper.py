@@ -2,9 +2,7 @@ import os
 import secrets
 from dotenv import load_dotenv
 
-def kannada_to_english_digits(text: str) -> str:
-    kn_to_en = str.maketrans("೦೧೨೩೪೫೬೭೮೯", "0123456789")
-    return text.translate(kn_to_en)
+from app.text import kannada_to_english_digits  # noqa: F401  (re-exported for routes)
 
 
 ENV_FILE = ".env"
@@ -0,0 +1,53 @@
+"""
+Conditional GET for the read-only corpus endpoints.
+
+``conditional_get(*tables)`` gives a GET view a strong ETag derived from the
+generations of the tables its response is built from (see ``generations``)
+and the request path and query string. A request whose ``If-None-Match``
+holds the current tag gets an empty 304 without running the view; a fresh
+200 carries the tag and ``Cache-Control: public, no-cache``, so browsers and
+the nginx front revalidate instead of downloading the body again.
+
+Tags only change when one of the tables is written, so a deploy that changes
+what an endpoint returns should also change ``ETAG_SALT``.
+"""
+import hashlib
+import os
+from functools import wraps
+from typing import Tuple
+
+from flask import current_app, make_response, request
+
+from app.utils.generations import table_generations
+
+ETAG_SALT = os.getenv("ETAG_SALT", "")
+PUBLIC_CACHE_CONTROL = "public, no-cache"
+
+
+def version_etag(tables: Tuple[str, ...]) -> str:
+    """Strong ETag of the current request against the current generation of ``tables``."""
+    generation = table_generations.current(*tables)
+    raw = f"{ETAG_SALT}|{request.full_path}|{generation}"
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def conditional_get(*tables: str):
+    """Decorate a GET view whose 200 response depends only on the rows of ``tables``."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Read before the view runs: a write that lands meanwhile changes the tag
+            etag = version_etag(tables)
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = PUBLIC_CACHE_CONTROL
+            return response
+
+        return wrapper
+
+    return decorator
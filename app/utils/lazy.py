@@ -0,0 +1,41 @@
+"""
+Lazily constructed module-level services.
+
+Route modules keep one service instance each (``user_service = ...``).
+Building them at import time opens log files, creates SDK clients and so on
+before a request ever needs them. ``LazyService(UserService)`` stands in for
+the instance and builds it on first attribute access, once per process.
+"""
+import threading
+from typing import Any, Callable
+
+
+class LazyService:
+    """Proxy that calls ``factory(*args, **kwargs)`` on first use and forwards to the result."""
+
+    def __init__(self, factory: Callable[..., Any], *args, **kwargs):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_args", (args, kwargs))
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _get(self):
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    args, kwargs = self._args
+                    instance = self._factory(*args, **kwargs)
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._get(), name, value)
+
+    def __repr__(self):
+        state = "built" if self._instance is not None else "not built"
+        return f"<LazyService {getattr(self._factory, '__name__', self._factory)} ({state})>"
@@ -6,6 +6,17 @@ from logging.handlers import RotatingFileHandler
 from datetime import datetime
 
 
+class _LazyRotatingFileHandler(RotatingFileHandler):
+    """Creates the log folder and opens the file on the first record, not at setup."""
+
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, delay=True, **kwargs)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
 def setup_logger(name: str, log_file: str = None, level=logging.DEBUG) -> logging.Logger:
     """
     Sets up a logger that writes all logs to file and only info/warnings/errors to console.
@@ -18,7 +29,6 @@ def setup_logger(name: str, log_file: str = None, level=logging.DEBUG) -> loggin
     # Date-based folder: logs/dd-mm-yyyy/
     today_str = datetime.now().strftime("%d-%m-%Y")
     log_dir = os.path.join("logs", today_str)
-    os.makedirs(log_dir, exist_ok=True)
 
     # Log file path
     log_file = log_file or f"{name}.log"
@@ -35,8 +45,8 @@ def setup_logger(name: str, log_file: str = None, level=logging.DEBUG) -> loggin
     # Formatter
     formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s", "%Y-%m-%d %H:%M:%S")
 
-    # File handler — accepts DEBUG and above
-    file_handler = RotatingFileHandler(log_path, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8")
+    # File handler — accepts DEBUG and above; nothing touches the disk until the first record
+    file_handler = _LazyRotatingFileHandler(log_path, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8")
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
 
@@ -5,7 +5,17 @@ from datetime import datetime
 # Create dated log folder
 today = datetime.now().strftime("%Y-%m-%d")
 LOG_DIR = os.path.join("logs", today)
-os.makedirs(LOG_DIR, exist_ok=True)
+
+
+class _LazyFileHandler(logging.FileHandler):
+    """Creates LOG_DIR and opens the file on the first record, not at import."""
+
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, delay=True, **kwargs)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
 
 def get_logger(name: str):
     """
@@ -23,7 +33,7 @@ def get_logger(name: str):
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
     # File handler with UTF-8 encoding
-    file_handler = logging.FileHandler(f"{LOG_DIR}/{name}.log", encoding="utf-8")
+    file_handler = _LazyFileHandler(f"{LOG_DIR}/{name}.log", encoding="utf-8")
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
 
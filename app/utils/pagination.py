@@ -0,0 +1,106 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token holding the sort key of the last row of
+a page. The next page is fetched with a seek predicate on that key
+(``WHERE (a, b) > (:a, :b) ORDER BY a, b LIMIT n``), which the database answers
+from the index instead of reading and discarding ``OFFSET`` rows. Fetching
+``limit + 1`` rows tells whether another page exists without a ``COUNT``.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+
+_DATETIME_TAG = "$dt"
+
+
+def _encode_value(value: Any):
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any):
+    if isinstance(value, dict) and set(value) == {_DATETIME_TAG}:
+        return datetime.fromisoformat(value[_DATETIME_TAG])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque token for the sort key ``values`` of a row."""
+    data = json.dumps([_encode_value(v) for v in values], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> List[Any]:
+    """Sort key from ``encode_cursor``; raises ValueError if the token is malformed."""
+    try:
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(data.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    try:
+        return [_decode_value(v) for v in values]
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+def bool_arg(value: Optional[str], default: bool = True) -> bool:
+    """Parse a query-string flag such as ``include_total=false``."""
+    if value is None or value == "":
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off")
+
+
+def seek_after(columns: Sequence, values: Sequence[Any], descending: bool = False):
+    """
+    Predicate for rows strictly after ``values`` in ``ORDER BY columns``.
+
+    Expanded to ``a > :a OR (a = :a AND b > :b) ...`` rather than a row-value
+    comparison, which MySQL does not always turn into an index range scan.
+    """
+    clauses = []
+    for i, column in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        step = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal, step))
+    return or_(*clauses)
+
+
+def keyset_page(
+        query,
+        columns: Sequence,
+        limit: int,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        descending: bool = False,
+        key: Optional[Callable[[Any], Sequence[Any]]] = None,
+) -> Tuple[list, Optional[str]]:
+    """
+    Return (rows, next cursor) for the page of ``query`` after ``cursor``, or
+    at ``offset`` when no cursor is given (old clients and jump-to-page).
+
+    ``columns`` must make the order unique (a unique key or ending with the
+    primary key). ``key``
+    extracts their values from a result row; by default the row attributes
+    named after the columns are used. The next cursor is None on the last page.
+    """
+    if cursor:
+        query = query.filter(seek_after(columns, decode_cursor(cursor, len(columns)), descending))
+    order = [column.desc() for column in columns] if descending else list(columns)
+    query = query.order_by(*order)
+    if not cursor and offset:
+        query = query.offset(offset)
+    rows = query.limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    values = key(last) if key else [getattr(last, column.key) for column in columns]
+    return rows, encode_cursor(values)
@@ -0,0 +1,103 @@
+"""
+Read-through cache of serialized verse responses.
+
+Verse texts almost never change, but every verse view used to hit the
+database and serialize the row again. Entries are the final JSON bodies,
+kept in an LRU bounded by total size in bytes and by age (``ttl``). Each
+entry also records the generations of the tables it was built from (see
+``generations``), so an update or delete committed by any worker makes it
+miss on the next lookup.
+"""
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from flask import current_app
+
+from app.utils.generations import TableGenerations, table_generations
+
+VERSE_CACHE_MAX_BYTES = int(os.getenv("VERSE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+VERSE_CACHE_TTL = int(os.getenv("VERSE_CACHE_TTL", 3600))
+
+# Rough per-entry bookkeeping cost, so that many tiny (e.g. "not found") entries still count
+_ENTRY_OVERHEAD = 200
+
+
+class ReadThroughCache:
+    """Per-worker LRU of JSON bodies with byte and age limits and hit/miss counters."""
+
+    def __init__(
+            self,
+            tables: Tuple[str, ...],
+            generations: TableGenerations = table_generations,
+            max_bytes: int = VERSE_CACHE_MAX_BYTES,
+            ttl: int = VERSE_CACHE_TTL,
+    ):
+        self.tables = tables
+        self.generations = generations
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (generation, expires_at, body or None, size)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get_json(self, key: Hashable, load: Callable[[], Optional[dict]]) -> Optional[str]:
+        """
+        Return the JSON body cached for ``key``, or call ``load`` and cache its
+        serialized result. ``load`` returning None ("not found") is cached too.
+        """
+        generation = self.generations.current(*self.tables)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        data = load()
+        body = None if data is None else current_app.json.dumps(data)
+        self._store(key, (generation, now + self.ttl, body))
+        return body
+
+    def _store(self, key: Hashable, entry: tuple):
+        size = _ENTRY_OVERHEAD + (sys.getsizeof(entry[2]) if entry[2] else 0)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[3]
+            self._entries[key] = entry + (size,)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[3]
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Verse bodies include the author name, so author renames/deletes invalidate them too
+verse_cache = ReadThroughCache(("tatvapada", "tatvapada_author_info"))
@@ -0,0 +1,173 @@
+"""
+Benchmark for tatvapada_extractorv2.parse_document against the backwards /
+forwards scanning parser it replaced.
+
+    python benchmarks/extract_parse_document.py [--paragraphs 100000] [--repeat 3]
+
+Builds a synthetic samputa of ``--paragraphs`` paragraphs (authors, vibhag
+headings, numbered verses with ``||`` lines, bhavanuvada blocks, blank and
+repeated refrain lines), checks that both parsers agree, and prints the best
+of ``--repeat`` runs at 1/4, 1/2 and the full size. Linear scaling shows up
+as a flat time per paragraph.
+"""
+import argparse
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))  # project root, for app.text
+sys.path.append(str(ROOT / "tatvapada_Extraction"))
+from tatvapada_extractorv2 import (  # noqa: E402
+    SAMPUTA_RE, VERSE_HEADER_RE, is_author_name, kannada_to_number, parse_document, valid_heading_line,
+)
+
+
+# The parser before the single-pass rewrite
+def legacy_heading_lines_before_verse(paras, verse_index):
+    heading_lines = []
+    j = verse_index - 1
+    while j >= 0 and len(heading_lines) < 2:
+        line = paras[j].strip()
+        if not line:
+            j -= 1
+            continue
+        if valid_heading_line(line):
+            heading_lines.insert(0, line)
+        else:
+            break
+        j -= 1
+    return heading_lines
+
+
+def legacy_parse_document(paras):
+    if not paras:
+        return []
+
+    samputa_sankhye, tatvapadakosha_sheershike = "-", "-"
+    samputa_index = -1
+    for i, p in enumerate(paras):
+        if p.lower().startswith("ಸಂಪುಟ"):
+            m = SAMPUTA_RE.match(p)
+            if m:
+                samputa_sankhye = kannada_to_number(m.group(1)) or m.group(1)
+                samputa_index = i
+                break
+    for j in range(samputa_index + 1, len(paras)):
+        if paras[j]:
+            tatvapadakosha_sheershike = paras[j]
+            break
+    current_author = "-"
+    for p in paras:
+        if is_author_name(p):
+            current_author = p
+            break
+
+    last_vibhag = "-"
+    author_verse_counter = 0
+    entries = []
+    i = 0
+    while i < len(paras):
+        line = paras[i]
+        if not VERSE_HEADER_RE.match(line):
+            i += 1
+            continue
+
+        detected_author = detected_vibhag = None
+        for hl in legacy_heading_lines_before_verse(paras, i):
+            if is_author_name(hl):
+                detected_author = hl
+            else:
+                detected_vibhag = hl
+        if detected_author and detected_author != tatvapadakosha_sheershike:
+            if detected_author != current_author:
+                current_author = detected_author
+                author_verse_counter = 0
+        author_verse_counter += 1
+        if detected_vibhag and not is_author_name(detected_vibhag):
+            last_vibhag = detected_vibhag
+
+        block = []
+        k = i + 1
+        while k < len(paras) and not VERSE_HEADER_RE.match(paras[k]):
+            block.append(paras[k])
+            k += 1
+        bhavanuvada = "-"
+        if k < len(paras) and VERSE_HEADER_RE.match(paras[k]):
+            after_num = re.sub(r"^[೦-೯0-9]+[.(]?\s*", "", paras[k]).strip()
+            if re.match(r"^(ಕನ್ನಡ\s*)?ಭಾವಾನುವಾದ\s*[:：]", after_num):
+                bhava_block = []
+                k2 = k + 1
+                while k2 < len(paras) and not VERSE_HEADER_RE.match(paras[k2]):
+                    bhava_block.append(paras[k2])
+                    k2 += 1
+                bhavanuvada = re.sub(r"[:：]\s*", " ", after_num).strip()
+                if bhava_block:
+                    bhavanuvada += "\n" + "\n".join(bhava_block)
+                k = k2
+
+        entries.append({
+            "samputa_sankhye": samputa_sankhye,
+            "tatvapadakosha_sheershike": tatvapadakosha_sheershike,
+            "tatvapadakarara_hesaru": current_author,
+            "vibhag": last_vibhag or "-",
+            "tatvapada_sheershike": re.sub(r"^[೦-೯0-9]+[.(]?\s*", "", line),
+            "tatvapada_sankhye": str(author_verse_counter),
+            "tatvapada_first_line": block[0].strip() if block else "-",
+            "tatvapada": "\n".join(block).strip() or "-",
+            "bhavanuvada": bhavanuvada,
+            "klishta_padagalu_artha": "-",
+            "tippani": "-",
+        })
+        i = k
+    return entries
+
+
+def make_document(count, seed=11):
+    rng = random.Random(seed)
+    digits = str.maketrans("0123456789", "೦೧೨೩೪೫೬೭೮೯")
+    words = ["ಗುರು", "ಶಿವ", "ಮನವೆ", "ಬೆಳಗು", "ಅರಿವು", "ಜ್ಞಾನ", "ಸತ್ಯ", "ದೇಹ", "ಆತ್ಮ", "ನಾದ"]
+
+    def line(n):
+        return " ".join(rng.choice(words) for _ in range(n))
+
+    paras = ["ಸಂಪುಟ - ೫", "ತತ್ವಪದ ಸಂಪುಟ"]
+    author = verse = 0
+    while len(paras) < count:
+        if rng.random() < 0.02:
+            author += 1
+            verse = 0
+            paras.append(f"ಕವಿ{author} ತತ್ವಪದಗಳು")
+        if rng.random() < 0.1:
+            paras.append(line(2))  # vibhag heading
+        verse += 1
+        paras.append(f"{verse}. {line(3)}".translate(digits))
+        for _ in range(rng.randint(4, 16)):
+            paras.append(rng.choice(["", "|| ಪಲ್ಲವಿ ||", f"{line(6)} ||"]))
+        if rng.random() < 0.2:
+            paras.append(f"{verse + 1}. ಕನ್ನಡ ಭಾವಾನುವಾದ: {line(2)}".translate(digits))
+            paras.extend(line(8) for _ in range(rng.randint(1, 4)))
+    return paras[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    full = make_document(args.paragraphs)
+    assert parse_document(full) == legacy_parse_document(full)
+
+    print(f"{len(full)} paragraphs, {len(parse_document(full))} verses, best of {args.repeat}")
+    for size in (len(full) // 4, len(full) // 2, len(full)):
+        paras = full[:size]
+        for name, fn in (("legacy", legacy_parse_document), ("single pass", parse_document)):
+            best = min(timeit.repeat(lambda: fn(paras), number=1, repeat=args.repeat))
+            print(f"  {name:<12} {size:>8} paragraphs {best * 1000:8.1f} ms  {best / size * 1e6:6.2f} us/paragraph")
+
+
+if __name__ == "__main__":
+    main()
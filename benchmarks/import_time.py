@@ -0,0 +1,78 @@
+"""
+Import-time benchmark for the web app's cold start.
+
+    python benchmarks/import_time.py [--repeat 5] [--top 8]
+
+Every case runs in a fresh interpreter under ``python -X importtime``:
+
+* ``models``      what a CLI script pays to import the models
+* ``factory``     ``from app import create_app``
+* ``create_app``  building the app, i.e. one gunicorn worker's start
+* ``payment``     building the app and the first Cashfree request's service
+
+For each case it prints the best wall time of ``--repeat`` runs, the total
+import time reported by ``-X importtime``, and the ``--top`` slowest
+modules (self time) of the last run. Run it before and after a change that
+touches imports; the default SECRET_KEY only lets the config load.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CASES = [
+    ("models", "import app.models"),
+    ("factory", "from app import create_app"),
+    ("create_app", "from app import create_app; create_app()"),
+    ("payment", "from app import create_app; create_app()\n"
+                "from app.routes.payment_routes import payment_service; payment_service.client"),
+]
+
+
+def run(statement, cwd, env):
+    """(wall seconds, [(self us, cumulative us, module)]) of one interpreter run."""
+    code = f"import sys; sys.path.insert(0, {str(ROOT)!r})\n{statement}"
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=cwd, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    if result.returncode:
+        raise SystemExit(f"{statement!r} failed:\n{result.stderr[-2000:]}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append((int(self_us), int(cumulative_us), name.strip()))
+    return wall, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "import-time-benchmark")
+    with tempfile.TemporaryDirectory() as cwd:  # keeps logs/ and indexes out of the tree
+        print(f"best of {args.repeat} fresh interpreters")
+        for name, statement in CASES:
+            runs = [run(statement, cwd, env) for _ in range(args.repeat)]
+            wall = min(r[0] for r in runs)
+            modules = runs[-1][1]
+            total = sum(m[0] for m in modules)
+            print(f"  {name:<11} {wall * 1000:8.1f} ms wall  {total / 1000:8.1f} ms importing  "
+                  f"{len(modules):5} modules")
+            for self_us, _, module in sorted(modules, reverse=True)[: args.top]:
+                print(f"      {self_us / 1000:7.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
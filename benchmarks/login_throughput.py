@@ -0,0 +1,61 @@
+"""
+Login throughput per core: bcrypt verification at several work factors
+against a credential cache hit.
+
+    python benchmarks/login_throughput.py [--rounds 10 11 12] [--seconds 2]
+
+Each case runs single-threaded for about ``--seconds`` seconds, so the
+logins/s column is what one worker core sustains. Choose BCRYPT_LOG_ROUNDS
+from the bcrypt rows; the cache row is what a SERVICE_ACCOUNTS login costs
+while it is cached (the one primary-key lookup it also does is not counted).
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from flask_bcrypt import Bcrypt
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # project root, for app.utils
+from app.utils.credential_cache import CredentialCache
+
+
+def throughput(fn, seconds):
+    fn()  # warm up
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds:
+            return calls / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    bcrypt = Bcrypt()
+    password = "service-account-password"
+
+    cache = CredentialCache(accounts={"ingest"}, ttl=3600)
+    cache.put("ingest", password, "ingest", 1, "hash")
+    assert cache.get("ingest", password) == (1, "hash")
+    assert cache.get("ingest", password + "x") is None
+
+    print(f"single thread, about {args.seconds:g}s per case")
+    for rounds in args.rounds:
+        password_hash = bcrypt.generate_password_hash(password, rounds).decode("utf-8")
+        assert bcrypt.check_password_hash(password_hash, password)
+        rate = throughput(lambda: bcrypt.check_password_hash(password_hash, password), args.seconds)
+        print(f"  bcrypt cost {rounds:<2}        {rate:12,.1f} logins/s  {1000 / rate:9.3f} ms/login")
+
+    rate = throughput(lambda: cache.get("ingest", password), args.seconds)
+    print(f"  credential cache hit  {rate:12,.1f} logins/s  {1000 / rate:9.3f} ms/login")
+
+
+if __name__ == "__main__":
+    main()
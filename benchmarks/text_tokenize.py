@@ -0,0 +1,87 @@
+"""
+Micro-benchmark for app.text against the per-call regex code it replaced.
+
+    python benchmarks/text_tokenize.py [--verses 20000] [--repeat 5]
+
+Prints the best of ``--repeat`` runs for each variant over synthetic verses
+(Kannada syllables with digits, danda, ``||``, ZWNJ/ZWSP and punctuation).
+"""
+import argparse
+import random
+import re
+import sys
+import timeit
+import unicodedata
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # project root, for app.text
+from app.text import normalize_para, tokenize, tokenize_batch
+
+# The search tokenizer and extractor helper before app.text
+_LEGACY_SEPARATOR_RE = re.compile(
+    r"[\s!-/:-@\[-`{-~\u00a0-\u00bf\u0964\u0965\u200b\u200c\u2010-\u206f\ufeff]+"
+)
+_LEGACY_ZERO_WIDTH_RE = re.compile(r"[\u200b-\u200d\uFEFF]")
+
+
+def legacy_tokenize(text):
+    text = unicodedata.normalize("NFC", text).casefold()
+    return [tok for tok in _LEGACY_SEPARATOR_RE.split(text) if tok]
+
+
+def legacy_normalize_para(text):
+    return unicodedata.normalize("NFC", _LEGACY_ZERO_WIDTH_RE.sub("", text).strip())
+
+
+def make_verses(count, seed=7):
+    rng = random.Random(seed)
+    consonants = [chr(c) for c in range(0x0C95, 0x0CB9) if unicodedata.category(chr(c)) == "Lo"]
+    signs = ["", "\u0cbe", "\u0cbf", "\u0cc0", "\u0cc1", "\u0cc2", "\u0cc6", "\u0cc7", "\u0cca", "\u0ccb",
+             "\u0c82", "\u0ccd"]
+    breaks = [" ", " ", " ", ", ", " \u0964 ", " \u0965 ", " || ", "\u200c", "\u200b", "\n"]
+
+    def word():
+        return "".join(rng.choice(consonants) + rng.choice(signs) for _ in range(rng.randint(1, 5)))
+
+    verses = []
+    for _ in range(count):
+        parts = [f"{rng.randint(1, 999)}".translate(str.maketrans("0123456789", "೦೧೨೩೪೫೬೭೮೯")), ". "]
+        for _ in range(rng.randint(20, 80)):
+            parts.append(word())
+            parts.append(rng.choice(breaks))
+        verses.append("".join(parts))
+    return verses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--verses", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    verses = make_verses(args.verses)
+    # Short inputs (headwords, titles) are where the batch API pays off
+    words = [word for verse in verses for word in verse.split()][: args.verses * 10]
+    assert tokenize_batch(verses) == [tokenize(v) for v in verses]
+    assert tokenize_batch(words) == [tokenize(w) for w in words]
+
+    cases = [
+        ("tokenize (legacy regex)", lambda: [legacy_tokenize(v) for v in verses]),
+        ("tokenize", lambda: [tokenize(v) for v in verses]),
+        ("tokenize_batch", lambda: tokenize_batch(verses)),
+        ("tokenize words (legacy regex)", lambda: [legacy_tokenize(w) for w in words]),
+        ("tokenize words", lambda: [tokenize(w) for w in words]),
+        ("tokenize_batch words", lambda: tokenize_batch(words)),
+        ("normalize_para (legacy regex)", lambda: [legacy_normalize_para(v) for v in verses]),
+        ("normalize_para", lambda: [normalize_para(v) for v in verses]),
+    ]
+    chars = sum(map(len, verses))
+    print(f"{len(verses)} verses ({chars / 1e6:.1f}M characters), {len(words)} words, best of {args.repeat}")
+    for name, fn in cases:
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        items = len(words) if "words" in name else len(verses)
+        print(f"  {name:<32} {best * 1000:8.1f} ms  {items / best:12,.0f} items/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+gunicorn settings, read by ``python serve.py`` (or ``gunicorn -c gunicorn.conf.py wsgi:app``).
+
+Every value comes from the environment:
+
+    HOST / PORT             bind address (0.0.0.0:8443)
+    WEB_WORKERS             worker processes (CPU count)
+    WEB_THREADS             request threads per worker (4); also sizes the DB pool
+                            (with IMPORT_JOB_WORKERS, see app/config/database.py)
+    WEB_KEEPALIVE           seconds an idle keep-alive connection is held (5)
+    WEB_TIMEOUT             seconds before a silent worker is restarted (120; CSV imports)
+    WEB_GRACEFUL_TIMEOUT    seconds a worker gets to finish requests on reload/stop (30)
+    WEB_MAX_REQUESTS        recycle a worker after this many requests (0 = never)
+    SSL_CERTFILE / SSL_KEYFILE  serve HTTPS directly
+
+Graceful reload: ``kill -HUP <master pid>`` starts new workers with the
+current code and lets the old ones finish their requests.
+"""
+import multiprocessing
+import os
+import subprocess
+import sys
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8443')}"
+workers = int(os.getenv("WEB_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.getenv("WEB_THREADS", 4))
+worker_class = "gthread"
+keepalive = int(os.getenv("WEB_KEEPALIVE", 5))
+timeout = int(os.getenv("WEB_TIMEOUT", 120))
+graceful_timeout = int(os.getenv("WEB_GRACEFUL_TIMEOUT", 30))
+max_requests = int(os.getenv("WEB_MAX_REQUESTS", 0))
+max_requests_jitter = max_requests // 10
+
+# Workers import wsgi.py themselves, so each one has its own app, DB pool and
+# caches, and a HUP reload picks up new code.
+preload_app = False
+
+certfile = os.getenv("SSL_CERTFILE") or None
+keyfile = os.getenv("SSL_KEYFILE") or None
+
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    # Once per start, in the master, before any worker. A separate interpreter
+    # keeps the app's modules out of the master (see preload_app).
+    subprocess.run([sys.executable, "-m", "app.startup"], check=True,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
@@ -6,6 +6,7 @@ from flask import Flask
 from sqlalchemy import create_engine, text, inspect
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.utils.generations import GENERATIONS_DIR, table_generations
 from app.utils.logger import setup_logger
 
 # Initialize logger
@@ -26,6 +27,7 @@ ROOT_URI = f"mysql+pymysql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/"
 DATABASE_URI = f"{ROOT_URI}{DB_NAME}?charset=utf8mb4"
 
 MIGRATIONS_DIR = "migrations/versions"
+SEARCH_INDEX_DIR = os.getenv("SEARCH_INDEX_DIR", "search_index")
 
 
 def print_db_config():
@@ -53,6 +55,32 @@ def list_tables():
     return insp.get_table_names()
 
 
+def clear_search_index():
+    """The on-disk search index mirrors the tatvapada table; drop it with the data."""
+    if os.path.exists(SEARCH_INDEX_DIR):
+        try:
+            shutil.rmtree(SEARCH_INDEX_DIR)
+            logger.info(f"Deleted search index directory: {SEARCH_INDEX_DIR}")
+        except Exception as e:
+            logger.error(f"Failed to delete search index directory: {e}")
+
+
+def bump_generations(tables, all_tables=False):
+    """
+    ETags are derived from the table generations, so give every dropped table
+    a new one; otherwise a client revalidating a page of deleted data gets a
+    304. Bumping, not deleting, the files keeps a recreated file from landing
+    on an old (inode, size) pair. ``all_tables`` also bumps every table that
+    has a generation file (full reset).
+    """
+    tables = set(tables)
+    if all_tables and os.path.isdir(GENERATIONS_DIR):
+        tables.update(name[:-len(".gen")] for name in os.listdir(GENERATIONS_DIR) if name.endswith(".gen"))
+    for table in sorted(tables):
+        table_generations.bump(table)
+    logger.info(f"Bumped table generations: {', '.join(sorted(tables)) or 'none'}")
+
+
 def reset_database():
     print_db_config()
     print("\nWarning: Make sure the application is not running before continuing.")
@@ -96,6 +124,12 @@ def reset_database():
                 logger.error(f"Failed to delete migrations directory: {e}")
                 return
 
+        try:
+            existing_tables = list_tables()
+        except Exception as e:
+            logger.warning(f"Could not fetch tables before the drop: {e}")
+            existing_tables = []
+
         # Drop database
         try:
             engine = create_engine(ROOT_URI)
@@ -103,6 +137,8 @@ def reset_database():
                 conn.execute(text(f"DROP DATABASE IF EXISTS `{DB_NAME}`;"))
             logger.info(f"Database '{DB_NAME}' dropped successfully.")
             print("Database dropped successfully.")
+            clear_search_index()
+            bump_generations(existing_tables, all_tables=True)
         except SQLAlchemyError as e:
             logger.error(f"Error during database drop: {e}")
             return
@@ -132,10 +168,12 @@ def reset_database():
         engine = create_engine(DATABASE_URI)
         with engine.connect() as conn:
 
+            dropped = []
             if str(len(tables) + 1) in selected:
                 for tbl in tables:
                     try:
                         conn.execute(text(f"DROP TABLE IF EXISTS `{tbl}`;"))
+                        dropped.append(tbl)
                         logger.info(f"Dropped table {tbl}")
                     except Exception as e:
                         logger.error(f"Failed to drop table {tbl}: {e}")
@@ -144,10 +182,14 @@ def reset_database():
                     try:
                         tbl = tables[int(idx) - 1]
                         conn.execute(text(f"DROP TABLE IF EXISTS `{tbl}`;"))
+                        dropped.append(tbl)
                         logger.info(f"Dropped table {tbl}")
                     except Exception as e:
                         logger.error(f"Failed to drop table: {e}")
 
+        if "tatvapada" in dropped:
+            clear_search_index()
+        bump_generations(dropped)
         print("Selected table(s) dropped successfully.")
 
     else:
@@ -0,0 +1,52 @@
+"""
+Production entry point.
+
+    python serve.py
+
+Runs gunicorn with gunicorn.conf.py: WEB_WORKERS processes of WEB_THREADS
+threads each, with the startup tasks (app.startup) run once before the
+workers start. Where gunicorn is unavailable (Windows) it falls back to
+waitress: one process with WEB_THREADS threads. The settings are described
+in gunicorn.conf.py, and the per-worker DB pool in
+app.config.database.engine_options.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def serve_gunicorn():
+    os.chdir(ROOT)
+    # Replace this process, so gunicorn's master is the process to signal (HUP reloads)
+    os.execv(sys.executable, [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"])
+
+
+def serve_waitress():
+    from waitress import serve
+
+    from app import create_app
+    from app.startup import run_startup_tasks
+
+    app = create_app()
+    run_startup_tasks(app)
+    serve(
+        app,
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", 8443)),
+        threads=int(os.getenv("WEB_THREADS", 4)),
+        channel_timeout=int(os.getenv("WEB_TIMEOUT", 120)),
+    )
+
+
+def main():
+    try:
+        import gunicorn  # noqa: F401  (POSIX only)
+    except ImportError:
+        serve_waitress()
+    else:
+        serve_gunicorn()
+
+
+if __name__ == "__main__":
+    main()
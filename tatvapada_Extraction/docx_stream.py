@@ -0,0 +1,101 @@
+"""
+Streaming DOCX paragraph reader.
+
+``docx.Document`` builds an lxml tree of the whole document plus python
+objects for every paragraph and run, which is what makes memory spike on the
+largest samputas. ``iter_paragraph_texts`` instead opens the .docx zip and
+stream-parses the main document part with ``iterparse``, yielding the text of
+each body paragraph as soon as its closing tag is read and then dropping the
+element, so memory stays at about one paragraph.
+
+The text is what python-docx's ``Paragraph.text`` gives for
+``Document(path).paragraphs``: body-level ``w:p`` only (not table cells or
+text boxes), built from the paragraph's ``w:r`` and ``w:hyperlink`` runs.
+
+The extractors use it when DOCX_STREAM_READER=1 (or --stream-docx on
+parallel_extract.py); python-docx stays the default.
+"""
+import os
+import posixpath
+import zipfile
+from typing import Iterator
+from xml.etree import ElementTree
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_PACKAGE_RELS = "_rels/.rels"
+_OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+_RELATIONSHIP = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+_P, _R, _HYPERLINK, _BODY = W + "p", W + "r", W + "hyperlink", W + "body"
+# Run children with a fixed text equivalent (as in python-docx)
+_RUN_CHARS = {W + "tab": "\t", W + "ptab": "\t", W + "cr": "\n", W + "noBreakHyphen": "-"}
+
+
+def streaming_enabled() -> bool:
+    # Read per call so a CLI flag set in os.environ reaches worker processes too
+    return os.getenv("DOCX_STREAM_READER", "0") == "1"
+
+
+def _main_part(archive: zipfile.ZipFile) -> str:
+    """Name of the main document part, normally word/document.xml."""
+    try:
+        rels = ElementTree.fromstring(archive.read(_PACKAGE_RELS))
+    except (KeyError, ElementTree.ParseError):
+        return "word/document.xml"
+    for rel in rels.iter(_RELATIONSHIP):
+        if rel.get("Type") == _OFFICE_DOCUMENT:
+            return posixpath.normpath(rel.get("Target", "").lstrip("/"))
+    return "word/document.xml"
+
+
+def _run_text(run, parts: list):
+    for child in run:
+        tag = child.tag
+        if tag == W + "t":
+            parts.append(child.text or "")
+        elif tag == W + "br":
+            # Line breaks only; page and column breaks have no text
+            if child.get(W + "type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag in _RUN_CHARS:
+            parts.append(_RUN_CHARS[tag])
+
+
+def paragraph_text(p) -> str:
+    parts = []
+    for child in p:
+        if child.tag == _R:
+            _run_text(child, parts)
+        elif child.tag == _HYPERLINK:
+            for run in child:
+                if run.tag == _R:
+                    _run_text(run, parts)
+    return "".join(parts)
+
+
+def iter_paragraph_texts(path) -> Iterator[str]:
+    """Yield the raw text of every body paragraph of the .docx at ``path``, in order."""
+    with zipfile.ZipFile(path) as archive, archive.open(_main_part(archive)) as part:
+        depth = 0
+        body = None
+        for event, elem in ElementTree.iterparse(part, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if depth == 2 and elem.tag == _BODY:
+                    body = elem
+                continue
+
+            depth -= 1
+            if depth == 2 and body is not None:
+                # A finished child of w:body (paragraph, table, section properties)
+                if elem.tag == _P:
+                    yield paragraph_text(elem)
+                body.clear()
+
+
+def iter_docx_texts(path) -> Iterator[str]:
+    """Raw paragraph texts, from the streaming reader or python-docx depending on ``streaming_enabled``."""
+    if streaming_enabled():
+        return iter_paragraph_texts(path)
+    import docx
+    return (p.text for p in docx.Document(path).paragraphs)
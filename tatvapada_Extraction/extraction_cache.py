@@ -0,0 +1,105 @@
+"""
+Content-addressed cache of parsed DOCX files.
+
+Entries are stored as gzip-compressed JSON under
+``<cache dir>/<extractor>/<version key>/<sha256 of the .docx>.json.gz``. The
+version key combines the extractor's ``EXTRACTOR_VERSION`` with a hash of
+every source the cached rows are computed by (the extractor, docx_stream,
+app.text), so editing any of them (or bumping the version) misses every old
+entry instead of serving stale rows. An unchanged file is never parsed
+again; only edited or new files pay for python-docx.
+
+Delete the cache directory to start over; stale version directories can be
+removed at any time.
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", ".extraction_cache")
+
+_MISS = object()
+
+
+def file_digest(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_paths(source) -> list:
+    path = Path(source)
+    return sorted(path.rglob("*.py")) if path.is_dir() else [path]
+
+
+def version_key(version: str, source_files: Iterable) -> str:
+    """``version`` plus a short hash of ``source_files`` (files, or package folders hashed file by file)."""
+    digest = hashlib.sha256()
+    for source in source_files:
+        for path in _source_paths(source):
+            digest.update(path.name.encode("utf-8") + b"\0")
+            digest.update(path.read_bytes())
+    return f"{version}-{digest.hexdigest()[:12]}"
+
+
+class ExtractionCache:
+    """Parsed results of one extractor, keyed by input file content."""
+
+    def __init__(self, extractor: str, version: str, source_files: Iterable, cache_dir=DEFAULT_CACHE_DIR):
+        self.directory = Path(cache_dir) / extractor / version_key(version, source_files)
+        self.hits = self.misses = 0
+
+    def _entry_path(self, digest: str) -> Path:
+        return self.directory / f"{digest}.json.gz"
+
+    def load(self, digest: str) -> Any:
+        """Cached value for ``digest``, or ``_MISS``; unreadable entries count as misses."""
+        try:
+            with gzip.open(self._entry_path(digest), "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return _MISS
+
+    def store(self, digest: str, value: Any):
+        # Write to a temporary file and rename, so a reader (or another worker
+        # process) never sees a half-written entry
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp, self._entry_path(digest))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def get_or_parse(self, path, parse) -> Tuple[Any, bool]:
+        """
+        ``parse(path)`` for ``path``, served from the cache when the file
+        content was parsed before. Returns (value, cache hit). ``parse`` must
+        return something JSON serializable.
+        """
+        digest = file_digest(path)
+        value = self.load(digest)
+        if value is not _MISS:
+            self.hits += 1
+            return value, True
+        self.misses += 1
+        value = parse(path)
+        self.store(digest, value)
+        return value, False
+
+
+def open_cache(extractor: str, version: str, source_files: Iterable,
+               cache_dir=DEFAULT_CACHE_DIR) -> Optional[ExtractionCache]:
+    """An ``ExtractionCache``, or None when ``cache_dir`` is empty (caching disabled)."""
+    if not cache_dir:
+        return None
+    return ExtractionCache(extractor, version, source_files, cache_dir)
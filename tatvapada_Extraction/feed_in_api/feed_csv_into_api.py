@@ -1,14 +1,46 @@
-import time
-import pandas as pd
-import requests
+import json
 import os
 import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "http://127.0.0.1:5000"
 #BASE_URL = "https://kagapa.com/kannada-tattvapada/"
 
 GENERATE_TOKEN_URL = f"{BASE_URL}/generate-token"
-UPLOAD_URL = f"{BASE_URL}/api/tatvapada/add"
+UPLOAD_URL = f"{BASE_URL}/api/tatvapada/bulk"
+
+# Records per request (the server accepts up to BULK_API_MAX_RECORDS, 5000 by default)
+BATCH_SIZE = 1000
+# Requests in flight at once; the server commits each batch in one transaction
+MAX_IN_FLIGHT = 4
+# Retries for connection errors and 429/502/503/504 answers, with exponential backoff.
+# A retried batch that had already been committed comes back as duplicates, never twice.
+RETRIES = 5
+TIMEOUT = 300
+
+# Column -> value used when the CSV has no such column
+DEFAULTS = {
+    "samputa_sankhye": "",
+    "tatvapadakosha_sheershike": "",
+    "tatvapadakarara_hesaru": "",
+    "vibhag": "-",
+    "tatvapada_sheershike": "",
+    "tatvapada_sankhye": "",
+    "tatvapada_first_line": "",
+    "tatvapada": "",
+    "bhavanuvada": "-",
+    "klishta_padagalu_artha": "-",
+    "tippani": "-",
+}
+
+_local = threading.local()
+
 
 # ----------------------------
 # Generate JWT Token
@@ -32,17 +64,81 @@ def generate_token(username, password):
         return None
 
 
+# ----------------------------
+# HTTP session (one keep-alive session per worker thread)
+# ----------------------------
+def get_session(token):
+    session = getattr(_local, "session", None)
+    if session is None:
+        retry = Retry(
+            total=RETRIES,
+            backoff_factor=1,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        )
+        session = requests.Session()
+        session.mount(BASE_URL, HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=1))
+        session.headers.update({
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/x-ndjson"
+        })
+        _local.session = session
+    return session
+
+
+def post_batch(token, csv_file, first_row, records):
+    """POST one batch as NDJSON and return (success count, failed row dicts)."""
+    body = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode("utf-8")
+    try:
+        response = get_session(token).post(UPLOAD_URL, data=body, timeout=TIMEOUT)
+    except Exception as e:
+        return 0, [
+            {"file": csv_file, "row": first_row + n, "status": "Exception", "response": str(e)}
+            for n in range(len(records))
+        ]
+
+    try:
+        # 200 all inserted, 207 some, 400 none; each carries per-record results
+        results = response.json()["results"]
+    except (ValueError, KeyError, TypeError):
+        return 0, [
+            {"file": csv_file, "row": first_row + n, "status": response.status_code, "response": response.text}
+            for n in range(len(records))
+        ]
+
+    success, failed = 0, []
+    for result in results:
+        if result["status"] == "inserted":
+            success += 1
+        else:
+            failed.append({
+                "file": csv_file,
+                "row": first_row + result["index"] - 1,
+                "status": response.status_code,
+                "response": result.get("message", "")
+            })
+    return success, failed
+
+
+def read_batches(file_path):
+    """Yield (first row number, records) for ``file_path``, BATCH_SIZE rows at a time."""
+    first_row = 1
+    for chunk in pd.read_csv(file_path, encoding="utf-8-sig", dtype=str, keep_default_na=False,
+                             chunksize=BATCH_SIZE):
+        records = [
+            {column: row.get(column, default) for column, default in DEFAULTS.items()}
+            for row in chunk.to_dict("records")
+        ]
+        yield first_row, records
+        first_row += len(records)
+
+
 # ----------------------------
 # Upload CSV Folder
 # ----------------------------
 def upload_csv_folder(folder_path, token):
 
-    session = requests.Session()
-    session.headers.update({
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    })
-
     csv_files = [f for f in os.listdir(folder_path) if f.lower().endswith(".csv")]
 
     if not csv_files:
@@ -53,65 +149,40 @@ def upload_csv_folder(folder_path, token):
     total_fail = 0
     failed_rows_list = []
 
-    for csv_file in csv_files:
-        file_path = os.path.join(folder_path, csv_file)
-        print(f"\nProcessing file: {csv_file}")
-
-        try:
-            df = pd.read_csv(file_path, encoding="utf-8-sig")
-        except Exception as e:
-            print(f"Failed to read {csv_file}: {e}")
-            continue
-
-        success_count = 0
-        fail_count = 0
-
-        for index, row in df.iterrows():
-
-            payload = {
-                "samputa_sankhye": str(row.get("samputa_sankhye", "")),
-                "tatvapadakosha_sheershike": row.get("tatvapadakosha_sheershike", ""),
-                "tatvapadakarara_hesaru": row.get("tatvapadakarara_hesaru", ""),
-                "vibhag": row.get("vibhag", "-"),
-                "tatvapada_sheershike": row.get("tatvapada_sheershike", ""),
-                "tatvapada_sankhye": str(row.get("tatvapada_sankhye", "")),
-                "tatvapada_first_line": row.get("tatvapada_first_line", ""),
-                "tatvapada": row.get("tatvapada", ""),
-                "bhavanuvada": row.get("bhavanuvada", "-"),
-                "klishta_padagalu_artha": row.get("klishta_padagalu_artha", "-"),
-                "tippani": row.get("tippani", "-"),
-            }
+    with ThreadPoolExecutor(max_workers=MAX_IN_FLIGHT) as executor:
+        for csv_file in csv_files:
+            file_path = os.path.join(folder_path, csv_file)
+            print(f"\nProcessing file: {csv_file}")
 
-            try:
-                response = session.post(UPLOAD_URL, json=payload)
-
-                if response.status_code in (200, 201):
-                    success_count += 1
-                else:
-                    fail_count += 1
-                    failed_rows_list.append({
-                        "file": csv_file,
-                        "row": index + 1,
-                        "status": response.status_code,
-                        "response": response.text
-                    })
+            success_count = 0
+            fail_count = 0
+            in_flight = set()
 
+            def collect(done):
+                nonlocal success_count, fail_count
+                for future in done:
+                    success, failed = future.result()
+                    success_count += success
+                    fail_count += len(failed)
+                    failed_rows_list.extend(failed)
+
+            try:
+                for first_row, records in read_batches(file_path):
+                    # Read ahead at most MAX_IN_FLIGHT batches
+                    if len(in_flight) >= MAX_IN_FLIGHT:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        collect(done)
+                    in_flight.add(executor.submit(post_batch, token, csv_file, first_row, records))
             except Exception as e:
-                fail_count += 1
-                failed_rows_list.append({
-                    "file": csv_file,
-                    "row": index + 1,
-                    "status": "Exception",
-                    "response": str(e)
-                })
+                print(f"Failed to read {csv_file}: {e}")
 
-        print(f"Finished {csv_file}: Success={success_count}, Failed={fail_count}")
+            done, _ = wait(in_flight)
+            collect(done)
 
-        total_success += success_count
-        total_fail += fail_count
+            print(f"Finished {csv_file}: Success={success_count}, Failed={fail_count}")
 
-        print("Waiting 5 seconds before next file...")
-        time.sleep(5)
+            total_success += success_count
+            total_fail += fail_count
 
     print("\nUpload Summary")
     print("Total Success:", total_success)
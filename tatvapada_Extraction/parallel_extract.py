@@ -0,0 +1,193 @@
+"""
+Parallel DOCX extraction.
+
+python-docx parsing is CPU bound, so the files of a folder are parsed in a
+ProcessPoolExecutor, one file per task. Every file gets its own result CSV,
+and the merged CSV is assembled in sorted file-name order once all workers
+are done, so the output does not depend on which worker finished first.
+
+    python parallel_extract.py verses  <docx folder> [--workers N] [--out output_csv]
+    python parallel_extract.py tippani <docx folder> [--workers N] [--out output_padavivarana_arthakosha]
+
+``verses`` runs tatvapada_extractorv2 and ``tippani`` runs
+tippani_arthakosha_extractor. With --workers 1 the files are parsed in this
+process, which is handy for debugging. Files whose content was parsed
+before are served from the extraction cache (see extraction_cache);
+--no-cache parses everything. --stream-docx reads the files with the
+streaming reader in docx_stream instead of python-docx.
+"""
+import argparse
+import csv
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent))  # sibling extractors when run from elsewhere
+import tatvapada_extractorv2 as verse_extractor
+import tippani_arthakosha_extractor as tippani_extractor
+from extraction_cache import DEFAULT_CACHE_DIR
+
+
+# ---------------- Workers (module level so they pickle) ----------------
+def _extract_verses(docx_file: str, out_dir: str, cache_dir: Optional[str]) -> Tuple[str, str, str]:
+    """Returns (file name, result CSV or "", error or "")."""
+    try:
+        cache = verse_extractor.open_extraction_cache(cache_dir)
+        out_path = verse_extractor.extract_file(docx_file, out_dir, cache)
+        return Path(docx_file).name, str(out_path or ""), ""
+    except Exception as e:
+        return Path(docx_file).name, "", str(e)
+
+
+def _extract_tippani(docx_file: str, cache_dir: Optional[str]):
+    """Returns (file name, padavivarana rows, arthakosha rows, author map, error or "")."""
+    author_id_map: Dict[str, int] = {}
+    try:
+        cache = tippani_extractor.open_extraction_cache(cache_dir)
+        padavivarana_rows, arthakosha_rows = tippani_extractor.process_docx_file_cached(
+            docx_file, author_id_map, cache
+        )
+        return Path(docx_file).name, padavivarana_rows or [], arthakosha_rows or [], author_id_map, ""
+    except Exception as e:
+        return Path(docx_file).name, [], [], {}, str(e)
+
+
+def run_tasks(fn, args_list: List[tuple], workers: int):
+    """Run ``fn(*args)`` for every args tuple; results come back in input order."""
+    if workers <= 1:
+        return [fn(*args) for args in args_list]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fn, *zip(*args_list))) if args_list else []
+
+
+def docx_files(input_dir: str) -> List[str]:
+    return [str(path) for path in sorted(Path(input_dir).glob("*.docx"))]
+
+
+# ---------------- Verses ----------------
+def extract_verses(input_dir: str, out_dir: str = "output_csv", workers: int = 1,
+                   cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> Path:
+    base_dir = Path(out_dir)
+    shutil.rmtree(base_dir, ignore_errors=True)
+    individual = base_dir / "individual"
+    individual.mkdir(parents=True, exist_ok=True)
+
+    results = run_tasks(_extract_verses, [(f, str(individual), cache_dir) for f in docx_files(input_dir)], workers)
+
+    frames = []
+    for name, out_path, error in results:
+        if error:
+            print("Error processing", name, ":", error)
+        elif out_path:
+            print("Saved:", out_path)
+            frames.append(pd.read_csv(out_path, dtype=str, keep_default_na=False, encoding="utf-8-sig"))
+
+    merged_path = base_dir / "merged.csv"
+    if frames:
+        pd.concat(frames, ignore_index=True).to_csv(merged_path, index=False, encoding="utf-8-sig")
+        print("Merged:", merged_path)
+    return merged_path
+
+
+# ---------------- Padavivarana / Arthakosha ----------------
+def merge_author_maps(results) -> Dict[str, int]:
+    """
+    Merge the per-file author maps in file order. Names already seen keep
+    their first id, and a stable_id shared by two names is reported, since
+    those authors would be indistinguishable downstream.
+    """
+    author_id_map: Dict[str, int] = {}
+    names_by_id: Dict[int, str] = {}
+    for name, _, _, file_map, _ in results:
+        for author, author_id in file_map.items():
+            if author in author_id_map:
+                if author_id_map[author] != author_id:
+                    print(f"Author id conflict in {name}: '{author}' has {author_id}, "
+                          f"keeping {author_id_map[author]}")
+                continue
+            if author_id in names_by_id:
+                print(f"Warning: authors '{names_by_id[author_id]}' and '{author}' share id {author_id}")
+            author_id_map[author] = author_id
+            names_by_id.setdefault(author_id, author)
+    return author_id_map
+
+
+def extract_tippani(input_dir: str, out_dir: str = "output_padavivarana_arthakosha", workers: int = 1,
+                    cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> Path:
+    base_dir = Path(out_dir)
+    shutil.rmtree(base_dir, ignore_errors=True)
+    padavivarana_folder = str(base_dir / "output_padavivarana")
+    arthakosha_folder = str(base_dir / "output_arthakosha")
+
+    results = run_tasks(_extract_tippani, [(f, cache_dir) for f in docx_files(input_dir)], workers)
+    author_id_map = merge_author_maps(results)
+
+    all_padavivarana, all_arthakosha = [], []
+    for name, padavivarana_rows, arthakosha_rows, _, error in results:
+        if error:
+            print("Error processing", name, ":", error)
+            continue
+        # Rows take the merged id, in case a worker saw a conflicting one
+        for row in padavivarana_rows:
+            if row["tatvapadakarara_hesaru"] in author_id_map:
+                row["tatvapada_author_id"] = author_id_map[row["tatvapadakarara_hesaru"]]
+        for row in arthakosha_rows:
+            if row["author_name"] in author_id_map:
+                row["author_id"] = author_id_map[row["author_name"]]
+        tippani_extractor.write_file_outputs(name, padavivarana_rows, arthakosha_rows,
+                                             padavivarana_folder, arthakosha_folder)
+        all_padavivarana.extend(padavivarana_rows)
+        all_arthakosha.extend(arthakosha_rows)
+
+    base_dir.mkdir(parents=True, exist_ok=True)
+    if all_padavivarana:
+        tippani_extractor.write_rows(str(base_dir / "padavivarana_merged.csv"),
+                                     tippani_extractor.PADAVIVARANA_FIELDS, all_padavivarana)
+    if all_arthakosha:
+        tippani_extractor.write_rows(str(base_dir / "arthakosha_merged.csv"),
+                                     tippani_extractor.ARTHAKOSHA_FIELDS, all_arthakosha)
+    with open(base_dir / "author_ids.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["author_id", "author_name"])
+        writer.writerows(sorted((author_id, author) for author, author_id in author_id_map.items()))
+    print("Merged outputs in:", base_dir)
+    return base_dir
+
+
+# ---------------- Main ----------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract Tatvapada data from a folder of .docx files in parallel")
+    parser.add_argument("kind", choices=("verses", "tippani"), help="verses or padavivarana/arthakosha (tippani)")
+    parser.add_argument("input_dir", help="folder containing the .docx files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count; 1 parses in this process)")
+    parser.add_argument("--out", help="output folder (default: the extractor's own)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"extraction cache folder (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="parse every file, ignoring the cache")
+    parser.add_argument("--stream-docx", action="store_true",
+                        help="read .docx files with the streaming reader (DOCX_STREAM_READER=1)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.input_dir):
+        parser.error(f"not a folder: {args.input_dir}")
+
+    cache_dir = None if args.no_cache else args.cache_dir
+    if args.stream_docx:
+        os.environ["DOCX_STREAM_READER"] = "1"  # inherited by the worker processes
+    started = time.perf_counter()
+    if args.kind == "verses":
+        extract_verses(args.input_dir, args.out or "output_csv", args.workers, cache_dir)
+    else:
+        extract_tippani(args.input_dir, args.out or "output_padavivarana_arthakosha", args.workers, cache_dir)
+    print(f"Done in {time.perf_counter() - started:.1f}s with {args.workers} worker(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,27 @@
 import os
+import sys
 import re
 import shutil
-import unicodedata
 from pathlib import Path
 from docx import Document
 import pandas as pd
 from datetime import datetime
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # project root, for app.text
+from app.text import kannada_to_english_digits, normalize_para
+
 # === CONSTANTS ===
-KANNADA_NUM_MAP = {
-    '೦': '0', '೧': '1', '೨': '2', '೩': '3', '೪': '4',
-    '೫': '5', '೬': '6', '೭': '7', '೮': '8', '೯': '9'
-}
 SAMPUTA_RE = re.compile(r'^\s*ಸಂಪುಟ\s*[-:–—]*\s*([೦-೯0-9.]+)', re.IGNORECASE)
 VERSE_HEADER_RE = re.compile(r'^\s*([೦-೯0-9]+)(?:[\.\)]|\s+)\s*')
 SPECIAL_ENDINGS = ("||", "॥",'.')
 
 # === BASIC HELPERS ===
-def normalize_para(text):
-    return unicodedata.normalize('NFC', text.strip())
-
 def extract_paragraphs_from_docx(path):
     doc = Document(path)
-    return [normalize_para(p.text) for p in doc.paragraphs if normalize_para(p.text)]
+    return [text for p in doc.paragraphs if (text := normalize_para(p.text))]
 
 def kannada_to_number(s):
-    trans = ''.join(KANNADA_NUM_MAP.get(ch, ch) for ch in s)
+    trans = kannada_to_english_digits(s)
     try:
         num = float(trans)
         return int(num) if num.is_integer() else num
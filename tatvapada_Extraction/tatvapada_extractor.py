@@ -1,26 +1,22 @@
 import os
+import sys
 import re
 import shutil
-import unicodedata
 from pathlib import Path
 from docx import Document
 import pandas as pd
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # project root, for app.text
+from app.text import kannada_to_english_digits, normalize_para
+
 # === CONSTANTS ===
-KANNADA_NUM_MAP = {
-    '೦': '0', '೧': '1', '೨': '2', '೩': '3', '೪': '4',
-    '೫': '5', '೬': '6', '೭': '7', '೮': '8', '೯': '9'
-}
 SAMPUTA_RE = re.compile(r'^\s*ಸಂಪುಟ\s*[-:–—]*\s*([೦-೯0-9.]+)',re.IGNORECASE)
 VERSE_HEADER_RE = re.compile(r'^\s*([೦-೯0-9]+)(?:[\.\(]|\s+)\s*')
 SPECIAL_ENDINGS = ("||", "॥")
 
 # === HELPERS ===
-def normalize_para(text):
-    return unicodedata.normalize('NFC', text.strip())
-
 def kannada_to_number(s):
-    trans = ''.join(KANNADA_NUM_MAP.get(ch, ch) for ch in s)
+    trans = kannada_to_english_digits(s)
 
     # check if it's a valid numeric string (int or float, with optional leading/trailing decimal)
     if re.match(r'^\d*\.?\d*$', trans) and trans not in ("", ".",):
@@ -31,7 +27,7 @@ def kannada_to_number(s):
     return None
 
 def kannada_to_int(s):
-    trans = ''.join(KANNADA_NUM_MAP.get(ch, ch) for ch in s)
+    trans = kannada_to_english_digits(s)
     digits = ''.join(ch for ch in trans if ch.isdigit())
     return int(digits) if digits.isdigit() else None
 
@@ -53,7 +49,7 @@ def valid_heading_line(line):
 
 def extract_paragraphs_from_docx(path):
     doc = Document(path)
-    return [normalize_para(p.text) for p in doc.paragraphs if normalize_para(p.text)]
+    return [text for p in doc.paragraphs if (text := normalize_para(p.text))]
 
 # === Author detection ===
 def is_author_name(candidate):
@@ -209,19 +205,13 @@ def process_folder(input_dir):
 
 
 
-# Kannada digit mapping
-kannada_to_arabic = str.maketrans({
-    '೦': '0', '೧': '1', '೨': '2', '೩': '3', '೪': '4',
-    '೫': '5', '೬': '6', '೭': '7', '೮': '8', '೯': '9'
-})
-
 def rename_docx_files(directory):
     for filename in os.listdir(directory):
         if filename.lower().endswith(".docx"):
             # Remove extra spaces for easier matching
             clean_name = re.sub(r'\s+', '', filename)
             # Convert Kannada digits to Arabic
-            clean_name = clean_name.translate(kannada_to_arabic)
+            clean_name = kannada_to_english_digits(clean_name)
 
             # Extract all numbers from the filename
             numbers = re.findall(r'\d+', clean_name)
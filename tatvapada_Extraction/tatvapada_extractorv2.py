@@ -1,33 +1,37 @@
 import os
+import sys
 import re
 import shutil
-import unicodedata
 from pathlib import Path
-from docx import Document
 import pandas as pd
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # project root, for app.text
+from app.text import kannada_to_english_digits, normalize_para
+import app.text
+import docx_stream
+from docx_stream import iter_docx_texts
+from extraction_cache import DEFAULT_CACHE_DIR, open_cache
+
+# Bump when parse_document's output changes in a way the CACHE_SOURCES hash would not show
+EXTRACTOR_VERSION = "2"
+# Sources the cached rows are computed by; editing any of them misses the cache
+CACHE_SOURCES = (__file__, docx_stream.__file__, os.path.dirname(app.text.__file__))
+
 # === CONSTANTS ===
-KANNADA_NUM_MAP = {
-    '೦': '0', '೧': '1', '೨': '2', '೩': '3', '೪': '4',
-    '೫': '5', '೬': '6', '೭': '7', '೮': '8', '೯': '9'
-}
 SAMPUTA_RE = re.compile(r'^\s*ಸಂಪುಟ\s*[-:–—]*\s*([೦-೯0-9.]+)', re.IGNORECASE)
 VERSE_HEADER_RE = re.compile(r'^\s*([೦-೯0-9]+)(?:[\.\(]|\s+)\s*')
 SPECIAL_ENDINGS = ("||", "॥")
 
 # === HELPERS ===
-def normalize_para(text):
-    return unicodedata.normalize('NFC', text.strip())
-
 def kannada_to_number(s):
-    trans = ''.join(KANNADA_NUM_MAP.get(ch, ch) for ch in s)
+    trans = kannada_to_english_digits(s)
     if re.match(r'^\d*\.?\d*$', trans) and trans not in ("", ".",):
         num = float(trans)
         return int(num) if num.is_integer() else num
     return None
 
 def kannada_to_int(s):
-    trans = ''.join(KANNADA_NUM_MAP.get(ch, ch) for ch in s)
+    trans = kannada_to_english_digits(s)
     digits = ''.join(ch for ch in trans if ch.isdigit())
     return int(digits) if digits.isdigit() else None
 
@@ -48,8 +52,8 @@ def valid_heading_line(line):
     return True
 
 def extract_paragraphs_from_docx(path):
-    doc = Document(path)
-    return [normalize_para(p.text) for p in doc.paragraphs if normalize_para(p.text)]
+    # python-docx, or the streaming reader with DOCX_STREAM_READER=1 (see docx_stream)
+    return [text for raw in iter_docx_texts(path) if (text := normalize_para(raw))]
 
 # === Author detection ===
 def is_author_name(candidate):
@@ -58,27 +62,51 @@ def is_author_name(candidate):
         return False
     return cand.endswith("ತತ್ವಪದಗಳು")
 
-# === Get max 2 valid headings before verse ===
-def get_heading_lines_before_verse(paras, verse_index):
-    heading_lines = []
-    j = verse_index - 1
-    while j >= 0 and len(heading_lines) < 2:
-        line = paras[j].strip()
-        if not line:
-            j -= 1
-            continue
-        if valid_heading_line(line):
-            heading_lines.insert(0, line)
-        else:
-            break
-        j -= 1
-    return heading_lines
+# === Paragraph classification ===
+VERSE_NUMBER_RE = re.compile(r"^[೦-೯0-9]+[.(]?\s*")
+BHAVANUVADA_RE = re.compile(r"^(ಕನ್ನಡ\s*)?ಭಾವಾನುವಾದ\s*[:：]")
+COLON_RE = re.compile(r"[:：]\s*")
+
+# Heading kinds
+NOT_HEADING, VIBHAG, AUTHOR = 0, 1, 2
+
+
+def heading_kind(stripped):
+    if not valid_heading_line(stripped):
+        return NOT_HEADING
+    return AUTHOR if stripped.endswith("ತತ್ವಪದಗಳು") else VIBHAG
+
+
+def _finish_entry(entry, block, bhava_line, bhava_block):
+    entry["tatvapada_first_line"] = block[0].strip() if block else "-"
+    entry["tatvapada"] = "\n".join(block).strip() or "-"
+    if bhava_line is not None:
+        entry["bhavanuvada"] = bhava_line + ("\n" + "\n".join(bhava_block) if bhava_block else "")
+    return entry
+
 
 # === CORE PARSER ===
 def parse_document(paras):
+    """
+    One forward pass; every paragraph is matched against VERSE_HEADER_RE once
+    and heading checks are memoized per distinct line.
+
+    A verse takes its author/vibhag from at most 2 heading lines right before
+    it (blank lines skipped, any other line ends the run), its block is every
+    paragraph up to the next verse header, and a verse header reading
+    "ಭಾವಾನುವಾದ:" right after that block is folded into it as bhavanuvada.
+    """
     if not paras:
         return []
 
+    kinds = {}
+
+    def kind(stripped):
+        k = kinds.get(stripped)
+        if k is None:
+            k = kinds[stripped] = heading_kind(stripped)
+        return k
+
     samputa_sankhye, tatvapadakosha_sheershike = "-", "-"
     samputa_index = -1
 
@@ -98,34 +126,51 @@ def parse_document(paras):
             break
 
     # Get first author (mandatory)
-    current_author = "-"
-    for p in paras:
-        if is_author_name(p):
-            current_author = p
-            break
+    current_author = next((p for p in paras if p.strip() and kind(p.strip()) == AUTHOR), "-")
 
     last_vibhag = "-"
     author_verse_counter = 0
     entries = []
 
-    i = 0
-    while i < len(paras):
-        line = paras[i]
-        verse_match = VERSE_HEADER_RE.match(line)
-        if not verse_match:
-            i += 1
-            continue
+    # The last two non-blank paragraphs (stripped): the only candidates for a verse's headings
+    prev1 = prev2 = None
+    entry = None            # verse whose block is being collected
+    block, bhava_block = [], []
+    bhava_line = None
+    in_bhava = False        # collecting a bhavanuvada block; the next header is a plain verse
+    is_verse = VERSE_HEADER_RE.match
 
-        # Get headings before verse
-        heading_lines = get_heading_lines_before_verse(paras, i)
-        detected_author = None
-        detected_vibhag = None
+    for p in paras:
+        stripped = p.strip()
+        if not is_verse(p):
+            if entry is not None:
+                (bhava_block if in_bhava else block).append(p)
+            if stripped:
+                prev1, prev2 = stripped, prev1
+            continue
 
-        for hl in heading_lines:
-            if is_author_name(hl):
-                detected_author = hl
-            else:
-                detected_vibhag = hl
+        sheershike = VERSE_NUMBER_RE.sub("", p, count=1)
+        if entry is not None and not in_bhava:
+            after_num = sheershike.strip()
+            if BHAVANUVADA_RE.match(after_num):
+                # Keep full line, just remove colon
+                bhava_line, in_bhava = COLON_RE.sub(" ", after_num).strip(), True
+                prev1, prev2 = stripped, prev1
+                continue
+        if entry is not None:
+            entries.append(_finish_entry(entry, block, bhava_line, bhava_block))
+
+        # Headings: up to 2 heading lines directly before the verse, in document order
+        detected_author = detected_vibhag = None
+        if prev1 is not None and kind(prev1) != NOT_HEADING:
+            heading_lines = [prev1]
+            if prev2 is not None and kind(prev2) != NOT_HEADING:
+                heading_lines.insert(0, prev2)
+            for hl in heading_lines:
+                if kind(hl) == AUTHOR:
+                    detected_author = hl
+                else:
+                    detected_vibhag = hl
 
         # Author reset counter if changed
         if detected_author and detected_author != tatvapadakosha_sheershike:
@@ -133,100 +178,80 @@ def parse_document(paras):
                 current_author = detected_author
                 author_verse_counter = 0  # reset for new author
 
-        # Increment verse counter for this author
         author_verse_counter += 1
-        tatvapada_sankhye = str(author_verse_counter)
 
         # Vibhag carry-forward
-        if detected_vibhag and not is_author_name(detected_vibhag):
+        if detected_vibhag:
             last_vibhag = detected_vibhag
-        current_vibhag = last_vibhag or "-"
-
-        # Collect tatvapada block (telugu/original)
-        block = []
-        k = i + 1
-        while k < len(paras) and not VERSE_HEADER_RE.match(paras[k]):
-            block.append(paras[k])
-            k += 1
-
-        tatvapada_content = "\n".join(block).strip() or "-"
-        clean_sheershike = re.sub(r"^[೦-೯0-9]+[.(]?\s*", "", line)
-
-        # Special fields
-        bhavanuvada, klishta_padagalu_artha, tippani = "-", "-", "-"
-
-        # === Look ahead: check if next verse is actually "ಭಾವಾನುವಾದ" ===
-        if k < len(paras):
-            next_line = paras[k]
-            next_match = VERSE_HEADER_RE.match(next_line)
-            if next_match:
-                after_num = re.sub(r"^[೦-೯0-9]+[.(]?\s*", "", next_line).strip()
-                if re.match(r"^(ಕನ್ನಡ\s*)?ಭಾವಾನುವಾದ\s*[:：]", after_num):
-                    # Collect its block
-                    bhava_block = []
-                    k2 = k + 1
-                    while k2 < len(paras) and not VERSE_HEADER_RE.match(paras[k2]):
-                        bhava_block.append(paras[k2])
-                        k2 += 1
-
-                    # Keep full line, just remove colon
-                    bhavanuvada_line = re.sub(r"[:：]\s*", " ", after_num).strip()
-                    bhavanuvada = bhavanuvada_line
-                    if bhava_block:
-                        bhavanuvada += "\n" + "\n".join(bhava_block)
-
-                    # Skip this whole block
-                    k = k2
-
-        entries.append({
+
+        entry = {
             "samputa_sankhye": samputa_sankhye,
             "tatvapadakosha_sheershike": tatvapadakosha_sheershike,
             "tatvapadakarara_hesaru": current_author,
-            "vibhag": current_vibhag,
-            "tatvapada_sheershike": clean_sheershike,
-            "tatvapada_sankhye": tatvapada_sankhye,
-            "tatvapada_first_line": block[0].strip() if block else "-",
-            "tatvapada": tatvapada_content,
-            "bhavanuvada": bhavanuvada,
-            "klishta_padagalu_artha": klishta_padagalu_artha,
-            "tippani": tippani
-        })
-
-        i = k
-
+            "vibhag": last_vibhag or "-",
+            "tatvapada_sheershike": sheershike,
+            "tatvapada_sankhye": str(author_verse_counter),
+            "tatvapada_first_line": "-",
+            "tatvapada": "-",
+            "bhavanuvada": "-",
+            "klishta_padagalu_artha": "-",
+            "tippani": "-"
+        }
+        block, bhava_block = [], []
+        bhava_line, in_bhava = None, False
+        prev1, prev2 = stripped, prev1
+
+    if entry is not None:
+        entries.append(_finish_entry(entry, block, bhava_line, bhava_block))
     return entries
 
+# === PROCESS ONE FILE ===
+def parse_file(docx_file):
+    return parse_document(extract_paragraphs_from_docx(docx_file))
+
+def open_extraction_cache(cache_dir=DEFAULT_CACHE_DIR):
+    return open_cache("tatvapada", EXTRACTOR_VERSION, CACHE_SOURCES, cache_dir)
+
+def extract_file(docx_file, out_dir, cache=None):
+    """
+    Parse one .docx and write its verses to out_dir/<stem>.csv; returns the CSV path or None.
+    With a cache (see extraction_cache), a file whose content was parsed before is not parsed again.
+    """
+    docx_file = Path(docx_file)
+    if cache is not None:
+        parsed, _ = cache.get_or_parse(docx_file, parse_file)
+    else:
+        parsed = parse_file(docx_file)
+    if not parsed:
+        return None
+    out_path = Path(out_dir) / f"{docx_file.stem}.csv"
+    pd.DataFrame(parsed).to_csv(out_path, index=False, encoding="utf-8-sig")
+    return out_path
+
 # === PROCESS FOLDER ===
-def process_folder(input_dir):
+def process_folder(input_dir, cache_dir=DEFAULT_CACHE_DIR):
     base_dir = Path("output_csv")
     shutil.rmtree(base_dir, ignore_errors=True)
     out_dir = base_dir / "individual"
     out_dir.mkdir(parents=True, exist_ok=True)
+    cache = open_extraction_cache(cache_dir)
 
     for docx_file in sorted(Path(input_dir).glob("*.docx")):
         try:
-            paras = extract_paragraphs_from_docx(docx_file)
-            parsed = parse_document(paras)
-            if not parsed:
-                continue
-            df = pd.DataFrame(parsed)
-            out_path = out_dir / f"{docx_file.stem}.csv"
-            df.to_csv(out_path, index=False, encoding="utf-8-sig")
-            print("Saved:", out_path)
+            out_path = extract_file(docx_file, out_dir, cache)
+            if out_path:
+                print("Saved:", out_path)
         except Exception as e:
             print("Error processing", docx_file, ":", e)
+    if cache is not None:
+        print(f"Cache: {cache.hits} unchanged, {cache.misses} parsed")
 
 # === Rename DOCX Utility ===
-kannada_to_arabic = str.maketrans({
-    '೦': '0', '೧': '1', '೨': '2', '೩': '3', '೪': '4',
-    '೫': '5', '೬': '6', '೭': '7', '೮': '8', '೯': '9'
-})
-
 def rename_docx_files(directory):
     for filename in os.listdir(directory):
         if filename.lower().endswith(".docx"):
             clean_name = re.sub(r'\s+', '', filename)
-            clean_name = clean_name.translate(kannada_to_arabic)
+            clean_name = kannada_to_english_digits(clean_name)
             numbers = re.findall(r'\d+', clean_name)
 
             if numbers:
@@ -1,42 +1,37 @@
 import os
 import re
 import csv
+import sys
 import shutil
 import hashlib
+from pathlib import Path
 from typing import List, Dict, Tuple, Optional
-import docx
 
-# === Rename DOCX Utility ===
-kannada_to_arabic = str.maketrans({
-    '೦': '0', '೧': '1', '೨': '2', '೩': '3', '೪': '4',
-    '೫': '5', '೬': '6', '೭': '7', '೮': '8', '೯': '9'
-})
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # project root, for app.text
+from app.text import clean_text, kannada_to_english_digits
+import app.text
+import docx_stream
+from docx_stream import iter_docx_texts
+from extraction_cache import DEFAULT_CACHE_DIR, open_cache
+
+# Bump when process_docx_file's output changes in a way the CACHE_SOURCES hash would not show
+EXTRACTOR_VERSION = "1"
+# Sources the cached rows are computed by; editing any of them misses the cache
+CACHE_SOURCES = (__file__, docx_stream.__file__, os.path.dirname(app.text.__file__))
+
 # ---------------- Constants ----------------
 SAMPUTA_RE = re.compile(r"ಸಂಪುಟ\s*[-–]?\s*([೦-೯0-9]+)")
 
-KAN_DIGIT_MAP = {
-    "೦": "0", "೧": "1", "೨": "2", "೩": "3", "೪": "4",
-    "೫": "5", "೬": "6", "೭": "7", "೮": "8", "೯": "9",
-}
-
 # ---------------- Utilities ----------------
-def normalize_digits(text: str) -> str:
-    return "".join(KAN_DIGIT_MAP.get(ch, ch) for ch in text)
+normalize_digits = kannada_to_english_digits
 
 def stable_id(author: str) -> int:
     return int(hashlib.md5(author.encode("utf-8")).hexdigest(), 16) % 100000
 
-# ---------------- DOCX Processing ----------------
-# ---------------- Utilities ----------------
-def clean_text(text: str) -> str:
-    """Remove invisible unicode chars and trim spaces."""
-    return re.sub(r"[\u200b-\u200d\uFEFF]", "", text).strip()
-
 # ---------------- DOCX Processing ----------------
 def process_docx_file(file_path: str,
                       author_id_map: Dict[str, int]) -> Tuple[Optional[List[Dict]], Optional[List[Dict]]]:
-    doc = docx.Document(file_path)
-
+    # python-docx, or the streaming reader with DOCX_STREAM_READER=1 (see docx_stream)
     samputa_sankhye = None
     tatvapada_author_id = None
     author_name = None
@@ -46,8 +41,8 @@ def process_docx_file(file_path: str,
     current_section = None
     last_row = None
 
-    for para in doc.paragraphs:
-        text = clean_text(para.text)
+    for raw in iter_docx_texts(file_path):
+        text = clean_text(raw)
         if not text:
             continue
 
@@ -118,52 +113,83 @@ def process_docx_file(file_path: str,
 
     return padavivarana_rows, arthakosha_rows
 
+def open_extraction_cache(cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+    return open_cache("tippani_arthakosha", EXTRACTOR_VERSION, CACHE_SOURCES, cache_dir)
+
+def _parse_file(file_path) -> List[Optional[List[Dict]]]:
+    # Authors always get stable_id, so a private map gives the same ids as a shared one
+    return list(process_docx_file(str(file_path), {}))
+
+def process_docx_file_cached(file_path: str, author_id_map: Dict[str, int],
+                             cache=None) -> Tuple[Optional[List[Dict]], Optional[List[Dict]]]:
+    """process_docx_file, served from ``cache`` (see extraction_cache) when the file is unchanged."""
+    if cache is None:
+        return process_docx_file(file_path, author_id_map)
+    padavivarana_rows, arthakosha_rows = cache.get_or_parse(file_path, _parse_file)[0]
+    for row in padavivarana_rows or []:
+        author_id_map.setdefault(row["tatvapadakarara_hesaru"], row["tatvapada_author_id"])
+    for row in arthakosha_rows or []:
+        author_id_map.setdefault(row["author_name"], row["author_id"])
+    return padavivarana_rows, arthakosha_rows
+
+# ---------------- CSV Output ----------------
+PADAVIVARANA_FIELDS = [
+    "tatvapada_author_id",
+    "samputa_sankhye",
+    "tatvapadakarara_hesaru",
+    "paribhashika_padavivarana_title",
+    "paribhashika_padavivarana_content"
+]
+# Arthakosha CSV with requested columns order
+ARTHAKOSHA_FIELDS = [
+    "author_id",
+    "author_name",
+    "samputa",
+    "title",
+    "word",
+    "meaning",
+    "notes"
+]
+
+def write_rows(csv_path: str, fieldnames: List[str], rows: List[Dict]):
+    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def write_file_outputs(filename: str,
+                       padavivarana_rows: Optional[List[Dict]],
+                       arthakosha_rows: Optional[List[Dict]],
+                       padavivarana_output_folder: str,
+                       arthakosha_output_folder: str):
+    stem = os.path.splitext(filename)[0]
+    if padavivarana_rows:
+        csv_path = os.path.join(padavivarana_output_folder, f"{stem}_padavivarana.csv")
+        write_rows(csv_path, PADAVIVARANA_FIELDS, padavivarana_rows)
+        print(f"Wrote Padavivarana CSV: {csv_path}")
+
+    if arthakosha_rows:
+        csv_path = os.path.join(arthakosha_output_folder, f"{stem}_arthakosha.csv")
+        write_rows(csv_path, ARTHAKOSHA_FIELDS, arthakosha_rows)
+        print(f"Wrote Arthakosha CSV: {csv_path}")
+
 # ---------------- Folder Processing ----------------
 def process_folder(input_folder: str,
                    padavivarana_output_folder: str,
-                   arthakosha_output_folder: str):
+                   arthakosha_output_folder: str,
+                   cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
     author_id_map: Dict[str, int] = {}
+    cache = open_extraction_cache(cache_dir)
 
     for filename in os.listdir(input_folder):
         if filename.lower().endswith(".docx"):
             filepath = os.path.join(input_folder, filename)
-            padavivarana_rows, arthakosha_rows = process_docx_file(filepath, author_id_map)
-
-            # Padavivarana CSV
-            if padavivarana_rows:
-                os.makedirs(padavivarana_output_folder, exist_ok=True)
-                csv_path = os.path.join(padavivarana_output_folder, f"{os.path.splitext(filename)[0]}_padavivarana.csv")
-                with open(csv_path, "w", newline="", encoding="utf-8") as f:
-                    fieldnames = [
-                        "tatvapada_author_id",
-                        "samputa_sankhye",
-                        "tatvapadakarara_hesaru",
-                        "paribhashika_padavivarana_title",
-                        "paribhashika_padavivarana_content"
-                    ]
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(padavivarana_rows)
-                print(f"Wrote Padavivarana CSV: {csv_path}")
-
-            # Arthakosha CSV with requested columns order
-            if arthakosha_rows:
-                os.makedirs(arthakosha_output_folder, exist_ok=True)
-                csv_path = os.path.join(arthakosha_output_folder, f"{os.path.splitext(filename)[0]}_arthakosha.csv")
-                with open(csv_path, "w", newline="", encoding="utf-8") as f:
-                    fieldnames = [
-                        "author_id",
-                        "author_name",
-                        "samputa",
-                        "title",
-                        "word",
-                        "meaning",
-                        "notes"
-                    ]
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(arthakosha_rows)
-                print(f"Wrote Arthakosha CSV: {csv_path}")
+            padavivarana_rows, arthakosha_rows = process_docx_file_cached(filepath, author_id_map, cache)
+            write_file_outputs(filename, padavivarana_rows, arthakosha_rows,
+                               padavivarana_output_folder, arthakosha_output_folder)
+    if cache is not None:
+        print(f"Cache: {cache.hits} unchanged, {cache.misses} parsed")
 
 def rename_docx_files(directory):
     for filename in os.listdir(directory):
@@ -171,7 +197,7 @@ def rename_docx_files(directory):
             # Remove extra spaces for easier matching
             clean_name = re.sub(r'\s+', '', filename)
             # Convert Kannada digits to Arabic
-            clean_name = clean_name.translate(kannada_to_arabic)
+            clean_name = kannada_to_english_digits(clean_name)
 
             # Extract all numbers from the filename
             numbers = re.findall(r'\d+', clean_name)
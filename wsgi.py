@@ -0,0 +1,9 @@
+"""
+WSGI entry point: ``wsgi:app`` for gunicorn, waitress or any WSGI server.
+
+Each worker process imports this module and so builds its own app, database
+pool and caches.
+"""
+from app import create_app
+
+app = create_app()